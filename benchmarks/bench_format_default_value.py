@@ -0,0 +1,57 @@
+# stdlib
+import json
+from decimal import Decimal
+from typing import Callable
+
+# 3rd party
+import pytest
+
+# this package
+import sphinxcontrib.default_values
+from sphinxcontrib.default_values import _SafeRepr, format_default_value
+
+# A mix of default values, in roughly the proportions they appear in real APIs.
+values = [
+		None,
+		None,
+		None,
+		True,
+		False,
+		0,
+		1234,
+		0.5,
+		'',
+		' ',
+		"utf-8",
+		(),
+		Decimal("12.34"),
+		str,
+		json,
+		json.dumps,
+		print,
+		[1, 2, 3],
+		{'a': [1, 2, 3], 'b': (4, 5)},
+		list(range(1000)),
+		] * 50
+
+
+def bench_format_default_value(benchmark, clear_caches: Callable):
+
+	def run():
+		for value in values:
+			format_default_value(value)
+
+	benchmark.pedantic(run, setup=clear_caches, rounds=50, warmup_rounds=1)
+
+
+@pytest.mark.parametrize("safe_repr", [False, True], ids=["repr", "safe_repr"])
+def bench_format_default_value_memoized(benchmark, monkeypatch, safe_repr: bool):
+	if safe_repr:
+		monkeypatch.setattr(sphinxcontrib.default_values, "_safe_repr", _SafeRepr())
+		monkeypatch.setattr(sphinxcontrib.default_values, "_format_memo", {})
+
+	def run():
+		for value in values:
+			format_default_value(value)
+
+	benchmark(run)
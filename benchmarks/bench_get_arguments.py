@@ -0,0 +1,38 @@
+# stdlib
+from typing import Callable
+
+# 3rd party
+import pytest
+from synthetic import ModuleSpec, get_objects
+
+# this package
+from sphinxcontrib.default_values import get_arguments, get_class_defaults, get_function_defaults
+
+
+@pytest.mark.parametrize("n_params", [2, 10, 50])
+@pytest.mark.parametrize("attrs", [False, True], ids=["plain", "attrs"])
+def bench_get_arguments(benchmark, make_module: Callable, n_params: int, attrs: bool):
+	module = make_module(ModuleSpec(n_params=n_params, attrs=attrs))
+	objects = [obj.__init__ if isinstance(obj, type) else obj for obj in get_objects(module)]
+
+	def run():
+		for obj in objects:
+			get_arguments(obj)
+
+	benchmark(run)
+
+
+@pytest.mark.parametrize("n_params", [2, 10, 50])
+@pytest.mark.parametrize("attrs", [False, True], ids=["plain", "attrs"])
+def bench_get_defaults(benchmark, make_module: Callable, n_params: int, attrs: bool):
+	module = make_module(ModuleSpec(n_params=n_params, attrs=attrs))
+	objects = get_objects(module)
+
+	def run():
+		for obj in objects:
+			if isinstance(obj, type):
+				list(get_class_defaults(obj))
+			else:
+				list(get_function_defaults(obj))
+
+	benchmark(run)
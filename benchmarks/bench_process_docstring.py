@@ -0,0 +1,56 @@
+# stdlib
+from typing import Callable
+
+# 3rd party
+import pytest
+from sphinx.util.docstrings import prepare_docstring
+from synthetic import ModuleSpec, get_objects
+
+# this package
+from sphinxcontrib.default_values import process_docstring
+
+
+@pytest.mark.parametrize("n_params", [2, 10, 50])
+@pytest.mark.parametrize("paragraph_length", [1, 10])
+@pytest.mark.parametrize("override_rate", [0.0, 0.5])
+@pytest.mark.parametrize("attrs", [False, True], ids=["plain", "attrs"])
+def bench_process_docstring(
+		benchmark,
+		app,
+		make_module: Callable,
+		clear_caches: Callable,
+		n_params: int,
+		paragraph_length: int,
+		override_rate: float,
+		attrs: bool,
+		):
+	spec = ModuleSpec(
+			n_functions=50,
+			n_params=n_params,
+			paragraph_length=paragraph_length,
+			override_rate=override_rate,
+			attrs=attrs,
+			)
+	module = make_module(spec)
+	objects = [(obj, prepare_docstring(obj.__doc__)) for obj in get_objects(module)]
+
+	def run():
+		for obj, docstring in objects:
+			what = "class" if isinstance(obj, type) else "function"
+			process_docstring(app, what, obj.__qualname__, obj, {}, list(docstring))
+
+	benchmark.pedantic(run, setup=clear_caches, rounds=20, warmup_rounds=1)
+
+
+@pytest.mark.parametrize("n_functions", [50, 500])
+def bench_process_docstring_cached(benchmark, app, make_module: Callable, n_functions: int):
+	# The same objects documented again within a build, e.g. inherited members and aliases.
+	module = make_module(ModuleSpec(n_functions=n_functions))
+	objects = [(obj, prepare_docstring(obj.__doc__)) for obj in get_objects(module)]
+
+	def run():
+		for obj, docstring in objects:
+			what = "class" if isinstance(obj, type) else "function"
+			process_docstring(app, what, obj.__qualname__, obj, {}, list(docstring))
+
+	benchmark(run)
@@ -0,0 +1,65 @@
+# stdlib
+import os
+import shutil
+from io import StringIO
+from typing import Callable
+
+# 3rd party
+import pytest
+from sphinx.application import Sphinx
+from synthetic import ModuleSpec
+
+conf_py = """\
+extensions = {extensions!r}
+default_values_persistent_cache = {persistent_cache!r}
+"""
+
+
+@pytest.mark.parametrize("n_functions", [25, 100])
+@pytest.mark.parametrize(
+		"extension, persistent_cache",
+		[
+				pytest.param(False, False, id="autodoc"),
+				pytest.param(True, False, id="default_values"),
+				pytest.param(True, True, id="persistent_cache"),
+				],
+		)
+def bench_sphinx_build(
+		benchmark,
+		tmp_path,
+		make_module: Callable,
+		n_functions: int,
+		extension: bool,
+		persistent_cache: bool,
+		):
+	module = make_module(ModuleSpec(n_functions=n_functions, n_params=10, paragraph_length=3))
+
+	extensions = ["sphinx.ext.autodoc"]
+	if extension:
+		extensions.append("sphinxcontrib.default_values")
+
+	srcdir = tmp_path / "src"
+	srcdir.mkdir()
+	(srcdir / "conf.py").write_text(conf_py.format(extensions=extensions, persistent_cache=persistent_cache))
+	(srcdir / "index.rst").write_text(f"API\n===\n\n.. automodule:: {module.__name__}\n\t:members:\n")
+	outdir = tmp_path / "build"
+
+	def setup():
+		# The doctrees are kept, as that is where the persistent cache is stored.
+		if os.path.isdir(outdir / "html"):
+			shutil.rmtree(outdir / "html")
+
+	def build():
+		app = Sphinx(
+				srcdir=str(srcdir),
+				confdir=str(srcdir),
+				outdir=str(outdir / "html"),
+				doctreedir=str(outdir / "doctrees"),
+				buildername="html",
+				status=None,
+				warning=StringIO(),
+				freshenv=True,
+				)
+		app.build(force_all=True)
+
+	benchmark.pedantic(build, setup=setup, rounds=3, warmup_rounds=1)
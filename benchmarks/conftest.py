@@ -0,0 +1,57 @@
+# stdlib
+import importlib
+import sys
+from types import ModuleType
+from typing import Callable, Iterator
+
+# 3rd party
+import pytest
+from synthetic import ModuleSpec, make_module_source
+
+# this package
+import sphinxcontrib.default_values
+from tests.common import MockApp
+
+
+@pytest.fixture()
+def app() -> MockApp:
+	return MockApp()
+
+
+@pytest.fixture(scope="session")
+def module_dir(tmp_path_factory) -> Iterator[str]:
+	directory = str(tmp_path_factory.mktemp("synthetic"))
+	sys.path.insert(0, directory)
+	yield directory
+	sys.path.remove(directory)
+
+
+@pytest.fixture(scope="session")
+def make_module(module_dir: str) -> Callable[[ModuleSpec], ModuleType]:
+	"""
+	Returns a function which writes a synthetic module with the given shape to disk, and imports it.
+	"""
+
+	def make_module(spec: ModuleSpec) -> ModuleType:
+		if spec.module_name not in sys.modules:
+			with open(f"{module_dir}/{spec.module_name}.py", 'w', encoding="UTF-8") as fp:
+				fp.write(make_module_source(spec))
+
+		return importlib.import_module(spec.module_name)
+
+	return make_module
+
+
+@pytest.fixture()
+def clear_caches() -> Callable[[], None]:
+	"""
+	Returns a function which clears the caches of :mod:`sphinxcontrib.default_values`,
+	so each round starts cold as in a fresh build.
+	"""
+
+	def clear_caches() -> None:
+		sphinxcontrib.default_values._defaults_cache.clear()
+		sphinxcontrib.default_values._docstring_cache.clear()
+		sphinxcontrib.default_values._format_memo.clear()
+
+	return clear_caches
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Show how the cost of :func:`sphinxcontrib.default_values.process_docstring` grows with docstring length.
+
+Run with ``python -m benchmarks.scaling`` from the root of the repository.
+The time per docstring line should stay roughly constant as the docstring grows.
+"""
+
+# stdlib
+import timeit
+from typing import Callable, List
+
+# this package
+from sphinxcontrib.default_values import _docstring_cache, process_docstring
+from tests.common import MockApp
+
+
+def make_function(n_params: int) -> Callable:
+	"""
+	Create a function with ``n_params`` keyword arguments.
+
+	:param n_params:
+	"""
+
+	namespace = {}  # type: ignore[var-annotated]
+	arguments = ", ".join(f"arg{i}={i}" for i in range(n_params))
+	exec(f"def func({arguments}): pass", namespace)  # pylint: disable=exec-used
+	return namespace["func"]
+
+
+def make_docstring(n_params: int, paragraph_length: int) -> List[str]:
+	"""
+	Create a docstring documenting ``n_params`` parameters,
+	each with a description ``paragraph_length`` lines long.
+
+	:param n_params:
+	:param paragraph_length:
+	"""
+
+	lines = ["A function with a very long docstring.", '']
+
+	for i in range(n_params):
+		lines.append(f":param arg{i}: The description of the argument")
+		lines.extend(["    which continues over several lines"] * (paragraph_length - 1))
+		if i % 3 == 0:
+			lines.append(f":default arg{i}: ``{i * 2}``")
+		elif i % 3 == 1:
+			lines.append(f":no-default arg{i}:")
+
+	lines.append('')
+	lines.append(":rtype: int")
+
+	return lines
+
+
+def main() -> None:
+	app = MockApp()
+	paragraph_length = 5
+
+	print(f"{'params':>8} {'lines':>8} {'total (ms)':>12} {'per line (µs)':>14}")
+
+	for n_params in (25, 50, 100, 200, 400, 800, 1600):
+		func = make_function(n_params)
+		docstring = make_docstring(n_params, paragraph_length)
+
+		def run() -> None:
+			# Otherwise every call after the first replays the cached result.
+			_docstring_cache.clear()
+			process_docstring(app, "function", "func", func, {}, list(docstring))
+
+		number = max(1, 4000 // n_params)
+		best = min(timeit.repeat(run, number=number, repeat=5)) / number
+
+		print(f"{n_params:>8} {len(docstring):>8} {best * 1e3:>12.3f} {best / len(docstring) * 1e6:>14.3f}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic modules, similar to :mod:`sphinxcontrib.default_values.demo` but at scale, for benchmarking.
+"""
+
+# stdlib
+import random
+from textwrap import indent
+from types import ModuleType
+from typing import Any, Iterator, List, NamedTuple, Tuple
+
+__all__ = ["ModuleSpec", "make_module_source", "get_objects"]
+
+# Default values, as source code, and whether they need ``attr.Factory`` in an attrs class.
+_default_values: List[Tuple[str, bool]] = [
+		("None", False),
+		("True", False),
+		("0.0", False),
+		("''", False),
+		("' '", False),
+		('"hello world"', False),
+		("1234", False),
+		("()", False),
+		('Decimal("12.34")', False),
+		("...", False),
+		("[]", True),
+		("{'a': [1, 2, 3], 'b': (4, 5)}", True),
+		("list(range(50))", True),
+		]
+
+
+class ModuleSpec(NamedTuple):
+	"""
+	The shape of a synthetic module.
+	"""
+
+	#: The number of functions, and also the number of classes.
+	n_functions: int = 50
+
+	#: The number of parameters of each function and class.
+	n_params: int = 10
+
+	#: The number of lines in the description of each parameter.
+	paragraph_length: int = 1
+
+	#: The proportion of parameters with a ``:default:`` or ``:no-default:`` field.
+	override_rate: float = 0.1
+
+	#: Whether the classes are :mod:`attrs` classes, rather than classes with an explicit ``__init__`` method.
+	attrs: bool = False
+
+	@property
+	def module_name(self) -> str:
+		"""
+		A name for the module which is unique to its shape.
+		"""
+
+		rate = int(self.override_rate * 100)
+		suffix = "_attrs" if self.attrs else ''
+		return f"synthetic_{self.n_functions}_{self.n_params}_{self.paragraph_length}_{rate}{suffix}"
+
+
+def _make_docstring(spec: ModuleSpec, rng: random.Random) -> Iterator[str]:
+	yield '"""'
+	yield "A synthetic object."
+	yield ''
+
+	for param in range(spec.n_params):
+		yield f":param arg{param}: The description of argument {param}."
+		for _ in range(spec.paragraph_length - 1):
+			yield "\tThe quick brown fox jumps over the lazy dog"
+
+		if rng.random() < spec.override_rate:
+			if rng.random() < 0.5:
+				yield f":default arg{param}: ``{param}``"
+			else:
+				yield f":no-default arg{param}:"
+
+	yield ''
+	yield ":rtype: int"
+	yield '"""'
+
+
+def make_module_source(spec: ModuleSpec) -> str:
+	"""
+	Returns the source code of a module with the given shape.
+
+	The module is the same each time for a given shape.
+
+	:param spec:
+	"""
+
+	rng = random.Random(spec.module_name)
+
+	lines = [
+			"from decimal import Decimal",
+			'',
+			"import attr" if spec.attrs else '',
+			'',
+			]
+
+	for function in range(spec.n_functions):
+		arguments = ["arg0"]
+		for param in range(1, spec.n_params):
+			arguments.append(f"arg{param}={rng.choice(_default_values)[0]}")
+
+		lines.append('')
+		lines.append(f"def function{function}({', '.join(arguments)}):")
+		lines.append(indent('\n'.join(_make_docstring(spec, rng)), '\t'))
+		lines.append('')
+
+	for klass in range(spec.n_functions):
+		lines.append('')
+
+		if spec.attrs:
+			lines.append("@attr.s")
+			lines.append(f"class Class{klass}:")
+			lines.append(indent('\n'.join(_make_docstring(spec, rng)), '\t'))
+			lines.append("\targ0 = attr.ib()")
+
+			for param in range(1, spec.n_params):
+				value, needs_factory = rng.choice(_default_values)
+				if needs_factory:
+					lines.append(f"\targ{param} = attr.ib(default=attr.Factory(lambda: {value}))")
+				else:
+					lines.append(f"\targ{param} = attr.ib(default={value})")
+
+		else:
+			arguments = ["self", "arg0"]
+			for param in range(1, spec.n_params):
+				arguments.append(f"arg{param}={rng.choice(_default_values)[0]}")
+
+			lines.append(f"class Class{klass}:")
+			lines.append(indent('\n'.join(_make_docstring(spec, rng)), '\t'))
+			lines.append('')
+			lines.append(f"\tdef __init__({', '.join(arguments)}):")
+			lines.append("\t\tpass")
+
+		lines.append('')
+
+	return '\n'.join(lines)
+
+
+def get_objects(module: ModuleType) -> List[Any]:
+	"""
+	Returns the functions and classes in a synthetic module.
+
+	:param module:
+	"""
+
+	return [obj for name, obj in vars(module).items() if name.startswith(("function", "Class"))]
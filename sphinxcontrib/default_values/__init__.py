@@ -31,26 +31,82 @@ Sphinx extension to show default values in documentation.
 #
 
 # stdlib
+import builtins
+import collections.abc
+import contextlib
+import dataclasses
+import enum
+import functools
 import inspect
+import os
 import re
+import reprlib
+import signal
 import string
-from types import BuiltinFunctionType, FunctionType, ModuleType
-from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Pattern, Tuple, Type, Union
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict, deque
+from types import (
+		BuiltinFunctionType,
+		ClassMethodDescriptorType,
+		FunctionType,
+		MethodDescriptorType,
+		MethodType,
+		MethodWrapperType,
+		ModuleType,
+		SimpleNamespace,
+		WrapperDescriptorType
+		)
+from typing import (
+		Any,
+		Callable,
+		ContextManager,
+		Dict,
+		Iterable,
+		Iterator,
+		List,
+		Mapping,
+		NamedTuple,
+		Optional,
+		Pattern,
+		Set,
+		Tuple,
+		Type
+		)
 
 # 3rd party
-from docutils.nodes import document
-from docutils.statemachine import StringList
+from docutils import nodes
+from docutils.frontend import OptionParser
+from docutils.languages import get_language
+from docutils.parsers.rst import Parser as RSTParser
+from docutils.parsers.rst.states import Inliner
+from sphinx import addnodes
 from sphinx.application import Sphinx
-from sphinx.parsers import RSTParser
+from sphinx.config import ENUM
+from sphinx.environment import BuildEnvironment
+from sphinx.errors import PycodeError
+from sphinx.pycode import ModuleAnalyzer
+from sphinx.util import logging
 from sphinx.util.inspect import signature as Signature
 
+# this package
+from sphinxcontrib.default_values.fingerprints import Fingerprints
+from sphinxcontrib.default_values.index import DefaultsIndex
+from sphinxcontrib.default_values.persistent_cache import PersistentCache
+from sphinxcontrib.default_values.prewarming import _iter_module_names, _prewarm_key, prewarm_modules
+from sphinxcontrib.default_values.statistics import BuildStatistics
+from sphinxcontrib.default_values.tracing import Tracer
+
 try:
 	# 3rd party
 	import attr
+	_attrs_factory: Optional[Any] = attr.Factory
 except ImportError:  # pragma: no cover
 	# attrs is used in a way that it is only required in situations
 	# where it is available to import, so its fine to do this.
-	pass
+	_attrs_factory = None
 
 __author__: str = "Dominic Davis-Foster"
 __copyright__: str = "2020 Dominic Davis-Foster"
@@ -60,16 +116,22 @@ __email__: str = "dominic@davis-foster.co.uk"
 
 __all__ = [
 		"process_docstring",
+		"insert_defaults",
 		"process_default_format",
+		"get_statistics",
 		"setup",
 		"get_class_defaults",
+		"register_class_defaults_extractor",
 		"get_function_defaults",
 		"default_regex",
 		"no_default_regex",
 		"get_arguments",
 		"format_default_value",
+		"register_default_formatter",
 		]
 
+logger = logging.getLogger(__name__)
+
 default_regex: Pattern = re.compile("^:(?i:default) ")
 """
 Regular expression to match default values declared in docstrings.
@@ -95,6 +157,61 @@ _fields = '|'.join([
 		"kwparam",
 		])
 
+_field_regex: Pattern = re.compile(
+		fr"^:(?:(?P<param>{_fields})|(?P<default>(?i:default))|(?P<no_default>(?i:no[-_]default))) "
+		r"(?:(?P<name>[^:]*):)?",
+		)
+
+
+class _DocstringFields:
+	"""
+	Index of the ``:param``, ``:default`` and ``:no-default`` fields in a docstring, keyed by argument name.
+
+	The docstring is scanned once, and all subsequent lookups are answered from the index.
+
+	:param lines: List of strings representing the current contents of the docstring.
+	"""
+
+	#: Mapping of argument names to the index of their first ``:param`` (or equivalent) field.
+	params: Dict[str, int]
+
+	#: Mapping of argument names to the index of their first ``:default`` field.
+	defaults: Dict[str, int]
+
+	#: The argument names which have a ``:no-default`` field.
+	no_defaults: Set[str]
+
+	#: The indices of all ``:default`` and ``:no-default`` lines, which are removed from the output.
+	removals: Set[int]
+
+	def __init__(self, lines: List[str]):
+		self.params = {}
+		self.defaults = {}
+		self.no_defaults = set()
+		self.removals = set()
+
+		for idx, line in enumerate(lines):
+			if not line.startswith(':'):
+				continue
+
+			m = _field_regex.match(line)
+			if m is None:
+				continue
+
+			name = m.group("name")
+
+			if m.group("param") is not None:
+				if name is not None:
+					self.params.setdefault(name, idx)
+			elif m.group("default") is not None:
+				self.removals.add(idx)
+				if name is not None:
+					self.defaults.setdefault(name, idx)
+			else:
+				self.removals.add(idx)
+				if name is not None:
+					self.no_defaults.add(name)
+
 
 def escape_trailing__(string: str) -> str:
 	"""
@@ -108,244 +225,2568 @@ def escape_trailing__(string: str) -> str:
 	return string
 
 
-def format_default_value(value: Any) -> Optional[str]:
+class _SafeRepr(reprlib.Repr):
 	"""
-	Format the value as a string.
-
-	.. versionadded:: 0.2.0
+	:class:`reprlib.Repr` subclass which summarises oversized containers and records when a limit was hit.
 
-	:param value:
+	:param max_length: The maximum length of the repr of strings, numbers and other objects.
+	:param max_depth: The maximum depth to show nested containers to.
+	:param max_items: Containers with more items than this are summarised as e.g. ``{...} (1,024 items)``.
+	:param timeout: The maximum time in seconds to spend on the repr of one value, or ``0`` for no limit.
 	"""
 
-	if value is not inspect.Signature.empty and value is not Ellipsis:
-
-		if isinstance(value, ModuleType):
-			return f":mod:`{value.__name__}`"
-		elif isinstance(value, BuiltinFunctionType):
-			return f":py:func:`{value.__name__}`"
-		elif isinstance(value, FunctionType):
-			return f":py:func:`{value.__module__}.{value.__name__}`"
-		elif inspect.isclass(value):
-			if value.__module__ == "builtins":
-				return f":py:class:`{value.__name__}`"
-			else:
-				return f":py:class:`{value.__module__}.{value.__name__}`"
-		elif isinstance(value, bool):
-			return f":py:obj:`{value}`"
-		elif value is None:
-			return ":py:obj:`None`"
-		elif isinstance(value, str) and not value.strip():
-			return f"``{value.replace(' ', '␣')!r}``"
+	#: Whether the last value passed to :meth:`~._SafeRepr.repr` hit one of the limits.
+	limited: bool
+
+	def __init__(self, max_length: int = 200, max_depth: int = 4, max_items: int = 20, timeout: float = 0):
+		super().__init__()
+		self.max_items = max_items
+		self.timeout = timeout
+		self.maxlevel = max_depth
+		self.maxstring = self.maxlong = self.maxother = max_length
+		self.maxtuple = self.maxlist = self.maxarray = self.maxdeque = max_items
+		self.maxdict = self.maxset = self.maxfrozenset = max_items
+		self.limited = False
+
+	def repr(self, x: Any) -> str:  # noqa: A003
+		self.limited = False
+
+		try:
+			with _time_limit(self.timeout):
+				return super().repr(x)
+		except _ReprTimeout:
+			self.limited = True
+			return f"<{type(x).__name__} instance>"
+
+	def repr1(self, x: Any, level: int) -> str:
+		summary = _summarise_container(x)
+
+		if summary is not None and len(x) > self.max_items:
+			self.limited = True
+			return f"{summary} ({len(x):,} items)"
+		elif summary is not None and level <= 0 and len(x):
+			self.limited = True
+		elif isinstance(x, (bytes, bytearray)) and len(x) > self.maxstring:
+			self.limited = True
+			return f"{type(x).__name__}(...) ({len(x):,} bytes)"
+		elif isinstance(x, str) and len(x) > self.maxstring:
+			self.limited = True
+
+		if summary is not None and type(x) not in _container_summaries:
+			return self.repr_container(x, level)
+
+		return super().repr1(x, level)
+
+	def repr_container(self, x: Any, level: int) -> str:
+		"""
+		Returns the repr of a subclass of one of the builtin containers, or of another mapping, sequence or set,
+		with the name of its type followed by its items, e.g. ``OrderedDict({'a': 1})``.
+
+		:param x:
+		:param level: The remaining depth to show nested containers to.
+		"""
+
+		name = type(x).__name__
+		repr_items: Callable[[Any, int], str]
+
+		if not len(x):
+			return f"{name}()"
+		elif isinstance(x, tuple) and hasattr(x, "_fields"):
+			# A named tuple.
+			if level <= 0:
+				return f"{name}(...)"
+			fields = (f"{field}={self.repr1(value, level - 1)}" for field, value in zip(x._fields, x))
+			return f"{name}({', '.join(fields)})"
+		elif isinstance(x, collections.abc.Mapping):
+			repr_items = self.repr_dict
+		elif isinstance(x, collections.abc.Set):
+			repr_items = self.repr_set
 		else:
-			return f"``{value!r}``"
+			repr_items = self.repr_list
 
-	return None
+		return f"{name}({repr_items(x, level)})"
 
+	def repr_instance(self, x: Any, level: int) -> str:
+		try:
+			text = builtins.repr(x)
+		except Exception:
+			return f"<{type(x).__name__} instance at {id(x):#x}>"
 
-def process_docstring(
-		app: Sphinx,
-		what: str,
-		name: str,
-		obj: Any,
-		options: Dict[str, Any],
-		lines: List[str],
-		) -> None:
+		if len(text) > self.maxother:
+			self.limited = True
+			start = max(0, (self.maxother - 3) // 2)
+			end = max(0, self.maxother - 3 - start)
+			text = f"{text[:start]}...{text[len(text) - end:]}"
+
+		return text
+
+
+_container_summaries: Dict[type, str] = {
+		dict: "{...}",
+		list: "[...]",
+		tuple: "(...)",
+		set: "{...}",
+		frozenset: "frozenset({...})",
+		deque: "deque([...])",
+		}
+
+_unsummarised_sequences = (str, bytes, bytearray, memoryview, range)
+
+
+def _summarise_container(x: Any) -> Optional[str]:
 	"""
-	Add default values to the docstring.
+	Returns the summary used for the given object when it has too many items,
+	or :py:obj:`None` if it is not a container with a known number of items.
 
-	:param app: The Sphinx app.
-	:param what:
-	:param name: The name of the object being documented.
-	:param obj: The object being documented.
-	:param options: Mapping of autodoc options to values.
-	:param lines: List of strings representing the current contents of the docstring.
+	Subclasses of the builtin containers, and other mappings, sequences and sets,
+	are summarised with their type's name, e.g. ``OrderedDict({...})``,
+	so the repr of their contents is never computed.
+
+	:param x:
 	"""
 
-	if isinstance(obj, property):
+	summary = _container_summaries.get(type(x))
+	if summary is not None:
+		return summary
+
+	if isinstance(x, (collections.abc.Mapping, collections.abc.Set)):
+		summary = "{...}"
+	elif isinstance(x, collections.abc.Sequence) and not isinstance(x, _unsummarised_sequences):
+		summary = "[...]"
+	else:
 		return None
 
-	# Size varies depending on docutils config
-	a_tab = ' ' * app.config.docutils_tab_width
+	try:
+		len(x)
+	except Exception:  # pylint: disable=broad-except
+		return None
 
-	if callable(obj):
+	return f"{type(x).__name__}({summary})"
 
-		if not lines or lines[-1]:
-			lines.append('')
 
-		default_getter: Union[Callable[[Type], _defaults], Callable[[Callable], _defaults]]
+class _ReprTimeout(BaseException):
+	"""
+	Raised when the repr of a default value takes longer than :confval:`default_values_repr_timeout`.
 
-		if inspect.isclass(obj):
-			default_getter = get_class_defaults
-		else:
-			default_getter = get_function_defaults
+	Derived from :exc:`BaseException` so the ``except Exception`` clauses in ``__repr__`` methods do not catch it.
+	"""
 
-		default_description_format: str = app.config.default_description_format
 
-		for argname, default_value in default_getter(obj):
-			argname = escape_trailing__(argname)
+@contextlib.contextmanager
+def _time_limit(seconds: float) -> Iterator[None]:
+	"""
+	Raise :exc:`~._ReprTimeout` if the body of the ``with`` block runs for longer than the given number of seconds.
 
-			# Get the default value from the signature
-			formatted_annotation = format_default_value(default_value)
+	The limit is enforced with :py:data:`signal.SIGALRM`, so it only applies in the main thread,
+	on platforms which support it, and when no other timer is running.
 
-			# Check if the user has overridden the default value in the docstring
-			default_searchfor = re.compile(fr"^:(?i:default) {re.escape(argname)}:")
-			for i, line in enumerate(lines):
-				if default_searchfor.match(line):
-					formatted_annotation = ':'.join(line.split(':')[2:]).lstrip()
-					lines.remove(line)
-					break
+	:param seconds:
+	"""
 
-			# Check the user hasn't turned the default argument off
-			no_default_searchfor = re.compile(f"^:(?i:no[-_]default) {re.escape(argname)}:")
-			for i, line in enumerate(lines):
-				if no_default_searchfor.match(line):
-					formatted_annotation = None
-					break
+	if (
+			seconds <= 0 or not hasattr(signal, "setitimer")
+			or threading.current_thread() is not threading.main_thread() or signal.getitimer(signal.ITIMER_REAL)[0]
+			):
+		yield
+		return
 
-			# Add the default value
-			insert_index = None
+	def timed_out(signum: int, frame: Any) -> None:
+		raise _ReprTimeout
 
-			param_searchfor = re.compile(f"^:({_fields}) {re.escape(argname)}:")
-			for i, line in enumerate(lines):
-				if param_searchfor.match(line):
-					insert_index = i
-					break
+	previous_handler = signal.signal(signal.SIGALRM, timed_out)
+
+	try:
+		signal.setitimer(signal.ITIMER_REAL, seconds)
+		try:
+			yield
+		finally:
+			# Disarm the timer before the handler is removed, so it cannot fire outside the block.
+			signal.setitimer(signal.ITIMER_REAL, 0)
+	finally:
+		signal.signal(signal.SIGALRM, previous_handler)
 
-			if formatted_annotation is not None:
-				if insert_index is not None:
 
-					# Look ahead to find the index of the next unindented line, and insert before it.
-					for idx, line in enumerate(lines[insert_index + 1:]):
-						if not line.startswith(a_tab):
+_safe_repr: Optional[_SafeRepr] = None
+"""
+Used to format default values if :confval:`default_values_safe_repr` is enabled.
+"""
+
+_call_attrs_factories: bool = True
+"""
+Whether to call the factories of :mod:`attrs` fields. See :confval:`default_values_attrs_factories`.
+"""
 
-							# Ensure the previous line has a fullstop at the end.
-							line_content = ':'.join(lines[insert_index + idx].split(':')[2:]).strip()
-							if line_content and line_content[-1] not in ".,;:":
-								lines[insert_index + idx] += '.'
+_statistics = BuildStatistics()
+"""
+Counts of what the extension did during the current build. See :func:`~.get_statistics`.
+"""
 
-							lines.insert(
-									insert_index + 1 + idx,
-									f"{a_tab}{default_description_format % formatted_annotation}".rstrip('.')
-									+ '.',
-									)
-							break
+_tracer: Optional[Tracer] = None
+"""
+Records the time spent adding default values to docstrings if :confval:`default_values_trace` is enabled.
+"""
 
-		indices_to_remove = set()
+_null_span = contextlib.nullcontext()
 
-		# Remove all remaining :default *: lines
-		for i, line in enumerate(lines):
-			if default_regex.match(line):
-				indices_to_remove.add(i)
 
-		# Remove all remaining :no-default *: lines
-		for i, line in enumerate(lines):
-			if no_default_regex.match(line):
-				indices_to_remove.add(i)
+def _trace(event: str, **args: Any) -> ContextManager:
+	"""
+	Returns a context manager which records the time spent within it, if tracing is enabled.
 
-		for i in sorted(indices_to_remove, reverse=True):
-			del lines[i]
+	:param event: The name of the event.
+	:param args: Additional information to show with the event.
+	"""
 
-	return None
+	if _tracer is None:
+		return _null_span
+	else:
+		return _tracer.span(event, **args)
 
 
-_defaults = Iterator[Tuple[str, Any]]
+class _FactoryReference(NamedTuple):
+	"""
+	Stands in for a default value which is produced by calling a factory, without calling it.
+	"""
 
+	factory: Callable
 
-def get_class_defaults(obj: Type) -> _defaults:
+
+def _format_factory(factory: Callable) -> str:
 	"""
-	Obtains the default values for the arguments of a class.
+	Format a call to a factory function or class, without calling it.
 
-	:param obj: The class.
+	:param factory:
+	"""
 
-	:return: An iterator of 2-element tuples comprising the argument name and its default value.
+	if inspect.isclass(factory):
+		return f"{format_default_value(factory)}\\ ``()``"
+	elif isinstance(factory, (FunctionType, BuiltinFunctionType)) and factory.__name__ != "<lambda>":
+		# The :py:func: role adds the parentheses itself.
+		return format_default_value(factory)  # type: ignore[return-value]
+	else:
+		# The repr of lambdas etc. includes the memory address, which differs between builds.
+		return f"``{getattr(factory, '__qualname__', type(factory).__qualname__)}()``"
+
+
+def format_default_value(value: Any) -> Optional[str]:
 	"""
+	Format the value as a string.
 
-	# TODO: handle __new__
+	.. versionadded:: 0.2.0
+	.. versionchanged:: 0.8.0
 
-	for argname, param in get_arguments(getattr(obj, "__init__")).items():
-		default_value = param.default
+		Large values are summarised if :confval:`default_values_safe_repr` is enabled.
+		NumPy arrays, pandas data frames, tensors and similar values are always summarised by their shape
+		and data type, e.g. ``array(shape=(1024, 3), dtype=float32)``.
+		:class:`attr.Factory` objects and the default factories of dataclasses and pydantic models
+		are shown as a call to the factory.
 
-		if hasattr(obj, "__attrs_attrs__"):
-			# Special casing for attrs classes
-			if default_value is attr.NOTHING:
-				for value in obj.__attrs_attrs__:
-					if value.name == argname and isinstance(value.default, attr.Factory):  # type: ignore
-						default_value = value.default.factory()
+		The formatting of other types can be customised with :func:`~.register_default_formatter`.
+		Module-level constants and enum members are shown as references
+		if :confval:`default_values_reference_constants` is enabled.
 
-		yield argname, default_value
+	:param value:
+	"""
 
+	if value is inspect.Signature.empty or value is Ellipsis:
+		return None
 
-def get_function_defaults(obj: Callable) -> _defaults:
+	if _constants:
+		constant = _constants.get(id(value))
+
+		if constant is not None:
+			return constant[1]
+
+	memoize = _is_memoizable(value)
+
+	if memoize:
+		key = (type(value), value)
+
+		try:
+			return _format_memo[key]
+		except KeyError:
+			pass
+		except TypeError:  # pragma: no cover
+			# e.g. a metaclass which defines __eq__ but not __hash__
+			memoize = False
+
+	formatted = _format_value(value)
+
+	# Values which were shortened are not memoized, so they are reported each time.
+	if memoize and len(_format_memo) < _format_memo_size and not (_safe_repr is not None and _safe_repr.limited):
+		_format_memo[key] = formatted
+
+	return formatted
+
+
+def register_default_formatter(
+		cls: type,
+		func: Optional[Callable[[Any], Optional[str]]] = None,
+		) -> Callable:
 	"""
-	Obtains the default values for the arguments of a function.
+	Register a function to format default values of the given type.
 
-	:param obj: The function.
+	The function takes the value and returns the reStructuredText to show for it,
+	or :py:obj:`None` to not show a default value.
+	It is used for instances of ``cls`` and its subclasses, unless a more specific type has been registered.
 
-	:return: An iterator of 2-element tuples comprising the argument name and its default value.
+	This can be used as a decorator, e.g. in ``conf.py``:
+
+	.. code-block:: python
+
+		from pathlib import PurePath
+		from sphinxcontrib.default_values import register_default_formatter
+
+		@register_default_formatter(PurePath)
+		def format_path(value: PurePath) -> str:
+			return f"``{value.as_posix()!r}``"
+
+	.. versionadded:: 0.8.0
+
+	:param cls:
+	:param func: If not given, a decorator is returned which registers the function it decorates.
 	"""
 
-	for argname, param in get_arguments(obj).items():
-		yield argname, param.default
+	_format_memo.clear()
+	return _format_value.register(cls, func)
 
 
-def get_arguments(obj: Callable) -> Mapping[str, inspect.Parameter]:
+def _format_repr(value: Any) -> Optional[str]:
 	"""
-	Returns a dictionary mapping argument names to parameters/arguments for a function.
+	Format the value using its :func:`repr`, which is summarised
+	if :confval:`default_values_safe_repr` is enabled.
 
-	:param obj: A function (can be the ``__init__`` method of a class).
+	Arrays, tensors, data frames and similar values are summarised by their shape and data type instead.
+
+	:param value:
+	"""
+
+	summarise = _get_summary_formatter(type(value))
+
+	if summarise is not None:
+		try:
+			return summarise(value)
+		except Exception:  # pylint: disable=broad-except
+			# e.g. a lazy array whose shape cannot be determined. Fall back to the repr.
+			pass
+
+	if _safe_repr is not None:
+		return f"``{_safe_repr.repr(value)}``"
+	else:
+		return f"``{value!r}``"
+
+
+_summary_formatter = Callable[[Any], str]
+
+
+def _summarise_array(name: str) -> _summary_formatter:
+	"""
+	Returns a function to summarise an array or tensor as e.g. ``array(shape=(1024, 3), dtype=float32)``.
+
+	:param name: The name to show for the array.
+	"""
+
+	def summarise(value: Any) -> str:
+		dtype = value.dtype
+		return f"``{name}(shape={tuple(value.shape)!r}, dtype={getattr(dtype, 'name', dtype)})``"
+
+	return summarise
+
+
+def _summarise_frame(value: Any) -> str:
+	"""
+	Summarise a data frame as e.g. ``DataFrame(shape=(100, 3))``.
+
+	:param value:
+	"""
+
+	return f"``{type(value).__name__}(shape={tuple(value.shape)!r})``"
+
+
+def _summarise_series(value: Any) -> str:
+	"""
+	Summarise a series or index as e.g. ``Series(length=100, dtype=int64)``.
+
+	:param value:
+	"""
+
+	dtype = value.dtype
+	return f"``{type(value).__name__}(length={len(value)}, dtype={getattr(dtype, 'name', dtype)})``"
+
+
+_summary_formatters: Dict[Tuple[str, str], _summary_formatter] = {
+		("numpy", "ndarray"): _summarise_array("array"),
+		("torch", "Tensor"): _summarise_array("tensor"),
+		("jaxlib.xla_extension", "ArrayImpl"): _summarise_array("array"),
+		("jaxlib._jax", "ArrayImpl"): _summarise_array("array"),
+		("tensorflow.python.framework.ops", "EagerTensor"): _summarise_array("tensor"),
+		("xarray.core.dataarray", "DataArray"): _summarise_array("DataArray"),
+		("pandas", "DataFrame"): _summarise_frame,
+		("pandas.core.frame", "DataFrame"): _summarise_frame,
+		("polars.dataframe.frame", "DataFrame"): _summarise_frame,
+		("pandas", "Series"): _summarise_series,
+		("pandas.core.series", "Series"): _summarise_series,
+		("pandas", "Index"): _summarise_series,
+		("pandas.core.indexes.base", "Index"): _summarise_series,
+		("polars.series.series", "Series"): _summarise_series,
+		}
+"""
+Functions to summarise arrays, tensors, data frames and similar values, rather than showing their full repr.
+
+The types are identified by the module and qualified name of the class or one of its bases,
+so the libraries which define them are never imported by this extension.
+Classes which have moved between modules are listed under each module,
+e.g. pandas before 3.0 defines :class:`pandas.DataFrame` in ``pandas.core.frame``,
+and newer versions of JAX define ``ArrayImpl`` in ``jaxlib._jax`` rather than ``jaxlib.xla_extension``.
+"""
+
+_summary_formatter_cache: "weakref.WeakKeyDictionary[type, Optional[_summary_formatter]]"
+_summary_formatter_cache = weakref.WeakKeyDictionary()
+"""
+The function chosen to summarise values of each type, or :py:obj:`None` if they are not summarised.
+"""
+
+
+def _get_summary_formatter(value_type: type) -> Optional[_summary_formatter]:
+	"""
+	Returns the function to summarise values of the given type, or :py:obj:`None` if they are not summarised.
+
+	:param value_type:
 	"""
 
 	try:
-		signature = Signature(inspect.unwrap(obj))
-	except ValueError:  # pragma: no cover
-		return {}
+		return _summary_formatter_cache[value_type]
+	except KeyError:
+		pass
+	except TypeError:  # pragma: no cover
+		# Not weak-referenceable.
+		return None
 
-	return signature.parameters
+	summarise = None
 
+	for base in value_type.__mro__:
+		summarise = _summary_formatters.get((base.__module__, base.__qualname__))
+		if summarise is not None:
+			break
 
-def process_default_format(app: Sphinx) -> None:
+	_summary_formatter_cache[value_type] = summarise
+	return summarise
+
+
+_format_value = functools.singledispatch(_format_repr)
+"""
+Formats default values, dispatching on their type. See :func:`~.register_default_formatter`.
+"""
+
+
+@_format_value.register(ModuleType)
+def _format_module(value: ModuleType) -> str:
+	return f":mod:`{value.__name__}`"
+
+
+@_format_value.register(BuiltinFunctionType)
+def _format_builtin_function(value: BuiltinFunctionType) -> str:
+	return f":py:func:`{value.__name__}`"
+
+
+@_format_value.register(FunctionType)
+def _format_function(value: FunctionType) -> str:
+	return f":py:func:`{value.__module__}.{value.__name__}`"
+
+
+@_format_value.register(type)
+def _format_class(value: type) -> str:
+	if value.__module__ == "builtins":
+		return f":py:class:`{value.__name__}`"
+	else:
+		return f":py:class:`{value.__module__}.{value.__name__}`"
+
+
+@_format_value.register(bool)
+def _format_bool(value: bool) -> str:
+	return f":py:obj:`{value}`"
+
+
+@_format_value.register(type(None))
+def _format_none(value: None) -> str:
+	return ":py:obj:`None`"
+
+
+@_format_value.register(str)
+def _format_str(value: str) -> Optional[str]:
+	if not value.strip():
+		return f"``{value.replace(' ', '␣')!r}``"
+	else:
+		return _format_repr(value)
+
+
+@_format_value.register(_FactoryReference)
+def _format_factory_reference(value: _FactoryReference) -> str:
+	return _format_factory(value.factory)
+
+
+if _attrs_factory is not None:
+
+	@_format_value.register(_attrs_factory)
+	def _format_attrs_factory(value: Any) -> str:
+		return _format_factory(value.factory)
+
+
+_format_memo: Dict[Tuple[type, Any], Optional[str]] = {}
+"""
+Formatted default values of common immutable types, such as :py:obj:`None`, booleans, small integers,
+short strings, classes and modules.
+
+The type is part of the key, as :py:obj:`True` and ``1`` are equal but are formatted differently.
+"""
+
+_format_memo_size: int = 4096
+
+_memoized_types: Set[type] = {type(None), bool, ModuleType, BuiltinFunctionType, FunctionType}
+
+
+def _is_memoizable(value: Any) -> bool:
 	"""
-	Prepare the formatting of the default value.
+	Returns whether the formatted value can be memoized.
 
-	:param app:
+	:param value:
 	"""
 
-	default_description_format: str = app.config.default_description_format
+	value_type = type(value)
 
-	# Check the substitution is in the string and is preceded by whitespace, or is at the beginning of the string
-	if "%s" in default_description_format:
-		if re.search(r"[^\s]%s", default_description_format) and not default_description_format.startswith("%s"):
-			default_description_format = default_description_format.replace("%s", " %s")
+	if value_type is int:
+		return -2**63 <= value < 2**63
+	elif value_type is str:
+		return len(value) <= 100
 	else:
-		# Add the substitution to the end.
-		if default_description_format[-1] not in string.whitespace:
-			default_description_format += " %s"
-		else:
-			default_description_format += "%s"
+		return value_type in _memoized_types or isinstance(value, type)
 
-	app.config.default_description_format = default_description_format  # type: ignore
 
+_reference_constants: bool = False
+"""
+Whether to show module-level constants as references. See :confval:`default_values_reference_constants`.
+"""
 
-def setup(app: Sphinx) -> Dict[str, Any]:
+_constants: Dict[int, Tuple[Any, str]] = {}
+"""
+Module-level constants, sentinel objects and enum members, keyed by their :func:`id`,
+with the reference used to show them as a default value.
+
+The value itself is kept, so its :func:`id` cannot be reused by another object while it is in the index.
+"""
+
+_indexed_modules: Set[str] = set()
+"""
+The names of the modules whose constants have been added to :data:`~._constants`.
+"""
+
+_unindexed_types: Set[type] = {
+		type(None),
+		type(Ellipsis),
+		type(NotImplemented),
+		bool,
+		int,
+		float,
+		complex,
+		str,
+		bytes,
+		tuple,
+		frozenset,
+		}
+"""
+Types whose instances are never indexed as constants.
+
+Equal values of these types are often the same object, such as small integers, interned strings,
+and constants shared by the code of a module, so a default value being identical to a constant
+does not mean the constant was used.
+"""
+
+
+def _index_constants(module_name: str) -> None:
 	"""
-	Setup :mod:`sphinxcontrib.default_values`.
+	Add the documented module-level data of a module, and the members of the enums it contains,
+	to :data:`~._constants`.
 
-	:param app:
+	Only the names in the module's ``__all__`` are indexed, if it has one.
+	Other data is only indexed if it is documented in the module's source, with a docstring or a ``#:`` comment,
+	so names imported from other modules are skipped, as they are not documented as part of this module.
+	Each module is only indexed once per build.
+
+	:param module_name:
 	"""
 
-	# Custom formatting for the default value indication
-	app.add_config_value("default_description_format", "Default %s", "env", [str])
-	app.connect("builder-inited", process_default_format)
-	app.connect("autodoc-process-docstring", process_docstring)
+	if module_name in _indexed_modules:
+		return
+
+	_indexed_modules.add(module_name)
+	module = sys.modules.get(module_name)
+
+	if module is None:
+		return
+
+	namespace = vars(module)
+	names = getattr(module, "__all__", None)
+
+	if names is None:
+		names = [name for name in namespace if not name.startswith('_')]
+
+	documented: Set[str] = set()
+
+	try:
+		attr_docs = ModuleAnalyzer.for_module(module_name).find_attr_docs()
+	except PycodeError:
+		pass
+	else:
+		documented = {name for (scope, name) in attr_docs if not scope}
+
+	for name in names:
+		try:
+			value = namespace[name]
+		except (KeyError, TypeError):
+			continue
+
+		if isinstance(value, enum.Enum):
+			value = type(value)
+
+		if isinstance(value, enum.EnumMeta):
+			enum_name = f"{value.__module__}.{value.__qualname__}"
 
-	# Hack to get the docutils tab size, as there doesn't appear to be any other way
-	class CustomRSTParser(RSTParser):
+			if "<locals>" not in enum_name:
+				member: enum.Enum
+				for member_name, member in value.__members__.items():
+					_constants.setdefault(id(member), (member, f":py:attr:`{enum_name}.{member_name}`"))
 
-		def parse(self, inputstring: Union[str, StringList], document: document) -> None:  # pragma: no cover
-			app.config.docutils_tab_width = document.settings.tab_width  # type: ignore
-			super().parse(inputstring, document)
+		elif name in documented and not (
+				type(value) in _unindexed_types or isinstance(value, ModuleType) or callable(value)
+				):
+			_constants.setdefault(id(value), (value, f":py:data:`{module_name}.{name}`"))
+
+
+_non_callable_types: Set[str] = {"module", "property"}
+"""
+Values of ``what`` in :event:`autodoc-process-docstring` for objects which never have default values.
+"""
+
+
+def process_docstring(
+		app: Sphinx,
+		what: str,
+		name: str,
+		obj: Any,
+		options: Dict[str, Any],
+		lines: List[str],
+		) -> None:
+	"""
+	Add default values to the docstring.
 
-	app.add_source_parser(CustomRSTParser, override=True)
+	.. versionchanged:: 0.8.0
+
+		The signature is only inspected if the docstring has a ``:param:`` field
+		to which a default value could be added.
+		If :confval:`default_values_insertion` is ``'doctree'`` the docstring is left unchanged,
+		and the object is recorded for :func:`~.insert_defaults`.
+
+	:param app: The Sphinx app.
+	:param what: The type of the object being documented.
+	:param name: The name of the object being documented.
+	:param obj: The object being documented.
+	:param options: Mapping of autodoc options to values.
+	:param lines: List of strings representing the current contents of the docstring.
+	"""
+
+	statistics = _statistics.current
+
+	if what in _non_callable_types or isinstance(obj, property) or not callable(obj):
+		statistics.objects_skipped += 1
+		return None
+
+	if app.config.default_values_insertion == "doctree":
+		# The default values are added to the parsed docstring by insert_defaults.
+		app.env.temp_data.setdefault("default_values_objects", {})[name] = obj
+		if _index is not None:
+			_add_to_index(app.env, what, name, obj, lines, _DocstringFields(lines), _get_formatted_defaults(obj))
+		return None
+
+	# Size varies depending on docutils config
+	a_tab = ' ' * app.env.default_values_tab_width  # type: ignore[attr-defined]
+	default_description_format: str = app.config.default_description_format
+
+	fields = _DocstringFields(lines)
+
+	if not fields.params:
+		# No default value can be added, so there is no need to inspect the signature.
+		# Any :default: and :no-default: fields are still removed.
+		statistics.objects_skipped += 1
+		if _index is not None:
+			_add_to_index(app.env, what, name, obj, lines, fields, _get_formatted_defaults(obj))
+		_add_defaults(lines, fields, (), a_tab, default_description_format)
+		return None
+
+	start = time.perf_counter()
+
+	with _trace("process_docstring", name=name, what=what):
+		formatted_defaults = _get_formatted_defaults(obj)
+
+		if _index is not None:
+			# Before the docstring is rewritten, while the overrides are still in it.
+			_add_to_index(app.env, what, name, obj, lines, fields, formatted_defaults)
+
+		with _trace("rewrite"):
+			# The same docstring and defaults are seen many times, e.g. for inherited members and aliases.
+			key = (tuple(lines), formatted_defaults, a_tab, default_description_format)
+			cached = _docstring_cache.get(key)
+
+			if cached is None:
+				counts = _add_defaults(lines, fields, formatted_defaults, a_tab, default_description_format)
+				_docstring_cache.put(key, (tuple(lines), counts))
+				statistics.docstring_cache_misses += 1
+			else:
+				new_lines, counts = cached
+				lines[:] = new_lines
+				statistics.docstring_cache_hits += 1
+
+	if _fingerprints is not None:
+		record_fingerprint(app.env, obj, name, formatted_defaults)
+
+	statistics.parameters += len(formatted_defaults)
+	statistics.defaults_rendered += counts[0]
+	statistics.overrides += counts[1]
+	statistics.suppressions += counts[2]
+	statistics.objects_processed += 1
+	statistics.add_time(name, time.perf_counter() - start)
+
+	return None
+
+
+_formatted_defaults = Tuple[Tuple[str, Optional[str]], ...]
+
+
+def _add_defaults(
+		lines: List[str],
+		fields: _DocstringFields,
+		formatted_defaults: _formatted_defaults,
+		a_tab: str,
+		default_description_format: str,
+		) -> Tuple[int, int, int]:
+	"""
+	Add the formatted default values to the docstring, and remove the ``:default:`` and ``:no-default:`` fields.
+
+	:param lines: List of strings representing the current contents of the docstring.
+	:param fields: The fields in the docstring.
+	:param formatted_defaults: The (escaped) argument names and formatted default values.
+	:param a_tab: The indentation of the body of a field.
+	:param default_description_format: The format string for the default value.
+
+	:return: The number of default values added, the number overridden with ``:default:``,
+		and the number suppressed with ``:no-default:``.
+	"""
+
+	overrides = suppressions = 0
+
+	if not lines or lines[-1]:
+		lines.append('')
+
+	consumed_defaults: Set[int] = set()
+	fullstops: Set[int] = set()
+	insertions: Dict[int, str] = {}
+
+	for argname, formatted_annotation in formatted_defaults:
+
+		# Check if the user has overridden the default value in the docstring
+		if argname in fields.defaults:
+			default_index = fields.defaults[argname]
+			formatted_annotation = ':'.join(lines[default_index].split(':')[2:]).lstrip()
+			consumed_defaults.add(default_index)
+			overrides += 1
+
+		# Check the user hasn't turned the default argument off
+		if argname in fields.no_defaults:
+			formatted_annotation = None
+			suppressions += 1
+
+		# Add the default value
+		insert_index = fields.params.get(argname)
+
+		if formatted_annotation is not None and insert_index is not None:
+
+			# Look ahead to find the index of the next unindented line, and insert before it.
+			# Overrides which have already been used no longer count as part of the docstring.
+			previous_index = insert_index
+			for idx in range(insert_index + 1, len(lines)):
+				if idx in consumed_defaults:
+					continue
+
+				if not lines[idx].startswith(a_tab):
+
+					# Ensure the previous line has a fullstop at the end.
+					line_content = ':'.join(lines[previous_index].split(':')[2:]).strip()
+					if line_content and line_content[-1] not in ".,;:":
+						fullstops.add(previous_index)
+
+					insertions[idx] = (
+							f"{a_tab}{default_description_format % formatted_annotation}".rstrip('.') + '.'
+							)
+					break
+
+				previous_index = idx
+
+	# Rebuild the docstring in a single pass with the default values added,
+	# and all remaining :default *: and :no-default *: lines removed.
+	new_lines = []
+
+	for idx, line in enumerate(lines):
+		if idx in insertions:
+			new_lines.append(insertions[idx])
+
+		if idx in fields.removals:
+			continue
+		elif idx in fullstops:
+			new_lines.append(f"{line}.")
+		else:
+			new_lines.append(line)
+
+	lines[:] = new_lines
+
+	return len(insertions), overrides, suppressions
+
+
+_field_name_regex: Pattern = re.compile(
+		fr"^(?:(?P<param>{_fields})|(?P<default>(?i:default))|(?P<no_default>(?i:no[-_]default)))"
+		r"(?:\s+(?P<name>.+))?$",
+		)
+
+
+def insert_defaults(app: Sphinx, domain: str, objtype: str, contentnode: addnodes.desc_content) -> None:
+	"""
+	Add default values to the ``:param:`` fields of an object's description,
+	if :confval:`default_values_insertion` is ``'doctree'``.
+
+	The fields are found in the parsed docstring, before Sphinx groups them,
+	so this works with any docstring format which produces ``:param:`` fields, such as Napoleon's.
+	The default values are added to the end of each field's first paragraph,
+	and the ``:default:`` and ``:no-default:`` fields are removed.
+
+	Each distinct default value is parsed once per document, and copied for each parameter with that default.
+
+	.. versionadded:: 0.8.0
+
+	:param app: The Sphinx app.
+	:param domain: The domain of the object.
+	:param objtype: The type of the object.
+	:param contentnode: The body of the object's description.
+	"""
+
+	objects: Optional[Dict[str, Any]] = app.env.temp_data.get("default_values_objects")
+	if not objects:
+		return None
+
+	for signode in contentnode.parent.children:
+		if not isinstance(signode, addnodes.desc_signature):
+			continue
+
+		name = '.'.join(filter(None, (signode.get("module"), signode.get("fullname"))))
+		if name in objects:
+			obj = objects[name]
+			break
+	else:
+		return None
+
+	statistics = _statistics.current
+	params: Dict[str, nodes.field_body] = {}
+	overrides: Dict[str, nodes.field_body] = {}
+	no_defaults: Set[str] = set()
+	removals: List[Tuple[nodes.field_list, nodes.field]] = []
+
+	for field_list in contentnode.children:
+		if not isinstance(field_list, nodes.field_list):
+			continue
+
+		for field in field_list.children:
+			if not isinstance(field, nodes.field):  # pragma: no cover
+				continue
+
+			field_body = field[1]
+			m = _field_name_regex.match(field[0].astext())
+			if m is None or not isinstance(field_body, nodes.field_body):
+				continue
+
+			argname = m.group("name")
+			if argname is not None:
+				argname = escape_trailing__(argname.strip())
+
+			if m.group("param") is not None:
+				if argname is not None:
+					params.setdefault(argname, field_body)
+			else:
+				removals.append((field_list, field))
+				if argname is None:
+					continue
+				elif m.group("default") is not None:
+					overrides.setdefault(argname, field_body)
+				else:
+					no_defaults.add(argname)
+
+	for field_list, field in removals:
+		field_list.remove(field)
+		if not field_list.children and field_list in contentnode.children:
+			contentnode.remove(field_list)
+
+	if not params:
+		# No default value can be added, so there is no need to inspect the signature.
+		statistics.objects_skipped += 1
+		return None
+
+	start = time.perf_counter()
+	default_description_format: str = app.config.default_description_format
+	prefix, suffix = default_description_format.split("%s", 1)
+	prefix = prefix.replace("%%", '%')
+	suffix = suffix.replace("%%", '%').rstrip('.') + '.'
+	rendered = n_overrides = n_suppressions = 0
+
+	with _trace("process_docstring", name=name, what=objtype):
+		formatted_defaults = _get_formatted_defaults(obj)
+
+		with _trace("rewrite"):
+			for argname, formatted in formatted_defaults:
+				value_nodes: Optional[List[nodes.Node]] = None
+
+				if argname in overrides:
+					value_nodes = _override_nodes(overrides[argname])
+					n_overrides += 1
+				elif formatted is not None:
+					value_nodes = _default_nodes(app.env, contentnode, formatted)
+
+				if argname in no_defaults:
+					value_nodes = None
+					n_suppressions += 1
+
+				if value_nodes is not None and argname in params:
+					_append_default(params[argname], [nodes.Text(prefix), *value_nodes, nodes.Text(suffix)])
+					rendered += 1
+
+	if _fingerprints is not None:
+		record_fingerprint(app.env, obj, name, formatted_defaults)
+
+	statistics.parameters += len(formatted_defaults)
+	statistics.defaults_rendered += rendered
+	statistics.overrides += n_overrides
+	statistics.suppressions += n_suppressions
+	statistics.objects_processed += 1
+	statistics.add_time(name, time.perf_counter() - start)
+
+	return None
+
+
+def _override_nodes(field_body: nodes.field_body) -> List[nodes.Node]:
+	"""
+	Returns the nodes making up the value of a ``:default:`` field.
+
+	:param field_body:
+	"""
+
+	if len(field_body) == 1 and isinstance(field_body[0], nodes.paragraph):
+		return list(field_body[0].children)
+	return [nodes.Text(field_body.astext())]
+
+
+def _default_nodes(env: BuildEnvironment, contentnode: nodes.Element, formatted: str) -> List[nodes.Node]:
+	"""
+	Returns the nodes for a formatted default value.
+
+	The value is parsed the first time it is seen in each document, and copies of those nodes are returned.
+
+	:param env: The Sphinx build environment.
+	:param contentnode: The body of the description of the object being documented.
+	:param formatted: The formatted default value, as reStructuredText.
+	"""
+
+	# temp_data is reset for each document.
+	parsed: Dict[str, List[nodes.Node]] = env.temp_data.setdefault("default_values_nodes", {})
+
+	if formatted not in parsed:
+		document = contentnode.document
+		if document is None:  # pragma: no cover
+			# The default value cannot be parsed outside of a document.
+			return [nodes.Text(formatted)]
+
+		if "default_values_inliner" not in env.temp_data:
+			inliner = Inliner()
+			inliner.init_customizations(document.settings)
+
+			# The same attributes as the memo docutils creates for each document.
+			env.temp_data["default_values_inliner"] = inliner, SimpleNamespace(
+				document=document,
+				reporter=document.reporter,
+				language=get_language(document.settings.language_code, document.reporter),
+				title_styles=[],
+				section_level=0,
+				section_bubble_up_kludge=False,
+				inliner=inliner,
+			)
+
+		inliner, memo = env.temp_data["default_values_inliner"]
+		parsed[formatted] = inliner.parse(formatted, contentnode.line or 0, memo, contentnode)[0]
+
+	return [node.deepcopy() for node in parsed[formatted]]
+
+
+def _append_default(field_body: nodes.field_body, default_nodes: List[nodes.Node]) -> None:
+	"""
+	Add the default value to the end of the first paragraph of a ``:param:`` field,
+	which is where it is added when the docstring is rewritten.
+
+	:param field_body:
+	:param default_nodes: The nodes to add.
+	"""
+
+	first = field_body[0] if len(field_body) else None
+
+	if isinstance(first, nodes.enumerated_list) and len(first) == 1 and not first.astext():
+		# A description such as "B." on its own is parsed as an empty enumerated list,
+		# but is a paragraph once the default value is written on the line after it.
+		first.replace_self(nodes.paragraph('', field_body.rawsource.split("\n\n", 1)[0].strip()))
+		first = field_body[0]
+
+	if isinstance(first, nodes.paragraph):
+		paragraph = first
+
+		# Ensure the previous line has a fullstop at the end.
+		text = paragraph.astext().strip()
+		if text and text[-1] not in ".,;:":
+			paragraph += nodes.Text('.')
+
+		paragraph += nodes.Text('\n')
+	else:
+		paragraph = nodes.paragraph()
+		field_body.insert(0, paragraph)
+
+	paragraph.extend(default_nodes)
+
+
+_defaults = Iterator[Tuple[str, Any]]
+
+
+class _LRUCache:
+	"""
+	A bounded mapping which discards the least recently used entries first, and counts hits and misses.
+
+	:param maxsize: The maximum number of entries to keep.
+	"""
+
+	def __init__(self, maxsize: int = 4096):
+		self.maxsize: int = maxsize
+		self.hits: int = 0
+		self.misses: int = 0
+		self._data: "OrderedDict[Any, Any]" = OrderedDict()
+
+	def get(self, key: Any, default: Any = None) -> Any:
+		"""
+		Returns the value for ``key``, or ``default`` if it is not in the cache.
+
+		:param key: Must be hashable.
+		:param default:
+		"""
+
+		try:
+			value = self._data[key]
+		except KeyError:
+			self.misses += 1
+			return default
+
+		self.hits += 1
+		self._data.move_to_end(key)
+		return value
+
+	def put(self, key: Any, value: Any) -> None:
+		"""
+		Store ``value`` for ``key``, discarding the least recently used entries if the cache is full.
+
+		:param key: Must be hashable.
+		:param value:
+		"""
+
+		self._data[key] = value
+		self._data.move_to_end(key)
+
+		while len(self._data) > self.maxsize:
+			self._data.popitem(last=False)
+
+	def clear(self) -> None:
+		"""
+		Remove all entries from the cache and reset the hit and miss counts.
+		"""
+
+		self._data.clear()
+		self.hits = 0
+		self.misses = 0
+
+	def __len__(self) -> int:
+		return len(self._data)
+
+
+_defaults_cache = _LRUCache()
+"""
+Per-build cache of the argument names and formatted default values of the objects being documented.
+"""
+
+_docstring_cache = _LRUCache(maxsize=1024)
+"""
+Per-build cache of the docstrings produced by :func:`~.process_docstring`, keyed on the docstring it was given,
+the formatted default values, and how they are formatted.
+"""
+
+_persistent_cache: Optional[PersistentCache] = None
+"""
+The cache of formatted default values shared between builds.
+
+Only used if :confval:`default_values_persistent_cache` is enabled.
+"""
+
+_formatting_options: List[str] = [
+		"default_values_safe_repr",
+		"default_values_repr_max_length",
+		"default_values_repr_max_depth",
+		"default_values_repr_max_items",
+		"default_values_repr_timeout",
+		"default_values_attrs_factories",
+		"default_values_reference_constants",
+		]
+"""
+Configuration values (besides :confval:`default_description_format`) which affect how default values are formatted.
+
+Changing any of these invalidates the persistent cache.
+"""
+
+
+def _get_formatted_defaults(obj: Callable) -> _formatted_defaults:
+	"""
+	Returns the (escaped) argument names and formatted default values for a class or function.
+
+	The result is cached for the current build, keyed on the object's identity,
+	so objects documented more than once (e.g. inherited members and aliases) are only inspected once.
+	Classes which inherit their constructor share the result for the constructor (see :func:`~._defaults_source`).
+	Only the formatted strings are stored, not the default values themselves.
+	If :confval:`default_values_persistent_cache` is enabled the result is also cached between builds.
+	Objects in the modules listed in :confval:`default_values_prewarm` are looked up
+	in the results of :func:`~.prewarm` rather than being inspected again.
+
+	:param obj: The class or function.
+	"""
+
+	obj = _defaults_source(obj)
+
+	try:
+		cached = _defaults_cache.get(obj)
+	except TypeError:  # Unhashable
+		cached = key = None
+	else:
+		key = obj
+
+	statistics = _statistics.current
+
+	if cached is not None:
+		statistics.defaults_cache_hits += 1
+		return cached
+
+	statistics.defaults_cache_misses += 1
+	persistent_key = None
+
+	if _persistent_cache is not None:
+		persistent_key = _persistent_cache.make_key(obj)
+
+		if persistent_key is not None:
+			cached = _persistent_cache.get(persistent_key)
+
+			if cached is not None:
+				if key is not None:
+					_defaults_cache.put(key, cached)
+				return cached
+
+	formatted_defaults = _prewarmed.get(_prewarm_key(obj)) if _prewarmed else None  # type: ignore[arg-type]
+
+	if formatted_defaults is None:
+		formatted_defaults = _compute_formatted_defaults(obj)
+
+	if key is not None:
+		_defaults_cache.put(key, formatted_defaults)
+	if persistent_key is not None:
+		_persistent_cache.put(persistent_key, formatted_defaults)  # type: ignore[union-attr]
+
+	return formatted_defaults
+
+
+def _compute_formatted_defaults(obj: Callable) -> _formatted_defaults:
+	"""
+	Inspect a class or function, and return its (escaped) argument names and formatted default values.
+
+	:param obj: The class or function.
+	"""
+
+	with _trace("defaults"):
+		defaults = _extract_defaults(obj)
+
+	if _index is not None:
+		_record_default_reprs(obj, defaults)
+
+	with _trace("format"):
+		return tuple(_format_defaults(obj, defaults))
+
+
+def _extract_defaults(obj: Callable) -> List[Tuple[str, Any]]:
+	"""
+	Returns the argument names and default values of a class or function.
+
+	:param obj: The class or function.
+	"""
+
+	if inspect.isclass(obj):
+		return list(get_class_defaults(obj, call_factories=_call_attrs_factories))
+	else:
+		return list(get_function_defaults(obj))
+
+
+def _format_defaults(obj: Callable, defaults: Iterable[Tuple[str, Any]]) -> Iterator[Tuple[str, Optional[str]]]:
+	"""
+	Escape the argument names and format the default values.
+
+	:param obj: The class or function the defaults belong to.
+	:param defaults: 2-element tuples comprising the argument name and its default value.
+	"""
+
+	if _reference_constants:
+		module_name = getattr(obj, "__module__", None)
+
+		if isinstance(module_name, str):
+			_index_constants(module_name)
+
+	for argname, default_value in defaults:
+		formatted_default = format_default_value(default_value)
+
+		if _safe_repr is not None and _safe_repr.limited:
+			_safe_repr.limited = False
+			name = f"{getattr(obj, '__module__', None)}.{getattr(obj, '__qualname__', obj)}"
+			logger.info("default_values: the default value of %r for %s was shortened.", argname, name)
+
+		yield escape_trailing__(argname), formatted_default
+
+
+def get_class_defaults(obj: Type, call_factories: bool = True) -> _defaults:
+	"""
+	Obtains the default values for the arguments of a class.
+
+	.. versionchanged:: 0.8.0
+
+		Added the ``call_factories`` argument.
+
+		The defaults of dataclasses, named tuples and pydantic models are read from the fields of the class.
+		Support for other kinds of class can be added with :func:`~.register_class_defaults_extractor`.
+		Other classes have their defaults read from the signature of their constructor,
+		which may be the ``__call__`` method of their metaclass or their ``__new__`` method
+		rather than their ``__init__`` method. See :func:`~._get_constructor`.
+
+	:param obj: The class.
+	:param call_factories: Whether to call the factories of :mod:`attrs` fields to obtain their default values.
+		If :py:obj:`False` the :class:`attr.Factory` itself is given as the default value.
+		Factories which take ``self`` are never called,
+		and nor are the default factories of dataclasses and pydantic models.
+
+	:return: An iterator of 2-element tuples comprising the argument name and its default value.
+	"""
+
+	yield from _get_class_defaults_extractor(obj)(obj, call_factories)
+
+
+_class_defaults_extractor = Callable[[Type, bool], _defaults]
+
+_class_extractors: List[Tuple[Callable[[Type], bool], _class_defaults_extractor]] = []
+"""
+The registered functions for obtaining the default values of classes, and the predicates which select them.
+"""
+
+_class_extractor_cache: "weakref.WeakKeyDictionary[Type, _class_defaults_extractor]" = weakref.WeakKeyDictionary()
+"""
+The function chosen for each class which has been documented.
+"""
+
+
+def register_class_defaults_extractor(
+		predicate: Callable[[Type], bool],
+		extractor: _class_defaults_extractor,
+		) -> None:
+	"""
+	Register a function to obtain the default values for the arguments of some kind of class.
+
+	Extractors registered later take precedence over those registered earlier.
+	Classes not matched by any extractor have their defaults read from the signature of their constructor.
+
+	.. versionadded:: 0.8.0
+
+	:param predicate: Function which returns whether ``extractor`` should be used for the given class.
+		It is called once for each class, and should be cheap.
+	:param extractor: Function which takes the class and the ``call_factories`` argument
+		to :func:`~.get_class_defaults`, and returns an iterator of 2-element tuples
+		comprising the argument name and its default value.
+	"""
+
+	_class_extractors.insert(0, (predicate, extractor))
+	_class_extractor_cache.clear()
+
+
+def _get_class_defaults_extractor(obj: Type) -> _class_defaults_extractor:
+	"""
+	Returns the function to obtain the default values for the arguments of the given class.
+
+	:param obj:
+	"""
+
+	try:
+		return _class_extractor_cache[obj]
+	except (KeyError, TypeError):
+		pass
+
+	for predicate, extractor in _class_extractors:
+		if predicate(obj):
+			break
+	else:
+		extractor = _get_constructor_defaults
+
+	try:
+		_class_extractor_cache[obj] = extractor
+	except TypeError:  # pragma: no cover
+		pass
+
+	return extractor
+
+
+def _get_constructor_defaults(obj: Type, call_factories: bool) -> _defaults:
+	"""
+	Obtains the default values for the arguments of a class from the signature of its constructor.
+
+	:param obj:
+	:param call_factories:
+	"""
+
+	return _get_defaults(_get_constructor(obj))
+
+
+_builtin_method_types = (
+		BuiltinFunctionType,
+		ClassMethodDescriptorType,
+		MethodDescriptorType,
+		MethodWrapperType,
+		WrapperDescriptorType,
+		)
+"""
+The types of methods implemented in C, such as :meth:`object.__init__` and :meth:`type.__call__`.
+"""
+
+_constructor_cache: "weakref.WeakKeyDictionary[Type, Callable]" = weakref.WeakKeyDictionary()
+"""
+The constructor chosen for each class which has been documented.
+"""
+
+_inherited_constructor_cache: "weakref.WeakKeyDictionary[Type, Optional[Callable]]" = weakref.WeakKeyDictionary()
+"""
+The ``__new__`` or ``__init__`` method each class defines or inherits, or :py:obj:`None` if it has neither.
+"""
+
+
+def _get_constructor(obj: Type) -> Callable:
+	"""
+	Returns the method whose signature is the signature of the given class.
+
+	As when the class is called, this is the ``__call__`` method of its metaclass, if it defines one,
+	and otherwise the ``__new__`` or ``__init__`` method defined furthest down the class's MRO
+	(``__new__`` if a class defines both).
+	Methods implemented in C, and those which only take ``*args`` and ``**kwargs`` to pass on to the next method,
+	are skipped. If no method is found the class's ``__init__`` method is returned.
+
+	The method is returned as it is defined, including its first argument (``cls`` or ``self``),
+	so classes which inherit their constructor all return the same function.
+
+	:param obj:
+	"""
+
+	try:
+		return _constructor_cache[obj]
+	except (KeyError, TypeError):
+		pass
+
+	constructor = _get_metaclass_call(type(obj)) or _get_inherited_constructor(obj) or getattr(obj, "__init__")
+
+	try:
+		_constructor_cache[obj] = constructor
+	except TypeError:  # pragma: no cover
+		pass
+
+	return constructor
+
+
+def _get_inherited_constructor(obj: Type) -> Optional[Callable]:
+	"""
+	Returns the ``__new__`` or ``__init__`` method defined furthest down the class's MRO,
+	or :py:obj:`None` if no class in the MRO defines one.
+
+	A class with a single base which defines neither method has the same MRO as its base after itself,
+	and so the same constructor. The bases are followed until a class whose constructor is cached,
+	and the result is cached for every class on the way, so each class in a deep hierarchy is only examined once.
+
+	:param obj:
+	"""
+
+	unresolved = []
+	cls = obj
+
+	while True:
+		try:
+			constructor = _inherited_constructor_cache[cls]
+			break
+		except (KeyError, TypeError):
+			pass
+
+		unresolved.append(cls)
+		namespace = vars(cls)
+		constructor = _get_own_method(namespace, "__new__") or _get_own_method(namespace, "__init__")
+		if constructor is not None:
+			break
+
+		bases: Tuple[type, ...] = getattr(cls, "__bases__", ())
+		if len(bases) != 1:
+			# The MRO of a class with several bases is not that of any one of them.
+			for base in getattr(cls, "__mro__", ())[1:]:
+				namespace = vars(base)
+				constructor = _get_own_method(namespace, "__new__") or _get_own_method(namespace, "__init__")
+				if constructor is not None:
+					break
+			break
+
+		cls = bases[0]
+
+	for cls in unresolved:
+		try:
+			_inherited_constructor_cache[cls] = constructor
+		except TypeError:  # pragma: no cover
+			pass
+
+	return constructor
+
+
+def _get_metaclass_call(metaclass: type) -> Optional[Callable]:
+	"""
+	Returns the ``__call__`` method of a metaclass,
+	if it defines one which takes more than ``*args`` and ``**kwargs``.
+
+	:param metaclass:
+	"""
+
+	for base in metaclass.__mro__:
+		if base is type:
+			break
+
+		method = _get_own_method(vars(base), "__call__")
+		if method is not None:
+			return method
+
+	return None
+
+
+def _get_own_method(namespace: Mapping[str, Any], name: str) -> Optional[Callable]:
+	"""
+	Returns the method with the given name from the namespace of a class,
+	unless it is implemented in C or only takes ``*args`` and ``**kwargs``.
+
+	:param namespace:
+	:param name:
+	"""
+
+	method = namespace.get(name)
+
+	if method is None or isinstance(method, _builtin_method_types):
+		return None
+	elif isinstance(method, staticmethod):
+		method = method.__func__
+
+	try:
+		code = getattr(inspect.unwrap(method), "__code__", None)
+	except ValueError:  # pragma: no cover
+		code = None
+
+	if (
+			code is not None and code.co_argcount <= 1 and not code.co_kwonlyargcount
+			and code.co_flags & (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS)
+			):
+		# e.g. def __new__(cls, *args, **kwargs)
+		return None
+
+	return method
+
+
+def _defaults_source(obj: Callable) -> Callable:
+	"""
+	Returns the object the default values of ``obj`` are read from.
+
+	For classes whose defaults are read from the signature of their constructor this is the constructor,
+	so subclasses which inherit it share its cached default values. Otherwise it is ``obj`` itself.
+
+	:param obj: The class or function.
+	"""
+
+	if inspect.isclass(obj) and _get_class_defaults_extractor(obj) is _get_constructor_defaults:
+		return _get_constructor(obj)
+
+	return obj
+
+
+def _is_attrs_class(obj: Type) -> bool:
+	"""
+	Returns whether ``obj`` is an :mod:`attrs` class.
+
+	:param obj:
+	"""
+
+	return hasattr(obj, "__attrs_attrs__")
+
+
+def _get_attrs_defaults(obj: Type, call_factories: bool) -> _defaults:
+	"""
+	Obtains the default values for the arguments of an :mod:`attrs` class.
+
+	:param obj:
+	:param call_factories:
+	"""
+
+	attrs_fields = {field.name: field for field in obj.__attrs_attrs__}
+
+	for argname, default_value in _get_defaults(getattr(obj, "__init__")):
+
+		if default_value is attr.NOTHING and argname in attrs_fields:
+			field_default = attrs_fields[argname].default
+
+			if isinstance(field_default, attr.Factory):  # type: ignore[arg-type]
+				if call_factories and not field_default.takes_self:
+					default_value = field_default.factory()
+				else:
+					default_value = field_default
+
+		yield argname, default_value
+
+
+def _get_dataclass_init_owner(obj: Type) -> Optional[Type]:
+	"""
+	Returns the dataclass which generated the ``__init__`` method of ``obj`` from its fields,
+	or :py:obj:`None` if the ``__init__`` method was not generated by a dataclass.
+
+	:param obj:
+	"""
+
+	# The generated __init__ may have been overridden in a subclass.
+	for base in getattr(obj, "__mro__", ()):
+		namespace = vars(base)
+		if "__init__" in namespace:
+			break
+	else:  # pragma: no cover
+		return None
+
+	if "__dataclass_fields__" not in namespace or not getattr(base, "__dataclass_params__").init:
+		return None
+
+	# A dataclass may still define its own __init__ method.
+	code = getattr(namespace["__init__"], "__code__", None)
+	if code is None:
+		return None
+
+	argnames = code.co_varnames[1:code.co_argcount + code.co_kwonlyargcount]
+	if set(argnames) != {field.name for field in dataclasses.fields(base) if field.init}:
+		return None
+
+	return base
+
+
+def _is_dataclass(obj: Type) -> bool:
+	"""
+	Returns whether ``obj`` is a dataclass, or a subclass of one,
+	whose ``__init__`` method was generated from the fields of a dataclass.
+
+	:param obj:
+	"""
+
+	return hasattr(obj, "__dataclass_fields__") and _get_dataclass_init_owner(obj) is not None
+
+
+def _get_dataclass_defaults(obj: Type, call_factories: bool) -> _defaults:
+	"""
+	Obtains the default values for the arguments of a dataclass
+	from the fields of the dataclass which generated its ``__init__`` method.
+
+	:param obj:
+	:param call_factories:
+	"""
+
+	dataclass = _get_dataclass_init_owner(obj) or obj
+
+	for field in dataclasses.fields(dataclass):
+		if not field.init:
+			continue
+		elif field.default is not dataclasses.MISSING:
+			yield field.name, field.default
+		elif field.default_factory is not dataclasses.MISSING:
+			yield field.name, _FactoryReference(field.default_factory)
+		else:
+			yield field.name, inspect.Parameter.empty
+
+
+def _is_namedtuple(obj: Type) -> bool:
+	"""
+	Returns whether ``obj`` is a named tuple whose ``__new__`` method was generated from its fields.
+
+	:param obj:
+	"""
+
+	if not isinstance(getattr(obj, "_field_defaults", None), dict):
+		return False
+
+	# The generated __new__ may have been overridden in a subclass.
+	for base in getattr(obj, "__mro__", ()):
+		if "__new__" in vars(base):
+			return "_field_defaults" in vars(base)
+
+	return False  # pragma: no cover
+
+
+def _get_namedtuple_defaults(obj: Type, call_factories: bool) -> _defaults:
+	"""
+	Obtains the default values for the arguments of a named tuple from its fields.
+
+	:param obj:
+	:param call_factories:
+	"""
+
+	field_defaults = obj._field_defaults
+
+	for field in obj._fields:
+		yield field, field_defaults.get(field, inspect.Parameter.empty)
+
+
+def _is_pydantic_model(obj: Type) -> bool:
+	"""
+	Returns whether ``obj`` is a pydantic model which uses the ``__init__`` method of :class:`pydantic.BaseModel`.
+
+	:param obj:
+	"""
+
+	init_module = getattr(getattr(obj, "__init__", None), "__module__", None)
+	return init_module == "pydantic.main" and isinstance(getattr(obj, "model_fields", None), dict)
+
+
+def _get_pydantic_defaults(obj: Type, call_factories: bool) -> _defaults:
+	"""
+	Obtains the default values for the arguments of a pydantic model from its fields.
+
+	:param obj:
+	:param call_factories:
+	"""
+
+	for name, field in obj.model_fields.items():
+		if field.default_factory is not None:
+			yield name, _FactoryReference(field.default_factory)
+		elif field.is_required():
+			yield name, inspect.Parameter.empty
+		else:
+			yield name, field.default
+
+
+register_class_defaults_extractor(_is_pydantic_model, _get_pydantic_defaults)
+register_class_defaults_extractor(_is_namedtuple, _get_namedtuple_defaults)
+register_class_defaults_extractor(_is_dataclass, _get_dataclass_defaults)
+
+if _attrs_factory is not None:
+	register_class_defaults_extractor(_is_attrs_class, _get_attrs_defaults)
+
+
+def get_function_defaults(obj: Callable) -> _defaults:
+	"""
+	Obtains the default values for the arguments of a function.
+
+	:param obj: The function.
+
+	:return: An iterator of 2-element tuples comprising the argument name and its default value.
+	"""
+
+	yield from _get_defaults(obj)
+
+
+def _is_plain_function(obj: Any) -> bool:
+	"""
+	Returns whether ``obj`` is a plain Python function whose signature can be read from its code object.
+
+	:param obj:
+	"""
+
+	if not isinstance(obj, FunctionType):
+		return False
+
+	for attribute in ("__signature__", "__text_signature__", "_partialmethod", "__partialmethod__"):
+		if getattr(obj, attribute, None) is not None:
+			return False
+
+	return True
+
+
+def _get_defaults(obj: Callable) -> _defaults:
+	"""
+	Obtains the default values for the arguments of a callable, without evaluating its type hints.
+
+	Plain Python functions, and methods bound to them, are handled by reading ``__defaults__``,
+	``__kwdefaults__`` and the argument names from the code object directly.
+	Other callables, such as builtins, :class:`functools.partial` objects,
+	and objects with a ``__signature__`` or ``__text_signature__``, fall back to :func:`~.get_arguments`.
+
+	:param obj: A function (can be the ``__init__`` method of a class).
+
+	:return: An iterator of 2-element tuples comprising the argument name and its default value.
+	"""
+
+	try:
+		func = inspect.unwrap(obj)
+	except ValueError:  # pragma: no cover
+		_statistics.current.signature_failures += 1
+		return
+
+	bound = isinstance(func, MethodType)
+	if bound:
+		func = func.__func__
+
+	if not _is_plain_function(func) or (bound and not func.__code__.co_argcount):
+		for argname, param in get_arguments(obj).items():
+			yield argname, param.default
+		return
+
+	code = func.__code__
+	argnames = code.co_varnames
+	n_positional = code.co_argcount
+	n_keyword_only = code.co_kwonlyargcount
+
+	defaults = func.__defaults__ or ()
+	kwdefaults = func.__kwdefaults__ or {}
+	first_default = n_positional - len(defaults)
+
+	# The first argument of a bound method (i.e. ``self``) is not part of its signature.
+	for idx in range(1 if bound else 0, n_positional):
+		if idx >= first_default:
+			yield argnames[idx], defaults[idx - first_default]
+		else:
+			yield argnames[idx], inspect.Parameter.empty
+
+	next_index = n_positional + n_keyword_only
+
+	if code.co_flags & inspect.CO_VARARGS:
+		yield argnames[next_index], inspect.Parameter.empty
+		next_index += 1
+
+	for argname in argnames[n_positional:n_positional + n_keyword_only]:
+		yield argname, kwdefaults.get(argname, inspect.Parameter.empty)
+
+	if code.co_flags & inspect.CO_VARKEYWORDS:
+		yield argnames[next_index], inspect.Parameter.empty
+
+
+def get_arguments(obj: Callable) -> Mapping[str, inspect.Parameter]:
+	"""
+	Returns a dictionary mapping argument names to parameters/arguments for a function.
+
+	:param obj: A function (can be the ``__init__`` method of a class).
+	"""
+
+	try:
+		with _trace("get_arguments"):
+			signature = Signature(inspect.unwrap(obj))
+	except ValueError:
+		_statistics.current.signature_failures += 1
+		return {}
+
+	return signature.parameters
+
+
+def process_default_format(app: Sphinx) -> None:
+	"""
+	Prepare the formatting of the default value.
+
+	:param app:
+	"""
+
+	default_description_format = _normalise_format(app.config.default_description_format)
+	app.config.default_description_format = default_description_format  # type: ignore
+
+
+def _normalise_format(default_description_format: str) -> str:
+	"""
+	Returns the format string for the default value, with a substitution preceded by whitespace.
+
+	:param default_description_format:
+	"""
+
+	# Check the substitution is in the string and is preceded by whitespace, or is at the beginning of the string
+	if "%s" in default_description_format:
+		if re.search(r"[^\s]%s", default_description_format) and not default_description_format.startswith("%s"):
+			default_description_format = default_description_format.replace("%s", " %s")
+	else:
+		# Add the substitution to the end.
+		if default_description_format[-1] not in string.whitespace:
+			default_description_format += " %s"
+		else:
+			default_description_format += "%s"
+
+	return default_description_format
+
+
+def configure_formatting(app: Sphinx) -> None:
+	"""
+	Prepare the formatting of default values from the configuration.
+
+	.. versionadded:: 0.8.0
+
+	:param app:
+	"""
+
+	_configure_formatting({name: getattr(app.config, name) for name in _formatting_options})
+
+
+def _configure_formatting(options: Mapping[str, Any]) -> None:
+	"""
+	Prepare the formatting of default values.
+
+	:param options: Mapping of the names in :data:`~._formatting_options` to their values.
+	"""
+
+	global _safe_repr, _call_attrs_factories, _reference_constants
+
+	_format_memo.clear()
+	_constants.clear()
+	_indexed_modules.clear()
+	_call_attrs_factories = options["default_values_attrs_factories"] == "call"
+	_reference_constants = options["default_values_reference_constants"]
+
+	if options["default_values_safe_repr"]:
+		_safe_repr = _SafeRepr(
+				max_length=options["default_values_repr_max_length"],
+				max_depth=options["default_values_repr_max_depth"],
+				max_items=options["default_values_repr_max_items"],
+				timeout=options["default_values_repr_timeout"],
+				)
+	else:
+		_safe_repr = None
+
+
+def configure_tab_width(app: Sphinx, env: BuildEnvironment, docnames: List[str]) -> None:
+	"""
+	Look up the docutils tab width, which determines how the bodies of fields are indented.
+
+	It is looked up once per build, before any documents are read, from the settings Sphinx reads them with.
+	These may be changed in a ``docutils.conf`` file.
+
+	.. versionadded:: 0.8.0
+
+	:param app:
+	:param env:
+	:param docnames:
+	"""
+
+	settings: Any
+
+	if hasattr(app.registry, "get_publisher"):
+		# The publisher is cached and reused by Sphinx to read reStructuredText documents.
+		settings = app.registry.get_publisher(app, "restructuredtext").settings
+	else:  # pragma: no cover (Sphinx < 5.1)
+		option_parser = OptionParser(components=(RSTParser, ), defaults=env.settings, read_config_files=True)
+		settings = option_parser.get_default_values()
+
+	env.default_values_tab_width = settings.tab_width  # type: ignore[attr-defined]
+
+
+def configure_caches(app: Sphinx) -> None:
+	"""
+	Prepare the per-build caches.
+
+	.. versionadded:: 0.8.0
+
+	:param app:
+	"""
+
+	global _persistent_cache
+
+	_defaults_cache.clear()
+	_defaults_cache.maxsize = app.config.default_values_cache_size
+	_docstring_cache.clear()
+	_docstring_cache.maxsize = app.config.default_values_docstring_cache_size
+
+	if _persistent_cache is not None:
+		_persistent_cache.close()
+		_persistent_cache = None
+
+	if app.config.default_values_persistent_cache:
+		options = {name: getattr(app.config, name) for name in _formatting_options}
+		_persistent_cache = PersistentCache(
+				os.path.join(app.doctreedir, "default_values.sqlite3"),
+				maxsize=app.config.default_values_persistent_cache_size,
+				version=__version__,
+				default_description_format=app.config.default_description_format,
+				options=options,
+				)
+
+		# Stored in the environment so the updates from parallel read workers are sent back to the main process.
+		app.env.default_values_persistent_cache_updates = _persistent_cache.updates  # type: ignore[attr-defined]
+
+
+def merge_caches(app: Sphinx, env: BuildEnvironment, docnames: Set[str], other: BuildEnvironment) -> None:
+	"""
+	Merge the persistent cache updates from a parallel read worker.
+
+	.. versionadded:: 0.8.0
+
+	:param app:
+	:param env:
+	:param docnames:
+	:param other:
+	"""
+
+	if _persistent_cache is not None:
+		_persistent_cache.merge(getattr(other, "default_values_persistent_cache_updates", {}))
+
+
+def flush_caches(app: Sphinx, env: BuildEnvironment) -> None:
+	"""
+	Write the new entries in the persistent cache to disk, once all documents have been read.
+
+	.. versionadded:: 0.8.0
+
+	:param app:
+	:param env:
+	"""
+
+	if _persistent_cache is not None:
+		_persistent_cache.flush()
+
+
+def clear_caches(app: Sphinx, exception: Optional[Exception] = None) -> None:
+	"""
+	Report the hit and miss counts of the per-build caches, and then clear them.
+
+	.. versionadded:: 0.8.0
+
+	:param app:
+	:param exception:
+	"""
+
+	# The counts are taken from the statistics, which include those of any parallel read workers.
+	totals = _statistics.as_dict()
+	logger.verbose(
+			"default_values: defaults cache %d hits, %d misses",
+			totals["defaults_cache_hits"],
+			totals["defaults_cache_misses"],
+			)
+	logger.verbose(
+			"default_values: docstring cache %d hits, %d misses",
+			totals["docstring_cache_hits"],
+			totals["docstring_cache_misses"],
+			)
+	_defaults_cache.clear()
+	_docstring_cache.clear()
+	_format_memo.clear()
+	_constants.clear()
+	_indexed_modules.clear()
+	_prewarmed.clear()
+
+	if _persistent_cache is not None:
+		_persistent_cache.close()
+
+
+def configure_tracing(app: Sphinx) -> None:
+	"""
+	Start recording the time spent adding default values to docstrings,
+	if :confval:`default_values_trace` is enabled.
+
+	.. versionadded:: 0.8.0
+
+	:param app:
+	"""
+
+	global _tracer
+
+	if app.config.default_values_trace:
+		_tracer = Tracer()
+
+		# Sent back from parallel read workers with the environment.
+		app.env.default_values_tracer = _tracer  # type: ignore[attr-defined]
+	else:
+		_tracer = None
+
+
+def merge_traces(app: Sphinx, env: BuildEnvironment, docnames: Set[str], other: BuildEnvironment) -> None:
+	"""
+	Merge the events recorded by a parallel read worker.
+
+	.. versionadded:: 0.8.0
+
+	:param app:
+	:param env:
+	:param docnames:
+	:param other:
+	"""
+
+	if _tracer is not None and hasattr(other, "default_values_tracer"):
+		_tracer.merge(other.default_values_tracer)
+
+
+def detach_tracer(app: Sphinx, env: BuildEnvironment) -> None:
+	"""
+	Remove the tracer from the build environment once the events of any parallel read workers have been merged,
+	so the events are not saved with the environment.
+
+	.. versionadded:: 0.8.0
+
+	:param app:
+	:param env:
+	"""
+
+	if hasattr(env, "default_values_tracer"):
+		del env.default_values_tracer
+
+
+def write_trace(app: Sphinx, exception: Optional[Exception] = None) -> None:
+	"""
+	Write the recorded events to ``default_values_trace.json`` in the output directory.
+
+	.. versionadded:: 0.8.0
+
+	:param app:
+	:param exception:
+	"""
+
+	global _tracer
+
+	if _tracer is not None:
+		filename = os.path.join(app.outdir, "default_values_trace.json")
+		_tracer.write(filename)
+		logger.info("default_values: trace written to %s", filename)
+		_tracer = None
+
+
+def configure_statistics(app: Sphinx) -> None:
+	"""
+	Start counting what the extension does during the build.
+
+	.. versionadded:: 0.8.0
+
+	:param app:
+	"""
+
+	global _statistics
+
+	_statistics = BuildStatistics()
+
+	# Sent back from parallel read workers with the environment.
+	app.env.default_values_statistics = _statistics  # type: ignore[attr-defined]
+
+
+def merge_statistics(app: Sphinx, env: BuildEnvironment, docnames: Set[str], other: BuildEnvironment) -> None:
+	"""
+	Merge the statistics of a parallel read worker.
+
+	.. versionadded:: 0.8.0
+
+	:param app:
+	:param env:
+	:param docnames:
+	:param other:
+	"""
+
+	if hasattr(other, "default_values_statistics"):
+		_statistics.merge(other.default_values_statistics)
+
+
+def detach_statistics(app: Sphinx, env: BuildEnvironment) -> None:
+	"""
+	Remove the statistics from the build environment once those of any parallel read workers have been merged,
+	so they are not saved with the environment.
+
+	.. versionadded:: 0.8.0
+
+	:param app:
+	:param env:
+	"""
+
+	if hasattr(env, "default_values_statistics"):
+		del env.default_values_statistics
+
+
+def report_statistics(app: Sphinx, exception: Optional[Exception] = None) -> None:
+	"""
+	Log a one-line summary of what the extension did during the build.
+
+	.. versionadded:: 0.8.0
+
+	:param app:
+	:param exception:
+	"""
+
+	if exception is None:
+		logger.info("default_values: %s", _statistics.summary())
+
+
+def get_statistics(env: BuildEnvironment) -> Dict[str, Any]:
+	"""
+	Returns counts of what the extension did during the current build, for use by other extensions.
+
+	The dictionary has the following keys:
+
+	* ``objects_processed`` -- the number of objects whose docstrings were processed.
+	* ``objects_skipped`` -- the number of objects which were skipped, as they are not callable or are properties,
+	  or as their docstrings have no parameters to add default values to.
+	* ``parameters`` -- the number of parameters of the processed objects.
+	* ``defaults_rendered`` -- the number of default values added to docstrings.
+	* ``overrides`` -- the number of ``:default:`` fields which replaced the default value.
+	* ``suppressions`` -- the number of ``:no-default:`` fields which suppressed a default value.
+	* ``signature_failures`` -- the number of objects whose signature could not be read.
+	* ``total_time`` -- the total time spent processing docstrings, in seconds.
+	* ``docstring_cache_hits`` and ``docstring_cache_misses`` -- how often the docstring produced for an
+	  identical docstring and default values was reused. See :confval:`default_values_docstring_cache_size`.
+	* ``defaults_cache_hits`` and ``defaults_cache_misses`` -- how often the formatted default values
+	  of an object were reused within the build. See :confval:`default_values_cache_size`.
+	* ``slowest`` -- a list of ``(name, seconds)`` tuples for the ten slowest objects, slowest first.
+
+	The counts from parallel read workers are included once they have been merged,
+	i.e. from the :event:`env-updated` event onwards.
+
+	.. versionadded:: 0.8.0
+
+	:param env:
+	"""
+
+	statistics: BuildStatistics = getattr(env, "default_values_statistics", _statistics)
+	return statistics.as_dict()
+
+
+_fingerprints: Optional[Fingerprints] = None
+"""
+The fingerprints of the default values shown in each document.
+
+The fingerprints themselves are stored in the build environment, so they persist between builds.
+"""
+
+
+def configure_fingerprints(app: Sphinx) -> None:
+	"""
+	Prepare to record the default values shown in each document.
+
+	.. versionadded:: 0.8.0
+
+	:param app:
+	"""
+
+	global _fingerprints
+
+	if not hasattr(app.env, "default_values_fingerprints"):
+		app.env.default_values_fingerprints = {}  # type: ignore[attr-defined]
+
+	_fingerprints = Fingerprints(
+			app.env.default_values_fingerprints,  # type: ignore[attr-defined]
+			repr((
+					__version__,
+					app.config.default_description_format,
+					[getattr(app.config, name) for name in _formatting_options],
+					)),
+			)
+
+
+def record_fingerprint(
+		env: BuildEnvironment,
+		obj: Any,
+		name: str,
+		formatted_defaults: _formatted_defaults,
+		) -> None:
+	"""
+	Record the default values shown for an object in the document currently being read.
+
+	.. versionadded:: 0.8.0
+
+	:param env:
+	:param obj: The object being documented.
+	:param name: The name of the object being documented.
+	:param formatted_defaults: The (escaped) argument names and formatted default values.
+	"""
+
+	docname = env.temp_data.get("docname")
+	if _fingerprints is not None and docname is not None:
+		_fingerprints.record(docname, obj, name, formatted_defaults)
+
+
+def purge_fingerprints(app: Sphinx, env: BuildEnvironment, docname: str) -> None:
+	"""
+	Forget the default values shown in a document which is about to be read again, or has been removed.
+
+	.. versionadded:: 0.8.0
+
+	:param app:
+	:param env:
+	:param docname:
+	"""
+
+	getattr(env, "default_values_fingerprints", {}).pop(docname, None)
+
+
+def merge_fingerprints(app: Sphinx, env: BuildEnvironment, docnames: Set[str], other: BuildEnvironment) -> None:
+	"""
+	Merge the default values shown in the documents read by a parallel read worker.
+
+	.. versionadded:: 0.8.0
+
+	:param app:
+	:param env:
+	:param docnames:
+	:param other:
+	"""
+
+	other_fingerprints = getattr(other, "default_values_fingerprints", {})
+
+	for docname in docnames:
+		if docname in other_fingerprints:
+			env.default_values_fingerprints[docname] = other_fingerprints[docname]  # type: ignore[attr-defined]
+
+
+def finish_fingerprints(app: Sphinx, exception: Optional[Exception] = None) -> None:
+	"""
+	Stop recording the default values shown in each document.
+
+	The fingerprints recorded during the build remain in the saved build environment.
+
+	.. versionadded:: 0.8.0
+
+	:param app:
+	:param exception:
+	"""
+
+	global _fingerprints
+
+	_fingerprints = None
+
+
+def get_outdated_docs(
+		app: Sphinx,
+		env: BuildEnvironment,
+		added: Set[str],
+		changed: Set[str],
+		removed: Set[str],
+		) -> List[str]:
+	"""
+	Returns the documents whose default values would be shown differently if they were read again.
+
+	.. versionadded:: 0.8.0
+
+	:param app:
+	:param env:
+	:param added:
+	:param changed:
+	:param removed:
+	"""
+
+	if _fingerprints is None:
+		return []
+
+	outdated = _fingerprints.outdated(added | changed | removed, _get_formatted_defaults)
+
+	if outdated:
+		logger.info("default_values: %d documents have changed default values", len(outdated))
+
+	return outdated
+
+
+_prewarmed: Dict[Tuple[str, str, str], _formatted_defaults] = {}
+"""
+The formatted default values computed by :func:`~.prewarm`,
+keyed on each object's module, qualified name and type.
+"""
+
+
+def prewarm(app: Sphinx) -> None:
+	"""
+	Import the modules listed in :confval:`default_values_prewarm` in a pool of worker processes,
+	and compute the formatted default values of their public classes, functions and methods.
+
+	:func:`~.process_docstring` uses these results rather than inspecting the objects itself.
+
+	.. versionadded:: 0.8.0
+
+	:param app:
+	"""
+
+	_prewarmed.clear()
+
+	module_names = list(dict.fromkeys(_iter_module_names(app.config.default_values_prewarm)))
+	if not module_names:
+		return
+
+	start = time.perf_counter()
+	options = {name: getattr(app.config, name) for name in _formatting_options}
+	_prewarmed.update(prewarm_modules(module_names, options))
+
+	logger.info(
+			"default_values: prewarmed %d objects from %d modules in %.2fs",
+			len(_prewarmed),
+			len(module_names),
+			time.perf_counter() - start,
+			)
+
+
+_index: Optional[DefaultsIndex] = None
+"""
+The index of the default values shown in the documentation.
+
+Only used if :confval:`default_values_index` is enabled.
+"""
+
+_default_reprs: Dict[Any, Tuple[Tuple[str, Optional[str]], ...]] = {}
+"""
+Per-build cache of the argument names and representations of the default values of the objects in the index,
+keyed on the object the default values are read from (see :func:`~._defaults_source`).
+"""
+
+
+def _record_default_reprs(
+		obj: Callable,
+		defaults: Iterable[Tuple[str, Any]],
+		) -> Tuple[Tuple[str, Optional[str]], ...]:
+	"""
+	Record the argument names and representations of the default values of a class or function for the index.
+
+	:param obj: The object the default values were read from.
+	:param defaults: 2-element tuples comprising the argument name and its default value.
+	"""
+
+	reprs = tuple((argname, _repr_default(default_value)) for argname, default_value in defaults)
+
+	try:
+		_default_reprs[obj] = reprs
+	except TypeError:  # Unhashable
+		pass
+
+	return reprs
+
+
+def _get_default_reprs(obj: Callable) -> Tuple[Tuple[str, Optional[str]], ...]:
+	"""
+	Returns the argument names and representations of the default values of a class or function for the index.
+
+	They are recorded when the default values are extracted to be formatted, so the object is only inspected
+	again if its formatted default values were taken from the persistent cache or the results of :func:`~.prewarm`.
+
+	:param obj: The class or function.
+	"""
+
+	obj = _defaults_source(obj)
+
+	try:
+		return _default_reprs[obj]
+	except (KeyError, TypeError):
+		return _record_default_reprs(obj, _extract_defaults(obj))
+
+
+def _repr_default(value: Any) -> Optional[str]:
+	"""
+	Returns the representation of a default value for the index,
+	or :py:obj:`None` if the argument has no default value.
+
+	:param value:
+	"""
+
+	if value is inspect.Parameter.empty:
+		return None
+
+	try:
+		if _safe_repr is not None:
+			text = _safe_repr.repr(value)
+			_safe_repr.limited = False
+			return text
+		else:
+			return builtins.repr(value)
+	except Exception:  # pylint: disable=broad-except
+		return f"<{type(value).__name__} instance>"
+
+
+def _add_to_index(
+		env: BuildEnvironment,
+		what: str,
+		name: str,
+		obj: Any,
+		lines: List[str],
+		fields: _DocstringFields,
+		formatted_defaults: _formatted_defaults,
+		) -> None:
+	"""
+	Add the arguments of a class or function to the index of default values.
+
+	:param env:
+	:param what: The type of the object being documented.
+	:param name: The name of the object being documented.
+	:param obj: The object being documented.
+	:param lines: List of strings representing the contents of the docstring, before default values are added.
+	:param fields: The fields in the docstring.
+	:param formatted_defaults: The (escaped) argument names and formatted default values.
+	"""
+
+	docname = env.temp_data.get("docname")
+	if _index is None or docname is None:
+		return
+
+	arguments = []
+
+	for (argname, default), (escaped_argname, formatted) in zip(_get_default_reprs(obj), formatted_defaults):
+		override = None
+		if escaped_argname in fields.defaults:
+			override = ':'.join(lines[fields.defaults[escaped_argname]].split(':')[2:]).strip()
+
+		suppressed = escaped_argname in fields.no_defaults
+		documented = escaped_argname in fields.params
+
+		if suppressed or not documented:
+			shown = None
+		elif override is not None:
+			shown = override
+		else:
+			shown = formatted
+
+		arguments.append({
+				"name": argname,
+				"default": default,
+				"formatted": formatted,
+				"override": override,
+				"suppressed": suppressed,
+				"documented": documented,
+				"shown": shown,
+				})
+
+	module_name = getattr(obj, "__module__", None)
+	qualname = getattr(obj, "__qualname__", None)
+
+	_index.add(
+			docname,
+			{
+					"docname": docname,
+					"name": name,
+					"what": what,
+					"module": module_name if isinstance(module_name, str) else None,
+					"qualname": qualname if isinstance(qualname, str) else None,
+					"arguments": arguments,
+					},
+			)
+
+
+def configure_index(app: Sphinx) -> None:
+	"""
+	Prepare to record the default values shown in each document, if :confval:`default_values_index` is enabled.
+
+	.. versionadded:: 0.8.0
+
+	:param app:
+	"""
+
+	global _index
+
+	_default_reprs.clear()
+
+	if app.config.default_values_index:
+		_index = DefaultsIndex(os.path.join(app.doctreedir, "default_values_index"))
+	else:
+		_index = None
+
+
+def purge_index(app: Sphinx, env: BuildEnvironment, docname: str) -> None:
+	"""
+	Remove the default values recorded for a document which is about to be read again, or has been removed.
+
+	.. versionadded:: 0.8.0
+
+	:param app:
+	:param env:
+	:param docname:
+	"""
+
+	if _index is not None:
+		_index.purge(docname)
+
+
+def write_index(app: Sphinx, exception: Optional[Exception] = None) -> None:
+	"""
+	Write the index of default values to ``defaults.jsonl`` in the output directory,
+	if :confval:`default_values_index` is enabled.
+
+	.. versionadded:: 0.8.0
+
+	:param app:
+	:param exception:
+	"""
+
+	global _index
+
+	if _index is not None and exception is None:
+		filename = os.path.join(app.outdir, "defaults.jsonl")
+		n_documents = _index.write(filename, sorted(app.env.found_docs))
+		logger.info("default_values: index of default values in %d documents written to %s", n_documents, filename)
+
+	_index = None
+	_default_reprs.clear()
+
+
+def setup(app: Sphinx) -> Dict[str, Any]:
+	"""
+	Setup :mod:`sphinxcontrib.default_values`.
+
+	:param app:
+	"""
+
+	# Custom formatting for the default value indication.
+	# Documents which show default values are read again when these change. See get_outdated_docs.
+	app.add_config_value("default_description_format", "Default %s", '', [str])
+	app.add_config_value("default_values_safe_repr", False, '', [bool])
+	app.add_config_value("default_values_repr_max_length", 200, '', [int])
+	app.add_config_value("default_values_repr_max_depth", 4, '', [int])
+	app.add_config_value("default_values_repr_max_items", 20, '', [int])
+	app.add_config_value("default_values_repr_timeout", 0, '', [int, float])
+	app.add_config_value("default_values_attrs_factories", "call", '', ENUM("call", "reference"))
+	app.add_config_value("default_values_reference_constants", False, '', [bool])
+	app.add_config_value("default_values_cache_size", 4096, '', [int])
+	app.add_config_value("default_values_docstring_cache_size", 1024, '', [int])
+	app.add_config_value("default_values_persistent_cache", False, '', [bool])
+	app.add_config_value("default_values_persistent_cache_size", 100_000, '', [int])
+	app.add_config_value("default_values_trace", False, '', [bool])
+	app.add_config_value("default_values_prewarm", [], '', [list])
+	app.add_config_value("default_values_index", False, "env", [bool])
+	app.add_config_value("default_values_insertion", "docstring", "env", ENUM("docstring", "doctree"))
+	app.connect("builder-inited", process_default_format)
+	app.connect("builder-inited", configure_formatting)
+	app.connect("builder-inited", configure_caches)
+	app.connect("builder-inited", configure_tracing)
+	app.connect("builder-inited", configure_statistics)
+	app.connect("builder-inited", configure_fingerprints)
+	app.connect("builder-inited", prewarm)
+	app.connect("builder-inited", configure_index)
+	app.connect("env-get-outdated", get_outdated_docs)
+	app.connect("env-before-read-docs", configure_tab_width)
+	app.connect("env-purge-doc", purge_fingerprints)
+	app.connect("env-purge-doc", purge_index)
+	app.connect("autodoc-process-docstring", process_docstring)
+	app.connect("object-description-transform", insert_defaults)
+	app.connect("env-merge-info", merge_caches)
+	app.connect("env-merge-info", merge_traces)
+	app.connect("env-merge-info", merge_statistics)
+	app.connect("env-merge-info", merge_fingerprints)
+	app.connect("env-updated", flush_caches)
+	app.connect("env-updated", detach_tracer)
+	app.connect("env-updated", detach_statistics)
+	app.connect("build-finished", clear_caches)
+	app.connect("build-finished", write_trace)
+	app.connect("build-finished", report_statistics)
+	app.connect("build-finished", finish_fingerprints)
+	app.connect("build-finished", write_index)
 
 	return {
 			"version": __version__,
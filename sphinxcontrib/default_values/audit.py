@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+#
+#  audit.py
+"""
+Check and show the default values of a package's classes and functions without building the documentation.
+
+Run with ``python -m sphinxcontrib.default_values <package> [<package> ...]``.
+
+.. versionadded:: 0.8.0
+"""
+#
+#  Copyright © 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import argparse
+import importlib
+import inspect
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Mapping, Optional, Sequence, TextIO
+
+# this package
+from sphinxcontrib.default_values import (
+		_add_defaults,
+		_compute_formatted_defaults,
+		_DocstringFields,
+		_normalise_format
+		)
+from sphinxcontrib.default_values.prewarming import (
+		_init_prewarm_worker,
+		_iter_module_names,
+		_iter_public_callables,
+		_prewarm_key
+		)
+
+__all__ = ["audit_object", "audit_module", "audit", "main"]
+
+
+def audit_object(
+		obj: Any,
+		default_description_format: str = "Default %s",
+		tab_width: int = 8,
+		) -> Dict[str, Any]:
+	"""
+	Returns the default values of a class or function, and any problems with its docstring.
+
+	The returned dictionary has the following keys:
+
+	* ``name`` -- the object's module and qualified name.
+	* ``defaults`` -- mapping of the (escaped) names of arguments with default values to the formatted values.
+	* ``missing_params`` -- arguments with default values which have no ``:param:`` field in the docstring,
+	  so their default values are not shown.
+	* ``stale_overrides`` -- arguments named in ``:default:`` or ``:no-default:`` fields
+	  which the object does not take.
+	* ``shown`` -- the number of default values shown in the docstring.
+	* ``docstring`` -- the docstring with the default values added, as a list of lines,
+	  or :py:obj:`None` if the object has no docstring.
+
+	:param obj: The class or function.
+	:param default_description_format: The format string for the default value.
+	:param tab_width: The docutils tab width, which determines how the bodies of fields are indented.
+	"""
+
+	formatted_defaults = _compute_formatted_defaults(obj)
+	argnames = {argname for argname, _ in formatted_defaults}
+
+	docstring = inspect.getdoc(obj)
+	lines = docstring.splitlines() if docstring else []
+	fields = _DocstringFields(lines)
+
+	default_description_format = _normalise_format(default_description_format)
+	shown, _, _ = _add_defaults(lines, fields, formatted_defaults, ' ' * tab_width, default_description_format)
+
+	module_name, qualname, _ = _prewarm_key(obj) or (getattr(obj, "__module__", None), repr(obj), None)
+	defaults = {argname: formatted for argname, formatted in formatted_defaults if formatted is not None}
+
+	return {
+			"name": f"{module_name}.{qualname}",
+			"defaults": defaults,
+			"missing_params": [argname for argname in defaults if docstring and argname not in fields.params],
+			"stale_overrides": sorted({*fields.defaults, *fields.no_defaults} - argnames),
+			"shown": shown,
+			"docstring": lines if docstring else None,
+			}
+
+
+def audit_module(module_name: str, default_description_format: str, tab_width: int) -> List[Dict[str, Any]]:
+	"""
+	Import a module and audit its public classes, functions and methods with :func:`~.audit_object`.
+
+	:param module_name:
+	:param default_description_format: The format string for the default value.
+	:param tab_width: The docutils tab width, which determines how the bodies of fields are indented.
+	"""
+
+	module = importlib.import_module(module_name)
+	results = []
+
+	for obj in _iter_public_callables(module):
+		try:
+			results.append(audit_object(obj, default_description_format, tab_width))
+		except Exception as e:  # pylint: disable=broad-except
+			name = f"{module_name}.{getattr(obj, '__qualname__', obj)}"
+			results.append({"name": name, "error": f"{type(e).__name__}: {e}"})
+
+	return results
+
+
+def audit(
+		names: Sequence[str],
+		default_description_format: str = "Default %s",
+		tab_width: int = 8,
+		options: Optional[Mapping[str, Any]] = None,
+		jobs: Optional[int] = None,
+		) -> Dict[str, Any]:
+	"""
+	Audit the given modules, and all modules within the given packages, in a pool of worker processes.
+
+	Returns a dictionary with the keys ``objects``, a list of the results of :func:`~.audit_object`
+	(or a dictionary with ``name`` and ``error`` keys for objects which could not be audited),
+	and ``errors``, a list of dictionaries with ``module`` and ``error`` keys
+	for modules which could not be imported.
+
+	:param names: The names of the modules and packages.
+	:param default_description_format: The format string for the default value.
+	:param tab_width: The docutils tab width, which determines how the bodies of fields are indented.
+	:param options: Mapping of the names of other configuration values which affect
+		how default values are formatted (see :doc:`/usage/configuration`) to their values.
+	:param jobs: The number of worker processes. Defaults to the number of CPUs.
+	"""
+
+	formatting_options = {
+			"default_values_safe_repr": False,
+			"default_values_repr_max_length": 200,
+			"default_values_repr_max_depth": 4,
+			"default_values_repr_max_items": 20,
+			"default_values_repr_timeout": 0,
+			"default_values_attrs_factories": "call",
+			"default_values_reference_constants": False,
+			**(options or {}),
+			}
+
+	module_names = list(dict.fromkeys(_iter_module_names(names)))
+	objects: Dict[str, Dict[str, Any]] = {}
+	errors = []
+
+	with ProcessPoolExecutor(
+			max_workers=max(1, min(len(module_names), jobs or os.cpu_count() or 1)),
+			initializer=_init_prewarm_worker,
+			initargs=(list(sys.path), formatting_options),
+			) as executor:
+		futures = {
+				executor.submit(audit_module, module_name, default_description_format, tab_width): module_name
+				for module_name in module_names
+				}
+
+		for future in as_completed(futures):
+			try:
+				for result in future.result():
+					objects.setdefault(result["name"], result)
+			except Exception as e:  # pylint: disable=broad-except
+				errors.append({"module": futures[future], "error": f"{type(e).__name__}: {e}"})
+
+	return {
+			"objects": [objects[name] for name in sorted(objects)],
+			"errors": sorted(errors, key=lambda error: error["module"]),
+			}
+
+
+def _write_text(report: Mapping[str, Any], docstrings: bool, file: TextIO) -> None:
+	for error in report["errors"]:
+		file.write(f"{error['module']}: could not import: {error['error']}\n")
+
+	for result in report["objects"]:
+		name = result["name"]
+
+		if "error" in result:
+			file.write(f"{name}: could not audit: {result['error']}\n")
+			continue
+
+		if result["defaults"]:
+			defaults = ", ".join(f"{argname}={formatted}" for argname, formatted in result["defaults"].items())
+			file.write(f"{name}: {defaults}\n")
+
+		for argname in result["missing_params"]:
+			file.write(f"{name}: no :param: field for {argname!r}, so its default value is not shown\n")
+
+		for argname in result["stale_overrides"]:
+			file.write(f"{name}: :default: or :no-default: field for {argname!r}, which is not an argument\n")
+
+		if docstrings and result["docstring"] is not None:
+			file.writelines(f"    {line}".rstrip() + '\n' for line in result["docstring"])
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+	"""
+	Entry point for ``python -m sphinxcontrib.default_values``.
+
+	Returns ``1`` if any arguments with default values have no ``:param:`` field,
+	any ``:default:`` or ``:no-default:`` fields are stale, or any modules or objects could not be audited;
+	and ``0`` otherwise.
+
+	:param argv: The command line arguments. Defaults to :py:data:`sys.argv`.
+	"""
+
+	parser = argparse.ArgumentParser(
+			prog="python -m sphinxcontrib.default_values",
+			description="Show the default values of the public classes and functions in the given packages, "
+			"and check their docstrings, without building the documentation.",
+			)
+	parser.add_argument("packages", nargs='+', help="the modules and packages to audit")
+	parser.add_argument("--json", action="store_true", help="write the report as JSON")
+	parser.add_argument(
+			"--docstrings",
+			action="store_true",
+			help="include the docstrings with the default values added",
+			)
+	parser.add_argument(
+			"--default-description-format",
+			default="Default %s",
+			help="the format string for the default value (default: %(default)r)",
+			)
+	parser.add_argument(
+			"--tab-width",
+			type=int,
+			default=8,
+			help="the docutils tab width (default: %(default)s)",
+			)
+	parser.add_argument(
+			"--safe-repr",
+			action="store_true",
+			help="shorten the representation of large default values",
+			)
+	parser.add_argument(
+			"--attrs-factories",
+			choices=["call", "reference"],
+			default="call",
+			help="how to show the default values of attrs fields with a factory (default: %(default)s)",
+			)
+	parser.add_argument(
+			"--reference-constants",
+			action="store_true",
+			help="show module-level constants and enum members as references",
+			)
+	parser.add_argument("-j", "--jobs", type=int, help="the number of worker processes (default: one per CPU)")
+	args = parser.parse_args(argv)
+
+	start = time.perf_counter()
+	report = audit(
+			args.packages,
+			default_description_format=args.default_description_format,
+			tab_width=args.tab_width,
+			options={
+					"default_values_safe_repr": args.safe_repr,
+					"default_values_attrs_factories": args.attrs_factories,
+					"default_values_reference_constants": args.reference_constants,
+					},
+			jobs=args.jobs,
+			)
+
+	if args.json:
+		if not args.docstrings:
+			for result in report["objects"]:
+				result.pop("docstring", None)
+
+		json.dump(report, sys.stdout, indent=2)
+		sys.stdout.write('\n')
+	else:
+		_write_text(report, args.docstrings, sys.stdout)
+		sys.stderr.write(f"Audited {len(report['objects'])} objects in {time.perf_counter() - start:.2f}s\n")
+
+	problems = report["errors"] or any(
+			"error" in result or result["missing_params"] or result["stale_overrides"]
+			for result in report["objects"]
+			)
+
+	return 1 if problems else 0
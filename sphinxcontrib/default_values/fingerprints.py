@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+#
+#  fingerprints.py
+"""
+Fingerprints of the default values shown in each document, used to find documents to read again.
+
+.. versionadded:: 0.8.0
+"""
+#
+#  Copyright © 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import hashlib
+import importlib
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple
+
+__all__ = ["Fingerprints"]
+
+_formatted_defaults = Tuple[Tuple[str, Optional[str]], ...]
+
+
+def _resolve(module_name: str, qualname: str) -> Any:
+	"""
+	Import the object with the given module and qualified name.
+
+	:param module_name:
+	:param qualname:
+
+	:raises: :exc:`ImportError` or :exc:`AttributeError` if the object cannot be imported.
+	"""
+
+	obj = importlib.import_module(module_name)
+
+	for attribute in qualname.split('.'):
+		obj = getattr(obj, attribute)
+
+	return obj
+
+
+class Fingerprints:
+	"""
+	Records fingerprints of the default values shown for each object in each document,
+	so the documents whose default values would be shown differently can be read again.
+
+	This includes documents where the default values have changed without the document's source changing,
+	such as when :confval:`default_description_format` is changed,
+	or a default value is a constant from another module.
+
+	:param fingerprints: Mapping of document names to the objects in them with default values,
+		and fingerprints of the default values as they were shown.
+		This is stored in the build environment, so it persists between builds.
+	:param salt: The version of the extension, and the configuration values which affect
+		how default values are shown.
+	"""
+
+	def __init__(self, fingerprints: Dict[str, Dict[str, Tuple[Optional[str], Optional[str], str]]], salt: str):
+		#: Mapping of document names to the names of the objects in them with default values.
+		#: Each object is mapped to its module and qualified name (or :py:obj:`None` if they cannot be used
+		#: to import the object again), and the fingerprint.
+		self.fingerprints: Dict[str, Dict[str, Tuple[Optional[str], Optional[str], str]]] = fingerprints
+
+		self.salt: str = salt
+
+	def fingerprint(self, formatted_defaults: Optional[_formatted_defaults]) -> str:
+		"""
+		Returns a fingerprint of the formatted default values of an object, and how they are shown.
+
+		:param formatted_defaults: :py:obj:`None` for objects which cannot be imported again,
+			in which case only changes to the configuration change the fingerprint.
+		"""
+
+		return hashlib.sha1(repr((self.salt, formatted_defaults)).encode("UTF-8")).hexdigest()
+
+	def record(self, docname: str, obj: Any, name: str, formatted_defaults: _formatted_defaults) -> None:
+		"""
+		Record the default values shown for an object in a document.
+
+		:param docname:
+		:param obj: The object being documented.
+		:param name: The name of the object being documented.
+		:param formatted_defaults: The (escaped) argument names and formatted default values.
+		"""
+
+		module_name = getattr(obj, "__module__", None)
+		qualname = getattr(obj, "__qualname__", None)
+
+		if not isinstance(module_name, str) or not isinstance(qualname, str) or "<locals>" in qualname:
+			self.fingerprints.setdefault(docname, {})[name] = (None, None, self.fingerprint(None))
+		else:
+			self.fingerprints.setdefault(docname, {})[name] = (
+					module_name,
+					qualname,
+					self.fingerprint(formatted_defaults),
+					)
+
+	def outdated(
+			self,
+			skip: Collection[str],
+			get_formatted_defaults: Callable[[Any], _formatted_defaults],
+			) -> List[str]:
+		"""
+		Returns the documents whose default values would be shown differently if they were read again.
+
+		:param skip: Documents which are already known to be added, changed or removed.
+		:param get_formatted_defaults: Function to compute the current formatted default values of an object.
+		"""
+
+		outdated = []
+		config_fingerprint = self.fingerprint(None)
+
+		for docname, objects in self.fingerprints.items():
+			if docname in skip:
+				continue
+
+			for module_name, qualname, fingerprint in objects.values():
+				current_fingerprint: Optional[str]
+
+				if module_name is None or qualname is None:
+					current_fingerprint = config_fingerprint
+				else:
+					try:
+						obj = _resolve(module_name, qualname)
+					except Exception:  # pylint: disable=broad-except
+						# The object has been removed or renamed, or its module cannot be imported.
+						current_fingerprint = None
+					else:
+						current_fingerprint = self.fingerprint(get_formatted_defaults(obj))
+
+				if current_fingerprint != fingerprint:
+					outdated.append(docname)
+					break
+
+		return outdated
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+#
+#  index.py
+"""
+Machine-readable index of the default values shown in the documentation.
+
+.. versionadded:: 0.8.0
+"""
+#
+#  Copyright © 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import json
+import os
+import shutil
+from typing import Any, Dict, Iterable
+from urllib.parse import quote
+
+__all__ = ["DefaultsIndex"]
+
+
+class DefaultsIndex:
+	"""
+	Collects a `JSON Lines <https://jsonlines.org>`_ record for each documented class and function,
+	and writes them to a single file at the end of the build.
+
+	The records for each document are appended to their own file in ``directory`` as the document is read,
+	so they are not held in memory, and parallel read workers (which each read different documents)
+	never write to the same file.
+	The files persist between builds, so documents which are not read again keep their records.
+
+	:param directory: The directory to store the records for each document in.
+	"""
+
+	def __init__(self, directory: str):
+		self.directory: str = directory
+
+	def _filename(self, docname: str) -> str:
+		return os.path.join(self.directory, f"{quote(docname, safe='')}.jsonl")
+
+	def add(self, docname: str, record: Dict[str, Any]) -> None:
+		"""
+		Append a record to those for the given document.
+
+		:param docname:
+		:param record: Must be serialisable as JSON.
+		"""
+
+		os.makedirs(self.directory, exist_ok=True)
+
+		with open(self._filename(docname), 'a', encoding="UTF-8") as fp:
+			fp.write(json.dumps(record))
+			fp.write('\n')
+
+	def purge(self, docname: str) -> None:
+		"""
+		Remove the records for a document which is about to be read again, or has been removed.
+
+		:param docname:
+		"""
+
+		try:
+			os.remove(self._filename(docname))
+		except FileNotFoundError:
+			pass
+
+	def write(self, filename: str, docnames: Iterable[str]) -> int:
+		"""
+		Write the records for the given documents to ``filename``, in order.
+
+		The records are copied from each document's file in turn, so the whole index is never held in memory.
+
+		:param filename:
+		:param docnames:
+
+		:return: The number of documents with records.
+		"""
+
+		n_documents = 0
+
+		with open(filename, 'w', encoding="UTF-8") as output:
+			for docname in docnames:
+				try:
+					with open(self._filename(docname), encoding="UTF-8") as fp:
+						shutil.copyfileobj(fp, output)
+				except FileNotFoundError:
+					continue
+
+				n_documents += 1
+
+		return n_documents
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+#
+#  persistent_cache.py
+"""
+On-disk cache of formatted default values, shared between builds.
+
+.. versionadded:: 0.8.0
+"""
+#
+#  Copyright © 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import sys
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+# 3rd party
+from sphinx.util import logging
+
+__all__ = ["PersistentCache"]
+
+logger = logging.getLogger(__name__)
+
+_formatted_defaults = Tuple[Tuple[str, Optional[str]], ...]
+
+
+class PersistentCache:
+	"""
+	An sqlite database mapping classes and functions to their formatted default values.
+
+	Entries are keyed on the object's module and qualified name, a hash of the source files which define it,
+	the version of the extension, the value of :confval:`default_description_format`,
+	and any other options which affect formatting, so any change to these means the defaults are computed afresh.
+
+	Lookups never write to the database. New entries and the keys of entries which were used
+	are collected in :attr:`~.PersistentCache.updates` and written by :meth:`~.PersistentCache.flush`.
+	This allows the updates to be sent back from Sphinx's parallel read workers to the main process.
+
+	:param filename: The filename of the database.
+	:param maxsize: The maximum number of entries to keep. The least recently used entries are discarded first.
+	:param version: The version of the extension.
+	:param default_description_format: The format string for the default value.
+	:param options: Other configuration values which affect how default values are formatted.
+	"""
+
+	#: Mapping of keys to new entries (as JSON), or to :py:obj:`None` for existing entries which were used.
+	updates: Dict[str, Optional[str]]
+
+	def __init__(
+			self,
+			filename: str,
+			maxsize: int,
+			version: str,
+			default_description_format: str,
+			options: Optional[Mapping[str, Any]] = None,
+			):
+		self.filename: str = filename
+		self.maxsize: int = maxsize
+		self.updates = {}
+		self._salt: List[str] = [version, default_description_format, json.dumps(options or {}, sort_keys=True)]
+		self._source_hashes: Dict[str, Optional[str]] = {}
+		self._connection: Optional[sqlite3.Connection] = None
+		self._pid: Optional[int] = None
+
+	@property
+	def connection(self) -> sqlite3.Connection:
+		"""
+		The connection to the database.
+
+		A new connection is opened in each process, as connections cannot be shared with forked workers.
+		"""
+
+		if self._connection is None or self._pid != os.getpid():
+			os.makedirs(os.path.dirname(os.path.abspath(self.filename)), exist_ok=True)
+			self._connection = sqlite3.connect(self.filename, timeout=30)
+			self._connection.execute(
+					"CREATE TABLE IF NOT EXISTS defaults "
+					"(key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used INTEGER NOT NULL)",
+					)
+			self._pid = os.getpid()
+
+		return self._connection
+
+	def _source_hash(self, module_name: Any) -> Optional[str]:
+		"""
+		Returns a hash of the file the given module was loaded from.
+
+		:param module_name:
+		"""
+
+		if module_name in self._source_hashes:
+			return self._source_hashes[module_name]
+
+		source_hash = None
+		filename = getattr(sys.modules.get(module_name), "__file__", None)
+
+		if filename:
+			try:
+				with open(filename, "rb") as fp:
+					source_hash = hashlib.sha1(fp.read()).hexdigest()
+			except OSError:
+				pass
+
+		self._source_hashes[module_name] = source_hash
+		return source_hash
+
+	def make_key(self, obj: Any) -> Optional[str]:
+		"""
+		Returns the key for the given class or function, or :py:obj:`None` if it cannot be cached.
+
+		Objects defined within functions cannot be cached,
+		as several objects may share the same qualified name.
+
+		:param obj:
+		"""
+
+		module_name = getattr(obj, "__module__", None)
+		qualname = getattr(obj, "__qualname__", None)
+
+		if not isinstance(module_name, str) or not isinstance(qualname, str) or "<locals>" in qualname:
+			return None
+
+		# The arguments may be defined in a different module, e.g. for an inherited ``__init__``.
+		if inspect.isclass(obj):
+			definition = getattr(obj, "__init__", None)
+		else:
+			definition = obj
+
+		try:
+			definition_module = getattr(inspect.unwrap(definition), "__module__", None)  # type: ignore[arg-type]
+		except ValueError:  # pragma: no cover
+			return None
+
+		source_hashes = [self._source_hash(module_name), self._source_hash(definition_module)]
+		if source_hashes[0] is None:
+			return None
+
+		key = [module_name, qualname, type(obj).__qualname__, *source_hashes, *self._salt]
+		return hashlib.sha1(json.dumps(key).encode("UTF-8")).hexdigest()
+
+	def get(self, key: str) -> Optional[_formatted_defaults]:
+		"""
+		Returns the formatted defaults stored for ``key``, or :py:obj:`None` if there are none.
+
+		:param key: A key returned by :meth:`~.PersistentCache.make_key`.
+		"""
+
+		if self.updates.get(key) is not None:
+			value = self.updates[key]
+		else:
+			try:
+				row = self.connection.execute("SELECT value FROM defaults WHERE key = ?", (key, )).fetchone()
+			except sqlite3.Error as e:
+				logger.debug("default_values: could not read from the persistent cache: %s", e)
+				return None
+
+			if row is None:
+				return None
+
+			value = row[0]
+			self.updates.setdefault(key, None)
+
+		return tuple((argname, formatted) for argname, formatted in json.loads(value))  # type: ignore[arg-type]
+
+	def put(self, key: str, formatted_defaults: _formatted_defaults) -> None:
+		"""
+		Store the formatted defaults for ``key``.
+
+		They are written to the database by the next call to :meth:`~.PersistentCache.flush`.
+
+		:param key: A key returned by :meth:`~.PersistentCache.make_key`.
+		:param formatted_defaults:
+		"""
+
+		self.updates[key] = json.dumps(formatted_defaults)
+
+	def merge(self, updates: Dict[str, Optional[str]]) -> None:
+		"""
+		Merge the updates collected by another process (e.g. a parallel read worker).
+
+		:param updates:
+		"""
+
+		for key, value in updates.items():
+			if value is not None or key not in self.updates:
+				self.updates[key] = value
+
+	def flush(self) -> None:
+		"""
+		Write the pending updates to the database, and discard the least recently used entries if it is full.
+		"""
+
+		new_entries = {key: value for key, value in self.updates.items() if value is not None}
+		used_entries = [key for key, value in self.updates.items() if value is None]
+
+		try:
+			with self.connection as connection:
+				# Entries are stamped with a counter which increases with each flush, i.e. with each build.
+				cursor = connection.execute("SELECT COALESCE(MAX(last_used), 0) + 1 FROM defaults")
+				generation = cursor.fetchone()[0]
+
+				connection.executemany(
+						"INSERT OR REPLACE INTO defaults VALUES (?, ?, ?)",
+						[(key, value, generation) for key, value in new_entries.items()],
+						)
+				connection.executemany(
+						"UPDATE defaults SET last_used = ? WHERE key = ?",
+						[(generation, key) for key in used_entries],
+						)
+				connection.execute(
+						"DELETE FROM defaults WHERE key NOT IN "
+						"(SELECT key FROM defaults ORDER BY last_used DESC LIMIT ?)",
+						(self.maxsize, ),
+						)
+		except sqlite3.Error as e:
+			logger.warning("default_values: could not write to the persistent cache: %s", e)
+
+		self.updates.clear()
+
+	def close(self) -> None:
+		"""
+		Close the connection to the database.
+		"""
+
+		if self._connection is not None and self._pid == os.getpid():
+			self._connection.close()
+
+		self._connection = None
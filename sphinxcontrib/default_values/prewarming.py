@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+#
+#  prewarming.py
+"""
+Compute the formatted default values of the classes and functions in modules in a pool of worker processes.
+
+.. versionadded:: 0.8.0
+"""
+#
+#  Copyright © 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import importlib
+import importlib.util
+import inspect
+import os
+import pkgutil
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from types import ModuleType
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+# 3rd party
+from sphinx.util import logging
+
+__all__ = ["prewarm_modules"]
+
+logger = logging.getLogger(__name__)
+
+_formatted_defaults = Tuple[Tuple[str, Optional[str]], ...]
+
+
+def _prewarm_key(obj: Any) -> Optional[Tuple[str, str, str]]:
+	"""
+	Returns the key for an object in the results of :func:`~.prewarm_modules`,
+	or :py:obj:`None` if its module and qualified name do not identify it.
+
+	:param obj:
+	"""
+
+	module_name = getattr(obj, "__module__", None)
+	qualname = getattr(obj, "__qualname__", None)
+
+	if not isinstance(module_name, str) or not isinstance(qualname, str) or "<locals>" in qualname:
+		return None
+
+	return module_name, qualname, type(obj).__qualname__
+
+
+def _iter_module_names(names: Iterable[str]) -> Iterator[str]:
+	"""
+	Returns the names of the given modules and packages, and of all modules within the packages.
+
+	Subpackages are found on disk without being imported.
+
+	:param names:
+	"""
+
+	for name in names:
+		yield name
+
+		try:
+			spec = importlib.util.find_spec(name)
+		except (ImportError, ValueError):
+			# Reported when the worker tries to import it.
+			continue
+
+		if spec is not None and spec.submodule_search_locations:
+			yield from _iter_submodule_names(spec.submodule_search_locations, name)
+
+
+def _iter_submodule_names(paths: Iterable[str], package: str) -> Iterator[str]:
+	for module_info in pkgutil.iter_modules(list(paths), prefix=f"{package}."):
+		yield module_info.name
+
+		# Only packages on the filesystem are searched; the finder for a zip file has no path.
+		finder_path = getattr(module_info.module_finder, "path", None)
+
+		if module_info.ispkg and finder_path is not None:
+			subpackage_path = os.path.join(finder_path, module_info.name.rpartition('.')[-1])
+			yield from _iter_submodule_names([subpackage_path], module_info.name)
+
+
+def _iter_public_callables(module: ModuleType) -> Iterator[Any]:
+	"""
+	Returns the public classes and functions defined in a module, and the public methods of the classes.
+
+	Methods are obtained from the class as :mod:`sphinx.ext.autodoc` does,
+	so their keys in the results of :func:`~.prewarm_modules` match those of the objects it documents.
+
+	:param module:
+	"""
+
+	for name, obj in list(vars(module).items()):
+		if name.startswith('_') or getattr(obj, "__module__", None) != module.__name__ or not callable(obj):
+			continue
+
+		yield obj
+
+		if inspect.isclass(obj):
+			for attribute in list(vars(obj)):
+				if attribute.startswith('_'):
+					continue
+
+				try:
+					member = getattr(obj, attribute)
+				except Exception:  # pylint: disable=broad-except
+					continue
+
+				if callable(member):
+					yield member
+
+
+def _init_prewarm_worker(path: List[str], options: Mapping[str, Any]) -> None:
+	"""
+	Prepare a worker process for :func:`~.prewarm_modules`.
+
+	:param path: The module search path of the main process, which may have been changed by ``conf.py``.
+	:param options: Mapping of the names in :data:`sphinxcontrib.default_values._formatting_options`
+		to their values.
+	"""
+
+	# this package
+	from sphinxcontrib import default_values
+
+	sys.path[:] = path
+	default_values._tracer = None
+	default_values._configure_formatting(options)
+
+
+def _prewarm_module(module_name: str) -> Dict[Tuple[str, str, str], _formatted_defaults]:
+	"""
+	Import a module and return the formatted default values of its public classes, functions and methods.
+
+	Run in the worker processes of :func:`~.prewarm_modules`. Only strings are sent back to the main process.
+
+	:param module_name:
+	"""
+
+	# this package
+	from sphinxcontrib.default_values import _compute_formatted_defaults, _defaults_source
+
+	module = importlib.import_module(module_name)
+	prewarmed = {}
+
+	for obj in _iter_public_callables(module):
+		try:
+			# Classes which inherit their constructor are only inspected once.
+			obj = _defaults_source(obj)
+			key = _prewarm_key(obj)
+			if key is None or key in prewarmed:
+				continue
+
+			prewarmed[key] = _compute_formatted_defaults(obj)
+		except Exception:  # pylint: disable=broad-except
+			# Left for autodoc, which reports the error if the object is documented.
+			continue
+
+	return prewarmed
+
+
+def prewarm_modules(
+		module_names: List[str],
+		options: Mapping[str, Any],
+		) -> Dict[Tuple[str, str, str], _formatted_defaults]:
+	"""
+	Import the given modules in a pool of worker processes,
+	and compute the formatted default values of their public classes, functions and methods.
+
+	Modules which cannot be imported are reported as warnings.
+
+	:param module_names:
+	:param options: Mapping of the names in :data:`sphinxcontrib.default_values._formatting_options`
+		to their values.
+
+	:return: Mapping of each object's module, qualified name and type to its formatted default values.
+	"""
+
+	prewarmed: Dict[Tuple[str, str, str], _formatted_defaults] = {}
+
+	with ProcessPoolExecutor(
+			max_workers=min(len(module_names), os.cpu_count() or 1),
+			initializer=_init_prewarm_worker,
+			initargs=(list(sys.path), options),
+			) as executor:
+		futures = {executor.submit(_prewarm_module, module_name): module_name for module_name in module_names}
+
+		for future in as_completed(futures):
+			try:
+				prewarmed.update(future.result())
+			except Exception as e:  # pylint: disable=broad-except
+				logger.warning("default_values: could not prewarm %s: %s", futures[future], e)
+
+	return prewarmed
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+#
+#  statistics.py
+"""
+Counts of what the extension did during a build.
+
+.. versionadded:: 0.8.0
+"""
+#
+#  Copyright © 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import heapq
+import os
+from typing import Any, Dict, List, Tuple
+
+__all__ = ["Statistics", "BuildStatistics"]
+
+
+class Statistics:
+	"""
+	Counts of what the extension did in one process.
+	"""
+
+	#: The number of slowest objects to keep.
+	n_slowest: int = 10
+
+	def __init__(self):
+		#: The number of objects whose docstrings were processed.
+		self.objects_processed: int = 0
+
+		#: The number of objects which were skipped, as they are not callable or are properties,
+		#: or as their docstrings have no parameters to add default values to.
+		self.objects_skipped: int = 0
+
+		#: The number of parameters of the processed objects.
+		self.parameters: int = 0
+
+		#: The number of default values added to docstrings.
+		self.defaults_rendered: int = 0
+
+		#: The number of ``:default:`` fields which replaced the default value.
+		self.overrides: int = 0
+
+		#: The number of ``:no-default:`` fields which suppressed a default value.
+		self.suppressions: int = 0
+
+		#: The number of objects whose signature could not be read.
+		self.signature_failures: int = 0
+
+		#: The total time spent processing docstrings, in seconds.
+		self.total_time: float = 0.0
+
+		#: The number of docstrings which were identical to one processed earlier, with the same default values.
+		self.docstring_cache_hits: int = 0
+
+		#: The number of docstrings which had to be processed.
+		self.docstring_cache_misses: int = 0
+
+		#: The number of objects whose default values had already been formatted during the build.
+		self.defaults_cache_hits: int = 0
+
+		#: The number of objects whose default values had to be formatted, or read from the persistent cache.
+		self.defaults_cache_misses: int = 0
+
+		#: A heap of the slowest objects, as ``(time, name)`` tuples.
+		self.slowest: List[Tuple[float, str]] = []
+
+	def add_time(self, name: str, duration: float) -> None:
+		"""
+		Record the time taken to process the docstring of an object.
+
+		:param name: The name of the object.
+		:param duration: The time taken, in seconds.
+		"""
+
+		self.total_time += duration
+
+		if len(self.slowest) < self.n_slowest:
+			heapq.heappush(self.slowest, (duration, name))
+		elif duration > self.slowest[0][0]:
+			heapq.heapreplace(self.slowest, (duration, name))
+
+
+class BuildStatistics:
+	"""
+	Counts of what the extension did during a build, across the main process and any parallel read workers.
+
+	Each process updates its own :class:`~.Statistics`.
+	The statistics are stored in the build environment, so those of the parallel read workers
+	are sent back to the main process, where they are combined with :meth:`~.BuildStatistics.merge`.
+	"""
+
+	#: Mapping of process IDs to their statistics.
+	processes: Dict[int, Statistics]
+
+	def __init__(self):
+		self.processes = {}
+
+	@property
+	def current(self) -> Statistics:
+		"""
+		The statistics for the current process.
+		"""
+
+		pid = os.getpid()
+
+		try:
+			return self.processes[pid]
+		except KeyError:
+			statistics = self.processes[pid] = Statistics()
+			return statistics
+
+	def merge(self, other: "BuildStatistics") -> None:
+		"""
+		Merge the statistics of another process (e.g. a parallel read worker).
+
+		:param other:
+		"""
+
+		pid = os.getpid()
+
+		# Workers forked after others were merged carry unchanged copies of their statistics.
+		for other_pid, statistics in other.processes.items():
+			if other_pid != pid:
+				self.processes[other_pid] = statistics
+
+	def as_dict(self) -> Dict[str, Any]:
+		"""
+		Returns the totals for all processes.
+
+		The ``slowest`` key maps to a list of ``(name, seconds)`` tuples for the slowest objects, slowest first.
+		"""
+
+		totals: Dict[str, Any] = {
+				"objects_processed": 0,
+				"objects_skipped": 0,
+				"parameters": 0,
+				"defaults_rendered": 0,
+				"overrides": 0,
+				"suppressions": 0,
+				"signature_failures": 0,
+				"total_time": 0.0,
+				"docstring_cache_hits": 0,
+				"docstring_cache_misses": 0,
+				"defaults_cache_hits": 0,
+				"defaults_cache_misses": 0,
+				}
+
+		slowest: List[Tuple[float, str]] = []
+
+		for statistics in self.processes.values():
+			for key in totals:
+				totals[key] += getattr(statistics, key)
+
+			slowest.extend(statistics.slowest)
+
+		totals["slowest"] = [(name, duration) for duration, name in heapq.nlargest(Statistics.n_slowest, slowest)]
+		return totals
+
+	def summary(self) -> str:
+		"""
+		Returns a one-line summary of the statistics.
+		"""
+
+		totals = self.as_dict()
+		summary = (
+				f"processed {totals['objects_processed']} objects ({totals['objects_skipped']} skipped) "
+				f"with {totals['parameters']} parameters in {totals['total_time']:.2f}s; "
+				f"{totals['defaults_rendered']} defaults shown, {totals['overrides']} overridden, "
+				f"{totals['suppressions']} suppressed; {totals['signature_failures']} signature failures"
+				)
+
+		lookups = totals["docstring_cache_hits"] + totals["docstring_cache_misses"]
+		if lookups:
+			summary += f"; {totals['docstring_cache_hits'] / lookups:.0%} of docstrings reused"
+
+		if totals["slowest"]:
+			name, duration = totals["slowest"][0]
+			summary += f"; slowest {name} ({duration * 1000:.1f}ms)"
+
+		return summary
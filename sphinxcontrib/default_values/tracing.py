@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+#
+#  tracing.py
+"""
+Timing of :func:`~sphinxcontrib.default_values.process_docstring`, in the Chrome trace event format.
+
+.. versionadded:: 0.8.0
+"""
+#
+#  Copyright © 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+__all__ = ["Tracer"]
+
+
+class Tracer:
+	"""
+	Records how long is spent in each part of adding default values to docstrings.
+
+	The records are complete (``"ph": "X"``) events in the
+	`Chrome trace event format <https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU>`_,
+	which can be viewed with `Perfetto <https://ui.perfetto.dev>`_ or ``chrome://tracing``.
+	Nested events show the time spent within the enclosing one.
+	"""
+
+	#: Mapping of process IDs to the events recorded by that process.
+	processes: Dict[int, List[Dict[str, Any]]]
+
+	def __init__(self):
+		self.processes = {}
+
+	@property
+	def events(self) -> List[Dict[str, Any]]:
+		"""
+		The events recorded by this process and those merged from parallel read workers.
+		"""
+
+		return [event for events in self.processes.values() for event in events]
+
+	@contextmanager
+	def span(self, event: str, **args: Any) -> Iterator[None]:
+		"""
+		Context manager to record the time spent within the ``with`` block.
+
+		:param event: The name of the event.
+		:param args: Additional information to show with the event,
+			such as the name of the object being documented.
+		"""
+
+		start = time.perf_counter()
+
+		try:
+			yield
+		finally:
+			end = time.perf_counter()
+			pid = os.getpid()
+			self.processes.setdefault(pid, []).append({
+					"name": event,
+					"cat": "default_values",
+					"ph": 'X',
+					"ts": start * 1e6,
+					"dur": (end - start) * 1e6,
+					"pid": pid,
+					"tid": threading.get_ident(),
+					"args": args,
+					})
+
+	def merge(self, other: "Tracer") -> None:
+		"""
+		Merge the events recorded by another process (e.g. a parallel read worker).
+
+		:param other:
+		"""
+
+		pid = os.getpid()
+
+		# Workers forked after others were merged carry unchanged copies of their events.
+		for other_pid, events in other.processes.items():
+			if other_pid != pid:
+				self.processes[other_pid] = events
+
+	def write(self, filename: str) -> None:
+		"""
+		Write the events to ``filename`` as a JSON trace.
+
+		:param filename:
+		"""
+
+		os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+
+		with open(filename, 'w', encoding="UTF-8") as fp:
+			json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, fp)
@@ -0,0 +1,158 @@
+# stdlib
+import sys
+from io import StringIO
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+# 3rd party
+from sphinx.application import Sphinx
+
+
+class MockConfig(dict):
+
+	def __getattr__(self, item):
+		return self[item]
+
+	def __setattr__(self, key, value):
+		self[key] = value
+
+
+class MockApp:
+	"""
+	Stands in for the Sphinx application when calling :func:`~sphinxcontrib.default_values.process_docstring`.
+	"""
+
+	def __init__(self, format_: str = "Default %s"):
+		self.config = MockConfig()
+		self.env = SimpleNamespace(default_values_tab_width=4, temp_data={})
+		self.config.default_description_format = format_
+		self.config.default_values_insertion = "docstring"
+
+
+class Build(NamedTuple):
+	"""
+	The result of building a :class:`~.SphinxProject`.
+	"""
+
+	app: Sphinx
+	outdir: Path
+
+	#: The warnings emitted during the build.
+	warnings: str
+
+	def html(self, docname: str = "index") -> str:
+		"""
+		Returns the HTML of the given document.
+
+		:param docname:
+		"""
+
+		return (self.outdir / f"{docname}.html").read_text()
+
+
+class SphinxProject:
+	"""
+	A Sphinx project in a temporary directory, documenting modules which are written alongside it.
+
+	:param path: The directory for the project. The source files are written to the ``src`` subdirectory.
+	"""
+
+	def __init__(self, path: Path):
+		self.path = path
+		self.srcdir = path / "src"
+		self.srcdir.mkdir()
+		self.modules: List[str] = []
+		self.write_conf()
+
+	def write_module(self, name: str, source: str) -> None:
+		"""
+		Write a module which can be documented by the project.
+
+		:param name: The name of the module.
+		:param source:
+		"""
+
+		(self.path / f"{name}.py").write_text(source)
+		self.modules.append(name)
+
+	def write_conf(self, extensions: Sequence[str] = (), **config: Any) -> None:
+		"""
+		Write the ``conf.py`` file, enabling :mod:`sphinx.ext.autodoc` and this extension.
+
+		The directory containing the modules is added to :data:`sys.path`,
+		so they can also be documented by ``sphinx-build`` in a subprocess.
+
+		:param extensions: Additional extensions to enable.
+		:param config: Other configuration values.
+		"""
+
+		all_extensions = ["sphinx.ext.autodoc", *extensions, "sphinxcontrib.default_values"]
+		lines = [
+				"import sys",
+				f"if {str(self.path)!r} not in sys.path:",
+				f"\tsys.path.insert(0, {str(self.path)!r})",
+				f"extensions = {all_extensions!r}",
+				]
+		lines.extend(f"{name} = {value!r}" for name, value in config.items())
+
+		(self.srcdir / "conf.py").write_text('\n'.join(lines) + '\n')
+
+	def write_document(self, docname: str, title: str, body: str = '') -> None:
+		"""
+		Write a reStructuredText document.
+
+		:param docname:
+		:param title:
+		:param body:
+		"""
+
+		(self.srcdir / f"{docname}.rst").write_text(f"{title}\n{'=' * len(title)}\n\n{body}")
+
+	def build(
+			self,
+			name: str = "build",
+			events: Optional[Dict[str, Callable]] = None,
+			**kwargs: Any,
+			) -> Build:
+		"""
+		Build the project as HTML.
+
+		:param name: The name of the directory, within the project's directory,
+			containing the output and the doctrees. Builds with the same name are incremental.
+		:param events: Mapping of Sphinx events to functions to connect to them before building.
+		:param kwargs: Additional keyword arguments for :class:`sphinx.application.Sphinx`,
+			such as ``confoverrides`` or ``parallel``.
+		"""
+
+		outdir = self.path / name / "html"
+		warnings = StringIO()
+
+		app = Sphinx(
+				srcdir=str(self.srcdir),
+				confdir=str(self.srcdir),
+				outdir=str(outdir),
+				doctreedir=str(self.path / name / "doctrees"),
+				buildername="html",
+				status=StringIO(),
+				warning=warnings,
+				**kwargs,
+				)
+
+		for event, callback in (events or {}).items():
+			app.connect(event, callback)
+
+		app.build()
+
+		# Sphinx warns about its own extensions being set up again when run a second time in the same process.
+		warning_lines = [line for line in warnings.getvalue().splitlines() if "already registered" not in line]
+
+		return Build(app, outdir, '\n'.join(warning_lines))
+
+	def unload_modules(self) -> None:
+		"""
+		Remove the project's modules from :data:`sys.modules`, so later tests import them afresh.
+		"""
+
+		for name in self.modules:
+			sys.modules.pop(name, None)
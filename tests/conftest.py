@@ -0,0 +1,26 @@
+# stdlib
+from pathlib import Path
+from typing import Iterator
+
+# 3rd party
+import pytest
+
+# this package
+from tests.common import MockApp, SphinxProject
+
+
+@pytest.fixture()
+def app() -> MockApp:
+	return MockApp("Default %s")
+
+
+@pytest.fixture()
+def project(tmp_path: Path, monkeypatch) -> Iterator[SphinxProject]:
+	"""
+	A Sphinx project in a temporary directory. See :class:`tests.common.SphinxProject`.
+	"""
+
+	monkeypatch.syspath_prepend(str(tmp_path))
+	project = SphinxProject(tmp_path)
+	yield project
+	project.unload_modules()
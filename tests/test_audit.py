@@ -0,0 +1,213 @@
+# stdlib
+import io
+import json
+import runpy
+import sys
+from pathlib import Path
+from typing import Iterator
+
+# 3rd party
+import pytest
+
+# this package
+import sphinxcontrib.default_values.audit
+from sphinxcontrib.default_values.audit import _write_text, audit, audit_module, audit_object, main
+
+module_source = '''
+def documented(a, b=1, c="hello"):
+	"""
+	Does something.
+
+	:param a: The first argument.
+	:param b: The second argument.
+	:default c: ``'world'``
+	"""
+
+
+def stale(a, d=None):
+	"""
+	:param a: The first argument.
+	:param d: The second argument.
+	:default e: ``2``
+	:no-default f:
+	"""
+
+
+class Class:
+	"""
+	:param g: The first argument.
+	"""
+
+	def __init__(self, g=True):
+		pass
+'''
+
+
+def documented(a, b=1, c="hello"):
+	"""
+	Does something.
+
+	:param a: The first argument.
+	:param b: The second argument.
+	:default c: ``'world'``
+	"""
+
+
+def undocumented(a, b=1):
+	pass
+
+
+def test_audit_object():
+	docstring = [
+			"Does something.",
+			'',
+			":param a: The first argument.",
+			":param b: The second argument.",
+			"        Default ``1``.",
+			'',
+			]
+
+	assert audit_object(documented) == {
+			"name": "tests.test_audit.documented",
+			"defaults": {'b': "``1``", 'c': "``'hello'``"},
+			"missing_params": ['c'],
+			"stale_overrides": [],
+			"shown": 1,
+			"docstring": docstring,
+			}
+
+
+def test_audit_object_format():
+	result = audit_object(documented, "Defaults to", tab_width=4)
+	assert result["docstring"][4] == "    Defaults to ``1``."
+
+
+def test_audit_object_no_docstring():
+	result = audit_object(undocumented)
+	assert result["defaults"] == {'b': "``1``"}
+	assert result["missing_params"] == []
+	assert result["docstring"] is None
+
+
+@pytest.fixture()
+def package(tmp_path: Path, monkeypatch) -> Iterator[str]:
+	package_dir = tmp_path / "audit_demo"
+	package_dir.mkdir()
+	(package_dir / "__init__.py").write_text('')
+	(package_dir / "module.py").write_text(module_source)
+	(package_dir / "broken.py").write_text("raise ValueError('Broken')\n")
+
+	monkeypatch.syspath_prepend(str(tmp_path))
+	yield "audit_demo"
+
+	for name in list(sys.modules):
+		if name.startswith("audit_demo"):
+			del sys.modules[name]
+
+
+def test_audit(package: str):
+	report = audit([package], jobs=2)
+
+	assert report["errors"] == [{"module": "audit_demo.broken", "error": "ValueError: Broken"}]
+	assert [result["name"] for result in report["objects"]] == [
+			"audit_demo.module.Class",
+			"audit_demo.module.documented",
+			"audit_demo.module.stale",
+			]
+
+	stale = report["objects"][2]
+	assert stale["defaults"] == {'d': ":py:obj:`None`"}
+	assert stale["stale_overrides"] == ['e', 'f']
+
+
+def test_audit_module(package: str, monkeypatch):
+	# Run in the worker processes of audit(); run in this process here.
+	results = audit_module(f"{package}.module", "Default %s", 8)
+	assert [result["name"] for result in results] == [
+			"audit_demo.module.documented",
+			"audit_demo.module.stale",
+			"audit_demo.module.Class",
+			]
+
+	def audit_object(obj, default_description_format, tab_width):
+		raise ValueError(f"Cannot audit {obj.__name__}")
+
+	monkeypatch.setattr(sphinxcontrib.default_values.audit, "audit_object", audit_object)
+	assert audit_module(f"{package}.module", "Default %s", 8)[0] == {
+			"name": "audit_demo.module.documented",
+			"error": "ValueError: Cannot audit documented",
+			}
+
+
+def test_write_text():
+	report = {
+			"errors": [{"module": "audit_demo.broken", "error": "ValueError: Broken"}],
+			"objects": [
+					{"name": "audit_demo.module.Class", "error": "ValueError: Cannot audit Class"},
+					{
+							"name": "audit_demo.module.documented",
+							"defaults": {'b': "``1``"},
+							"missing_params": [],
+							"stale_overrides": [],
+							"shown": 1,
+							"docstring": [":param b: The first argument.", "        Default ``1``.", ''],
+							},
+					],
+			}
+
+	file = io.StringIO()
+	_write_text(report, docstrings=True, file=file)
+
+	assert file.getvalue().splitlines() == [
+			"audit_demo.broken: could not import: ValueError: Broken",
+			"audit_demo.module.Class: could not audit: ValueError: Cannot audit Class",
+			"audit_demo.module.documented: b=``1``",
+			"    :param b: The first argument.",
+			"            Default ``1``.",
+			'',
+			]
+
+
+def test_main_text(package: str, capsys):
+	assert main([f"{package}.module"]) == 1
+
+	assert capsys.readouterr().out.splitlines() == [
+			"audit_demo.module.Class: g=:py:obj:`True`",
+			"audit_demo.module.documented: b=``1``, c=``'hello'``",
+			"audit_demo.module.documented: no :param: field for 'c', so its default value is not shown",
+			"audit_demo.module.stale: d=:py:obj:`None`",
+			"audit_demo.module.stale: :default: or :no-default: field for 'e', which is not an argument",
+			"audit_demo.module.stale: :default: or :no-default: field for 'f', which is not an argument",
+			]
+
+
+def test_main_json(package: str, capsys):
+	assert main([f"{package}.module", "--json", "--docstrings", "-j", '1']) == 1
+
+	report = json.loads(capsys.readouterr().out)
+	assert report["errors"] == []
+	assert report["objects"][0] == {
+			"name": "audit_demo.module.Class",
+			"defaults": {'g': ":py:obj:`True`"},
+			"missing_params": [],
+			"stale_overrides": [],
+			"shown": 1,
+			"docstring": [":param g: The first argument.", "        Default :py:obj:`True`.", ''],
+			}
+
+
+def test_main_ok(capsys):
+	assert main(["sphinxcontrib.default_values.demo", "--json"]) == 0
+	assert "docstring" not in json.loads(capsys.readouterr().out)["objects"][0]
+
+
+def test_main_module(monkeypatch, capsys):
+	monkeypatch.setattr(
+			sys, "argv", ["python -m sphinxcontrib.default_values", "sphinxcontrib.default_values.demo"]
+			)
+
+	with pytest.raises(SystemExit) as exc_info:
+		runpy.run_module("sphinxcontrib.default_values", run_name="__main__")
+
+	assert exc_info.value.code == 0
+	assert capsys.readouterr().out.startswith("sphinxcontrib.default_values.demo.demo: ")
@@ -0,0 +1,43 @@
+# 3rd party
+import pytest
+
+# this package
+from tests.common import SphinxProject
+
+module_source = '''
+def first(a, b=None):
+	"""
+	The first function.
+
+	:param a: The first argument.
+	:param b: The second argument.
+	"""
+
+
+def second(c, d=None):
+	"""
+	The second function.
+
+	:param c: The first argument.
+	:param d: The second argument.
+	"""
+'''
+
+
+@pytest.mark.parametrize("insertion", ["docstring", "doctree"])
+def test_autosummary(project: SphinxProject, insertion: str):
+	# autosummary processes the docstring of each object only to take its first line.
+	project.write_module("autosummary_demo", module_source)
+	project.write_conf(["sphinx.ext.autosummary"], default_values_insertion=insertion)
+	project.write_document(
+			"index",
+			"Index",
+			".. autosummary::\n\n\tautosummary_demo.first\n\n.. autofunction:: autosummary_demo.second\n",
+			)
+
+	build = project.build()
+	assert build.warnings == ''
+
+	html = build.html()
+	assert "The first function." in html
+	assert "The second argument.\nDefault" in html
@@ -0,0 +1,145 @@
+# stdlib
+from typing import List
+
+# 3rd party
+import pytest
+
+# this package
+from sphinxcontrib.default_values import (
+		_defaults_cache,
+		_docstring_cache,
+		_get_formatted_defaults,
+		_LRUCache,
+		clear_caches,
+		process_docstring
+		)
+from tests.common import MockApp
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+	_defaults_cache.clear()
+	_docstring_cache.clear()
+	yield
+	_defaults_cache.clear()
+	_docstring_cache.clear()
+
+
+def test_lru_cache():
+	cache = _LRUCache(maxsize=2)
+
+	cache.put('a', 1)
+	cache.put('b', 2)
+	assert cache.get('a') == 1
+	cache.put('c', 3)
+
+	assert len(cache) == 2
+	assert cache.get('b') is None
+	assert cache.get('a') == 1
+	assert cache.get('c') == 3
+	assert (cache.hits, cache.misses) == (3, 1)
+
+	cache.clear()
+	assert len(cache) == 0
+	assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_get_formatted_defaults_cached():
+
+	def demo(a, b=None, c_="hello"):
+		pass
+
+	expected = (('a', None), ('b', ":py:obj:`None`"), ("c\\_", "``'hello'``"))
+
+	assert _get_formatted_defaults(demo) == expected
+	assert (_defaults_cache.hits, _defaults_cache.misses) == (0, 1)
+
+	assert _get_formatted_defaults(demo) == expected
+	assert (_defaults_cache.hits, _defaults_cache.misses) == (1, 1)
+
+
+def test_get_formatted_defaults_class():
+
+	class Demo:
+
+		def __init__(self, a=1):
+			pass
+
+	class SubDemo(Demo):
+		pass
+
+	assert _get_formatted_defaults(Demo) == (("self", None), ('a', "``1``"))
+	assert (_defaults_cache.hits, _defaults_cache.misses) == (0, 1)
+
+	# The subclass inherits the constructor, and so its defaults.
+	assert _get_formatted_defaults(SubDemo) == (("self", None), ('a', "``1``"))
+	assert (_defaults_cache.hits, _defaults_cache.misses) == (1, 1)
+
+	# As does the constructor itself, when it is documented as a method.
+	assert _get_formatted_defaults(Demo.__init__) == (("self", None), ('a', "``1``"))
+	assert (_defaults_cache.hits, _defaults_cache.misses) == (2, 1)
+
+
+def test_get_formatted_defaults_unhashable():
+
+	class Unhashable:
+		__hash__ = None  # type: ignore[assignment]
+
+		def __call__(self, a=1):
+			pass
+
+	assert _get_formatted_defaults(Unhashable()) == (('a', "``1``"), )
+	assert len(_defaults_cache) == 0
+
+
+def test_clear_caches():
+
+	def demo(a=1):
+		pass
+
+	_get_formatted_defaults(demo)
+	assert len(_defaults_cache) == 1
+
+	clear_caches(None)  # type: ignore[arg-type]
+	assert len(_defaults_cache) == 0
+	assert len(_docstring_cache) == 0
+	assert (_defaults_cache.hits, _defaults_cache.misses) == (0, 0)
+
+
+def test_docstring_cache():
+
+	class Base:
+
+		def method(self, a=1, b=None):
+			"""
+			:param a: The first argument
+			:param b: The second argument
+			:no-default b:
+			"""
+
+	class Subclass(Base):
+		pass
+
+	def process(app: MockApp, obj) -> List[str]:
+		lines = [":param a: The first argument", ":param b: The second argument", ":no-default b:"]
+		process_docstring(app, "method", obj.__qualname__, obj, {}, lines)  # type: ignore[arg-type]
+		return lines
+
+	expected = [
+			":param a: The first argument.",
+			"    Default ``1``.",
+			":param b: The second argument",
+			'',
+			]
+
+	app = MockApp("Default %s")
+	assert process(app, Base.method) == expected
+	assert (_docstring_cache.hits, _docstring_cache.misses) == (0, 1)
+
+	# Inherited members have the same docstring and defaults.
+	assert process(app, Subclass.method) == expected
+	assert (_docstring_cache.hits, _docstring_cache.misses) == (1, 1)
+
+	# The output also depends on the format of the default value.
+	assert process(MockApp("Defaults to %s"), Base.method)[1] == "    Defaults to ``1``."
+	assert (_docstring_cache.hits, _docstring_cache.misses) == (1, 2)
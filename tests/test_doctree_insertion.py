@@ -0,0 +1,137 @@
+# stdlib
+import json
+
+# 3rd party
+import pytest
+
+# this package
+from tests.common import SphinxProject
+
+module_source = '''
+def function(a, b=1, c="hello", d=None, e=True, f_=2.5, g=(), h=[]):
+	"""
+	A function.
+
+	:param a: The first argument.
+	:param b: The second argument
+	:param c: The third argument.
+		Which is described at length.
+	:default c: ``'world'``
+	:param d: The fourth argument.
+	:no-default d:
+	:param e:
+	:param f\\\\_: The sixth argument.
+	:default z: ``2``
+	:param g: The seventh argument; the list:
+
+		* is empty.
+
+	:rtype: int
+	"""
+
+
+class Class:
+	"""
+	A class.
+
+	:param i: I.
+	"""
+
+	def __init__(self, i=None):
+		pass
+
+	def method(self, j=0):
+		"""
+		A method.
+
+		:param j: The first argument.
+		"""
+
+
+def google(k, m="m"):
+	"""
+	Google style.
+
+	Args:
+		k: The first argument.
+		m: The second argument.
+	"""
+'''
+
+
+@pytest.fixture()
+def project(project: SphinxProject) -> SphinxProject:
+	project.write_module("doctree_demo", module_source)
+	project.write_conf(["sphinx.ext.napoleon"])
+	project.write_document(
+			"index",
+			"Index",
+			".. automodule:: doctree_demo\n\t:members:\n\n"
+			".. autofunction:: doctree_demo.function\n\t:noindex:\n",
+			)
+	return project
+
+
+def test_doctree_insertion(project: SphinxProject):
+	docstring = project.build(name="docstring", confoverrides={"default_values_insertion": "docstring"})
+	doctree = project.build(name="doctree", confoverrides={"default_values_insertion": "doctree"})
+
+	# The output is the same as when the docstring is rewritten.
+	assert doctree.html() == docstring.html()
+	assert doctree.warnings == docstring.warnings
+
+	html = doctree.html()
+	assert "Default <code" in html
+	assert "The second argument.\nDefault" in html
+	assert "world" in html
+	assert ":default" not in html
+	assert ":no-default" not in html
+
+
+edge_source = '''
+def overrides_only(a=1, b=2):
+	"""
+	Has no parameters documented.
+
+	:default a: ``3``
+	:no-default:
+	"""
+
+
+def long_override(c="hello"):
+	"""
+	:param c: The argument.
+	:default c: ``'world'``
+
+		Or ``'there'``
+	"""
+'''
+
+
+def test_doctree_insertion_edge_cases(project: SphinxProject):
+	project.write_module("doctree_edge_demo", edge_source)
+	project.write_document(
+			"index",
+			"Index",
+			".. automodule:: doctree_edge_demo\n\t:members:\n\n"
+			".. py:function:: manual(d=4)\n\n\t:param d: Not documented with autodoc.\n",
+			)
+
+	build = project.build(confoverrides={"default_values_insertion": "doctree", "default_values_index": True})
+	html = build.html()
+
+	# The fields with no parameter to add the default value to are removed,
+	# and objects which were not documented with autodoc are left alone.
+	assert ":default" not in html
+	assert ":no-default" not in html
+	assert "Not documented with autodoc." in html
+
+	# Overrides which are not a single paragraph are shown as text.
+	assert html.count("Default") == 1
+	assert "Default \u2018world\u2019\n\nOr \u2018there\u2019." in html
+
+	with open(build.outdir / "defaults.jsonl", encoding="UTF-8") as fp:
+		records = [json.loads(line) for line in fp]
+
+	names = [record["name"] for record in records]
+	assert names == ["doctree_edge_demo.long_override", "doctree_edge_demo.overrides_only"]
@@ -0,0 +1,55 @@
+# stdlib
+from types import SimpleNamespace
+
+# this package
+import sphinxcontrib.default_values
+from sphinxcontrib.default_values import _get_formatted_defaults, get_outdated_docs
+from sphinxcontrib.default_values.fingerprints import Fingerprints
+from tests.common import MockApp
+
+
+def demo(a, b=1):
+	pass
+
+
+def test_record():
+	fingerprints = Fingerprints({}, "salt")
+
+	def local_function(a=1):
+		pass
+
+	fingerprints.record("index", demo, "demo", (('a', None), ('b', "``1``")))
+	fingerprints.record("index", local_function, "local_function", (('a', "``1``"), ))
+
+	assert fingerprints.fingerprints == {
+			"index": {
+					"demo": (__name__, "demo", fingerprints.fingerprint((('a', None), ('b', "``1``")))),
+					"local_function": (None, None, fingerprints.fingerprint(None)),
+					},
+			}
+
+
+def test_outdated():
+	mapping = {}  # type: ignore[var-annotated]
+	fingerprints = Fingerprints(mapping, "salt")
+
+	def local_function(a=1):
+		pass
+
+	fingerprints.record("demo", demo, "demo", _get_formatted_defaults(demo))
+	fingerprints.record("local", local_function, "local_function", (('a', "``1``"), ))
+	fingerprints.record("removed", SimpleNamespace(__module__=__name__, __qualname__="removed"), "removed", ())
+
+	# The object has been removed, so it cannot be imported again.
+	assert fingerprints.outdated(set(), _get_formatted_defaults) == ["removed"]
+	assert fingerprints.outdated({"removed"}, _get_formatted_defaults) == []
+
+	# The configuration has changed.
+	assert Fingerprints(mapping, "new salt").outdated({"removed"}, _get_formatted_defaults) == ["demo", "local"]
+
+
+def test_get_outdated_docs_not_configured(monkeypatch):
+	monkeypatch.setattr(sphinxcontrib.default_values, "_fingerprints", None)
+	env = SimpleNamespace(default_values_fingerprints={"index": {"demo": (None, None, '')}})
+
+	assert get_outdated_docs(MockApp(), env, set(), set(), set()) == []  # type: ignore[arg-type]
@@ -1,14 +1,27 @@
 # stdlib
+import collections
+import collections.abc
 import inspect
 import json
+import logging
 import re
+import subprocess
+import sys
+import time
+from types import MappingProxyType
 
 # 3rd party
 import pytest
 
 # this package
 import sphinxcontrib.default_values
-from sphinxcontrib.default_values import format_default_value
+from sphinxcontrib.default_values import (
+		configure_formatting,
+		format_default_value,
+		get_function_defaults,
+		register_default_formatter
+		)
+from tests.common import MockApp
 
 
 @pytest.mark.parametrize(
@@ -42,3 +55,380 @@ from sphinxcontrib.default_values import format_default_value
 		)
 def test_format_default_value(value, expects):
 	assert format_default_value(value) == expects
+
+
+class BigRepr:
+
+	def __repr__(self) -> str:
+		return "BigRepr(" + 'x' * 1000 + ')'
+
+
+class Tags(frozenset):
+	pass
+
+
+Point = collections.namedtuple("Point", "x, y")
+
+
+@pytest.mark.parametrize(
+		"value, expects",
+		[
+				(None, ":py:obj:`None`"),
+				(1234, "``1234``"),
+				("Hello World", "``'Hello World'``"),
+				([1, 2, 3], "``[1, 2, 3]``"),
+				({'a': [1, {'b': 2}]}, "``{'a': [1, {...}]}``"),
+				(dict.fromkeys(range(1024)), "``{...} (1,024 items)``"),
+				(list(range(100)), "``[...] (100 items)``"),
+				(tuple(range(11)), "``(...) (11 items)``"),
+				(frozenset(range(11)), "``frozenset({...}) (11 items)``"),
+				({"key": list(range(11))}, "``{'key': [...] (11 items)}``"),
+				(b'\0' * 4096, "``bytes(...) (4,096 bytes)``"),
+				('x' * 100, "``'xxxxxxxxxxxxxxxxx...xxxxxxxxxxxxxxxxxx'``"),
+				(BigRepr(), "``BigRepr(xxxxxxxxxx...xxxxxxxxxxxxxxxxxx)``"),
+				(collections.OrderedDict.fromkeys(range(11)), "``OrderedDict({...}) (11 items)``"),
+				(collections.Counter(range(11)), "``Counter({...}) (11 items)``"),
+				(collections.defaultdict(list, dict.fromkeys(range(11))), "``defaultdict({...}) (11 items)``"),
+				(MappingProxyType(dict.fromkeys(range(11))), "``mappingproxy({...}) (11 items)``"),
+				(collections.UserList(range(11)), "``UserList([...]) (11 items)``"),
+				(collections.OrderedDict(a=list(range(11))), "``OrderedDict({'a': [...] (11 items)})``"),
+				(collections.defaultdict(list, a=[1]), "``defaultdict({'a': [1]})``"),
+				(collections.OrderedDict(), "``OrderedDict()``"),
+				(collections.UserList([1, 2]), "``UserList([1, 2])``"),
+				(Tags({'a'}), "``Tags({'a'})``"),
+				(Point(1, list(range(11))), "``Point(x=1, y=[...] (11 items))``"),
+				({'a': [Point(1, 2)]}, "``{'a': [Point(...)]}``"),
+				(
+						{'a': collections.OrderedDict(b=collections.OrderedDict(c=1))},
+						"``{'a': OrderedDict({'b': OrderedDict({...})})}``",
+						),
+				(range(1000), "``range(0, 1000)``"),
+				],
+		)
+def test_format_default_value_safe_repr(value, expects, monkeypatch):
+	safe_repr = sphinxcontrib.default_values._SafeRepr(max_length=40, max_depth=2, max_items=10)
+	monkeypatch.setattr(sphinxcontrib.default_values, "_safe_repr", safe_repr)
+	monkeypatch.setattr(sphinxcontrib.default_values, "_format_memo", {})
+
+	assert format_default_value(value) == expects
+	assert safe_repr.limited is ("..." in expects)
+
+
+class BigMapping(collections.abc.Mapping):
+
+	def __getitem__(self, key):
+		return key
+
+	def __iter__(self):
+		return iter(range(len(self)))
+
+	def __len__(self) -> int:
+		return 1_000_000
+
+	def __repr__(self) -> str:
+		raise AssertionError("The repr of a large container should not be computed.")
+
+
+class BrokenRepr:
+
+	def __repr__(self) -> str:
+		raise ValueError("No repr.")
+
+
+class BrokenLength(collections.abc.Sequence):
+
+	def __getitem__(self, index):
+		raise IndexError(index)
+
+	def __len__(self) -> int:
+		raise ValueError("No length.")
+
+	def __repr__(self) -> str:
+		return "BrokenLength()"
+
+
+class SlowRepr:
+
+	def __repr__(self) -> str:
+		time.sleep(10)
+		return "SlowRepr()"
+
+
+def test_safe_repr_large_container():
+	safe_repr = sphinxcontrib.default_values._SafeRepr()
+	assert safe_repr.repr(BigMapping()) == "BigMapping({...}) (1,000,000 items)"
+	assert safe_repr.limited
+
+	# The repr of large values inside a small container subclass is not computed either.
+	nested = collections.OrderedDict(a=BigMapping(), b=list(range(2_000_000)))
+	assert safe_repr.repr(nested) == (
+			"OrderedDict({'a': BigMapping({...}) (1,000,000 items), 'b': [...] (2,000,000 items)})"
+			)
+	assert safe_repr.limited
+
+
+def test_safe_repr_broken():
+	safe_repr = sphinxcontrib.default_values._SafeRepr()
+
+	assert re.fullmatch("<BrokenRepr instance at 0x[0-9a-f]+>", safe_repr.repr(BrokenRepr()))
+	assert not safe_repr.limited
+
+	# Containers without a length are shown with their own repr.
+	assert safe_repr.repr(BrokenLength()) == "BrokenLength()"
+	assert not safe_repr.limited
+
+
+def test_configure_formatting(app: MockApp, monkeypatch):
+	for name in ("_safe_repr", "_call_attrs_factories", "_reference_constants"):
+		monkeypatch.setattr(sphinxcontrib.default_values, name, getattr(sphinxcontrib.default_values, name))
+
+	app.config.default_values_safe_repr = True
+	app.config.default_values_repr_max_length = 40
+	app.config.default_values_repr_max_depth = 2
+	app.config.default_values_repr_max_items = 10
+	app.config.default_values_repr_timeout = 0.5
+	app.config.default_values_attrs_factories = "call"
+	app.config.default_values_reference_constants = False
+	configure_formatting(app)  # type: ignore[arg-type]
+
+	safe_repr = sphinxcontrib.default_values._safe_repr
+	assert isinstance(safe_repr, sphinxcontrib.default_values._SafeRepr)
+	assert (safe_repr.maxother, safe_repr.maxlevel, safe_repr.max_items, safe_repr.timeout) == (40, 2, 10, 0.5)
+
+	app.config.default_values_safe_repr = False
+	configure_formatting(app)  # type: ignore[arg-type]
+	assert sphinxcontrib.default_values._safe_repr is None
+
+
+# pytest-timeout's own timer would otherwise stop the limit from being enforced.
+@pytest.mark.timeout(0)
+def test_safe_repr_timeout():
+	safe_repr = sphinxcontrib.default_values._SafeRepr(timeout=0.1)
+
+	start = time.perf_counter()
+	assert safe_repr.repr(SlowRepr()) == "<SlowRepr instance>"
+	assert time.perf_counter() - start < 5
+	assert safe_repr.limited
+
+	# The limit does not affect quick reprs.
+	assert safe_repr.repr([1, 2, 3]) == "[1, 2, 3]"
+	assert not safe_repr.limited
+
+
+def test_safe_repr_report(monkeypatch, caplog):
+	monkeypatch.setattr(sphinxcontrib.default_values, "_safe_repr", sphinxcontrib.default_values._SafeRepr())
+	caplog.set_level(logging.INFO)
+
+	def demo(small=(), big=tuple(range(1000))):
+		pass
+
+	assert list(sphinxcontrib.default_values._format_defaults(demo, get_function_defaults(demo))) == [
+			("small", "``()``"),
+			("big", "``(...) (1,000 items)``"),
+			]
+
+	assert caplog.messages == [
+			"default_values: the default value of 'big' for "
+			"tests.test_format_default_value.test_safe_repr_report.<locals>.demo was shortened.",
+			]
+
+
+def test_format_default_value_memo(monkeypatch):
+	memo = {}  # type: ignore[var-annotated]
+	monkeypatch.setattr(sphinxcontrib.default_values, "_format_memo", memo)
+
+	assert format_default_value(True) == ":py:obj:`True`"
+	assert format_default_value(1) == "``1``"
+	assert format_default_value(str) == ":py:class:`str`"
+	assert format_default_value([1]) == "``[1]``"
+	assert format_default_value('x' * 1000) == f"``{'x' * 1000!r}``"
+	assert set(memo) == {(bool, True), (int, 1), (type, str)}
+
+	# Memoized values are not formatted again.
+	memo[(int, 1)] = "``one``"
+	assert format_default_value(1) == "``one``"
+
+
+class Colour:
+
+	def __init__(self, name: str):
+		self.name = name
+
+
+class Shade(Colour):
+	pass
+
+
+def test_register_default_formatter(monkeypatch):
+	memo = {(int, 1): "``one``"}
+	monkeypatch.setattr(sphinxcontrib.default_values, "_format_memo", memo)
+
+	formatted = format_default_value(Colour("red"))
+	assert formatted is not None
+	assert formatted.startswith("``<tests.test_format_default_value.Colour object at")
+
+	@register_default_formatter(Colour)
+	def format_colour(value: Colour) -> str:
+		return f":colour:`{value.name}`"
+
+	assert format_default_value(Colour("red")) == ":colour:`red`"
+	assert format_default_value(Shade("blue")) == ":colour:`blue`"
+
+	register_default_formatter(Shade, lambda value: None)
+	assert format_default_value(Shade("blue")) is None
+
+	# Registering a formatter discards the memoized values, as they may be formatted differently.
+	assert memo == {}
+
+
+class FakeDType:
+	name = "float32"
+
+
+class FakeArray:
+	"""
+	Stands in for a NumPy array, without importing NumPy.
+	"""
+
+	shape = (1024, 3)
+	dtype = FakeDType()
+
+	def __repr__(self) -> str:
+		raise AssertionError("The repr should not be used.")
+
+
+FakeArray.__module__ = "numpy"
+FakeArray.__qualname__ = "ndarray"
+
+
+class FakeArraySubclass(FakeArray):
+	pass
+
+
+class FakeTensor(FakeArray):
+	dtype = "torch.int8"  # type: ignore[assignment]
+
+
+FakeTensor.__module__ = "torch"
+FakeTensor.__qualname__ = "Tensor"
+
+
+class FakeSeries:
+	dtype = FakeDType()
+
+	def __len__(self) -> int:
+		return 100
+
+
+FakeSeries.__module__ = "pandas"
+FakeSeries.__qualname__ = FakeSeries.__name__ = "Series"
+
+
+class FakeFrame:
+	shape = (100, 3)
+
+
+FakeFrame.__module__ = "pandas"
+FakeFrame.__qualname__ = FakeFrame.__name__ = "DataFrame"
+
+
+class BrokenArray:
+
+	@property
+	def shape(self):
+		raise ValueError("Unknown shape")
+
+	def __repr__(self) -> str:
+		return "BrokenArray()"
+
+
+BrokenArray.__module__ = "numpy"
+BrokenArray.__qualname__ = "ndarray"
+
+
+@pytest.mark.parametrize(
+		"value, expects",
+		[
+				pytest.param(FakeArray(), "``array(shape=(1024, 3), dtype=float32)``", id="numpy"),
+				pytest.param(FakeArraySubclass(), "``array(shape=(1024, 3), dtype=float32)``", id="subclass"),
+				pytest.param(FakeTensor(), "``tensor(shape=(1024, 3), dtype=torch.int8)``", id="torch"),
+				pytest.param(FakeSeries(), "``Series(length=100, dtype=float32)``", id="series"),
+				pytest.param(FakeFrame(), "``DataFrame(shape=(100, 3))``", id="frame"),
+				pytest.param(BrokenArray(), "``BrokenArray()``", id="fallback"),
+				],
+		)
+def test_format_default_value_summary(value, expects):
+	assert format_default_value(value) == expects
+
+
+@pytest.mark.parametrize(
+		"module, qualname, expects",
+		[
+				pytest.param(
+						"pandas.core.frame",
+						"DataFrame",
+						"``DataFrame(shape=(100, 3))``",
+						id="pandas2_frame",
+						),
+				pytest.param(
+						"pandas.core.series",
+						"Series",
+						"``Series(length=100, dtype=float32)``",
+						id="pandas2_series",
+						),
+				pytest.param(
+						"pandas.core.indexes.base",
+						"Index",
+						"``Index(length=100, dtype=float32)``",
+						id="pandas2_index",
+						),
+				pytest.param(
+						"jaxlib.xla_extension",
+						"ArrayImpl",
+						"``array(shape=(100, 3), dtype=float32)``",
+						id="jax",
+						),
+				pytest.param("jaxlib._jax", "ArrayImpl", "``array(shape=(100, 3), dtype=float32)``", id="jax_jax"),
+				],
+		)
+def test_format_default_value_summary_module(module: str, qualname: str, expects: str):
+	# The classes are defined in different modules in different versions of the libraries.
+	namespace = {"__module__": module, "shape": (100, 3), "dtype": FakeDType(), "__len__": lambda self: 100}
+	value_type = type(qualname, (), namespace)
+	assert format_default_value(value_type()) == expects
+
+
+def test_format_default_value_summary_numpy():
+	np = pytest.importorskip("numpy")
+	assert format_default_value(
+			np.zeros((1024, 3), dtype=np.float32),
+			) == "``array(shape=(1024, 3), dtype=float32)``"
+	assert format_default_value(np.ma.masked_array([1, 2], dtype=np.int16)) == "``array(shape=(2,), dtype=int16)``"
+
+
+def test_format_default_value_summary_pandas():
+	pd = pytest.importorskip("pandas")
+	assert format_default_value(pd.DataFrame({'a': [1, 2]})) == "``DataFrame(shape=(2, 1))``"
+	assert format_default_value(pd.Series([1.0, 2.0])) == "``Series(length=2, dtype=float64)``"
+	assert format_default_value(pd.RangeIndex(10)) == "``RangeIndex(length=10, dtype=int64)``"
+
+
+def test_format_default_value_summary_no_import():
+	# The libraries are never imported by the extension itself.
+	code = (
+			"import sys\n"
+			"from sphinxcontrib.default_values import format_default_value\n"
+			"from tests.test_format_default_value import FakeArray, FakeFrame\n"
+			"format_default_value(FakeArray())\n"
+			"format_default_value(FakeFrame())\n"
+			"print(sorted({'numpy', 'pandas', 'torch'} & set(sys.modules)))\n"
+			)
+
+	process = subprocess.run(
+			[sys.executable, "-c", code],
+			stdout=subprocess.PIPE,
+			universal_newlines=True,
+			check=True,
+			)
+
+	assert process.stdout == "[]\n"
@@ -0,0 +1,428 @@
+# stdlib
+import collections
+import dataclasses
+import functools
+import inspect
+from typing import Any, Callable, ClassVar, List, NamedTuple
+
+# 3rd party
+import attr
+import pytest
+
+# this package
+import sphinxcontrib.default_values
+from sphinxcontrib.default_values import (
+		format_default_value,
+		get_arguments,
+		get_class_defaults,
+		get_function_defaults,
+		register_class_defaults_extractor
+		)
+
+
+def positional(a, b=1, c="hello"):
+	pass
+
+
+def star_args(a, b=None, *args, c, d=True, **kwargs):
+	pass
+
+
+def keyword_only(*, a: int = 1, b: str, c: bool = None) -> None:  # type: ignore[assignment]
+	pass
+
+
+def no_arguments() -> None:
+	pass
+
+
+def decorator(func: Callable) -> Callable:
+
+	@functools.wraps(func)
+	def wrapper(*args, **kwargs):
+		return func(*args, **kwargs)
+
+	return wrapper
+
+
+@decorator
+def decorated(a, b=[], *, c=...):
+	pass
+
+
+class Klass:
+
+	def method(self, a, b=2):
+		pass
+
+	@classmethod
+	def class_method(cls, a=3):
+		pass
+
+	@staticmethod
+	def static_method(a=4):
+		pass
+
+
+def expected_defaults(obj: Callable) -> List[Any]:
+	return [(argname, param.default) for argname, param in get_arguments(obj).items()]
+
+
+@pytest.mark.parametrize(
+		"obj",
+		[
+				pytest.param(positional, id="positional"),
+				pytest.param(star_args, id="star_args"),
+				pytest.param(keyword_only, id="keyword_only"),
+				pytest.param(no_arguments, id="no_arguments"),
+				pytest.param(decorated, id="decorated"),
+				pytest.param(Klass.method, id="method"),
+				pytest.param(Klass().method, id="bound_method"),
+				pytest.param(Klass.class_method, id="class_method"),
+				pytest.param(Klass.static_method, id="static_method"),
+				pytest.param(functools.partial(positional, 1, c="world"), id="partial"),
+				pytest.param(print, id="builtin"),
+				pytest.param(str.join, id="method_descriptor"),
+				],
+		)
+def test_get_function_defaults(obj: Callable):
+	assert list(get_function_defaults(obj)) == expected_defaults(obj)
+
+
+def test_get_function_defaults_keyword_only():
+	assert list(get_function_defaults(keyword_only)) == [
+			('a', 1),
+			('b', inspect.Parameter.empty),
+			('c', None),
+			]
+
+
+def test_get_function_defaults_type_hints_not_evaluated():
+	evaluated = []
+
+	def hint() -> type:
+		evaluated.append(True)
+		return int
+
+	namespace = {"hint": hint}
+	exec("def func(a: 'hint()' = 1): pass", namespace)
+
+	assert list(get_function_defaults(namespace["func"])) == [('a', 1)]
+	assert not evaluated
+
+
+def test_get_function_defaults_signature():
+
+	def func(a=1, b=2):
+		pass
+
+	signature = inspect.Signature([inspect.Parameter('c', inspect.Parameter.KEYWORD_ONLY, default=3)])
+	func.__signature__ = signature  # type: ignore[attr-defined]
+
+	assert list(get_function_defaults(func)) == [('c', 3)]
+
+
+def test_get_class_defaults():
+
+	class MyClass:
+
+		def __init__(self, foo, bar=None, show=True, *, coloured_output=False):
+			pass
+
+	assert list(get_class_defaults(MyClass)) == [
+			("self", inspect.Parameter.empty),
+			("foo", inspect.Parameter.empty),
+			("bar", None),
+			("show", True),
+			("coloured_output", False),
+			]
+
+
+def test_get_class_defaults_new():
+
+	class Singleton:
+
+		def __new__(cls, name="default"):
+			return super().__new__(cls)
+
+	assert list(get_class_defaults(Singleton)) == [("cls", inspect.Parameter.empty), ("name", "default")]
+
+	class SubSingleton(Singleton):
+
+		def __init__(self, name="sub"):
+			pass
+
+	# The __init__ method is defined further down the MRO than __new__.
+	assert list(get_class_defaults(SubSingleton)) == [("self", inspect.Parameter.empty), ("name", "sub")]
+
+
+def test_get_class_defaults_passthrough():
+
+	class Passthrough:
+
+		def __new__(cls, *args, **kwargs):
+			return super().__new__(cls)
+
+		def __init__(self, a=1):
+			pass
+
+	# __new__ only passes its arguments on, so the signature is that of __init__.
+	assert list(get_class_defaults(Passthrough)) == [("self", inspect.Parameter.empty), ('a', 1)]
+
+
+def test_get_class_defaults_metaclass_call():
+
+	class Meta(type):
+
+		def __call__(cls, b=2):
+			return super().__call__()
+
+	class WithMeta(metaclass=Meta):
+
+		def __init__(self, a=1):
+			pass
+
+	assert list(get_class_defaults(WithMeta)) == [("cls", inspect.Parameter.empty), ('b', 2)]
+
+	class PassthroughMeta(type):
+
+		def __call__(cls, *args, **kwargs):
+			return super().__call__(*args, **kwargs)
+
+	class WithPassthroughMeta(metaclass=PassthroughMeta):
+
+		def __init__(self, a=1):
+			pass
+
+	assert list(get_class_defaults(WithPassthroughMeta)) == [("self", inspect.Parameter.empty), ('a', 1)]
+
+
+def test_get_class_defaults_builtin_base():
+
+	class MyDict(dict):
+		pass
+
+	# Methods implemented in C are skipped, and the signature of __init__ is used.
+	assert list(get_class_defaults(MyDict)) == list(get_function_defaults(MyDict.__init__))
+
+
+def test_get_constructor_inherited():
+
+	class Base:
+
+		def __init__(self, a=1):
+			pass
+
+	class Child(Base):
+		pass
+
+	class GrandChild(Child):
+		pass
+
+	get_constructor = sphinxcontrib.default_values._get_constructor
+	assert get_constructor(Base) is get_constructor(Child) is get_constructor(GrandChild) is Base.__init__
+
+
+def test_get_constructor_multiple_inheritance():
+
+	class Base:
+
+		def __init__(self, a=1):
+			pass
+
+	class Left(Base):
+		pass
+
+	class Right(Base):
+
+		def __init__(self, b=2):
+			pass
+
+	class Diamond(Left, Right):
+		pass
+
+	get_constructor = sphinxcontrib.default_values._get_constructor
+
+	# Left's constructor is cached first, but Right comes before Base in Diamond's MRO.
+	assert get_constructor(Left) is Base.__init__
+	assert get_constructor(Diamond) is Right.__init__
+
+
+def make_pool() -> List[str]:
+	raise AssertionError("The factory should not be called.")
+
+
+@attr.s
+class AttrsClass:
+	a: int = attr.ib()
+	b: List[str] = attr.ib(default=attr.Factory(list))
+	c: List[str] = attr.ib(default=attr.Factory(make_pool))
+	d: int = attr.ib(default=attr.Factory(lambda self: self.a, takes_self=True))
+	_e: bool = attr.ib(default=False)
+
+
+def test_get_class_defaults_attrs():
+	defaults = dict(get_class_defaults(AttrsClass, call_factories=False))
+
+	assert defaults['a'] is inspect.Parameter.empty
+	assert defaults['b'] == attr.Factory(list)
+	assert defaults['c'] == attr.Factory(make_pool)
+	assert isinstance(defaults['d'], attr.Factory)  # type: ignore[arg-type]
+	assert defaults['e'] is False
+
+	assert format_default_value(defaults['b']) == ":py:class:`list`\\ ``()``"
+	assert format_default_value(defaults['c']) == ":py:func:`tests.test_get_function_defaults.make_pool`"
+	assert format_default_value(defaults['d']) == "``AttrsClass.<lambda>()``"
+
+	with pytest.raises(AssertionError, match="The factory should not be called."):
+		list(get_class_defaults(AttrsClass))
+
+
+def test_get_class_defaults_attrs_call_factories():
+
+	@attr.s
+	class Demo:
+		a: List[str] = attr.ib(default=attr.Factory(list))
+		b: int = attr.ib(default=attr.Factory(lambda self: 1, takes_self=True))
+
+	defaults = dict(get_class_defaults(Demo))
+	assert defaults['a'] == []
+	assert isinstance(defaults['b'], attr.Factory)  # type: ignore[arg-type]
+
+
+@dataclasses.dataclass
+class DataClass:
+	a: int
+	b: List[str] = dataclasses.field(default_factory=make_pool)
+	c: bool = False
+	d: int = dataclasses.field(default=1, init=False)
+	e: ClassVar[int] = 2
+
+
+def test_get_class_defaults_dataclass():
+	defaults = list(get_class_defaults(DataClass))
+	assert defaults == [
+			('a', inspect.Parameter.empty),
+			('b', sphinxcontrib.default_values._FactoryReference(make_pool)),
+			('c', False),
+			]
+
+	assert format_default_value(defaults[1][1]) == ":py:func:`tests.test_get_function_defaults.make_pool`"
+
+
+def test_get_class_defaults_dataclass_own_init():
+
+	@dataclasses.dataclass
+	class Demo:
+		a: int = 1
+
+		def __init__(self, b=2):
+			pass
+
+	assert list(get_class_defaults(Demo)) == [("self", inspect.Parameter.empty), ('b', 2)]
+
+
+def test_get_class_defaults_dataclass_subclass():
+
+	@dataclasses.dataclass
+	class Base:
+		x: int = 1
+
+	class Plain(Base):
+		pass
+
+	class OwnInit(Base):
+
+		def __init__(self, x=2):
+			pass
+
+	@dataclasses.dataclass(init=False)
+	class NoInit(Base):
+		y: int = 3
+
+	@dataclasses.dataclass
+	class Generated(OwnInit):
+		y: int = 3
+
+	assert list(get_class_defaults(Plain)) == [('x', 1)]
+	assert list(get_class_defaults(OwnInit)) == [("self", inspect.Parameter.empty), ('x', 2)]
+	assert list(get_class_defaults(NoInit)) == [('x', 1)]
+	assert list(get_class_defaults(Generated)) == [('x', 1), ('y', 3)]
+
+	# The generated __init__ has been replaced with something which is not a function.
+	@dataclasses.dataclass
+	class Replaced:
+		x: int = 1
+
+	def init(self, x, y=4):
+		pass
+
+	setattr(Replaced, "__init__", functools.partialmethod(init, x=5))
+	assert not sphinxcontrib.default_values._is_dataclass(Replaced)
+
+
+class TypedNamedTuple(NamedTuple):
+	a: int
+	b: str = "hello"
+
+
+@pytest.mark.parametrize(
+		"obj",
+		[
+				pytest.param(TypedNamedTuple, id="typing"),
+				pytest.param(
+						collections.namedtuple("CollectionsNamedTuple", "a, b", defaults=["hello"]),
+						id="collections",
+						),
+				],
+		)
+def test_get_class_defaults_namedtuple(obj: type):
+	assert list(get_class_defaults(obj)) == [('a', inspect.Parameter.empty), ('b', "hello")]
+
+
+def test_get_class_defaults_pydantic():
+	pydantic: Any = pytest.importorskip("pydantic", minversion="2.0")
+	BaseModel: Any = pydantic.BaseModel
+
+	class Model(BaseModel):
+		a: int
+		b: List[str] = pydantic.Field(default_factory=make_pool)
+		c: str = "hello"
+
+	defaults = list(get_class_defaults(Model))
+	assert defaults == [
+			('a', inspect.Parameter.empty),
+			('b', sphinxcontrib.default_values._FactoryReference(make_pool)),
+			('c', "hello"),
+			]
+
+
+def test_register_class_defaults_extractor(monkeypatch):
+	monkeypatch.setattr(sphinxcontrib.default_values, "_class_extractors", [])
+	monkeypatch.setattr(sphinxcontrib.default_values, "_class_extractor_cache", {})
+
+	checked = []
+
+	class Plugin:
+		options = {'a': 1, 'b': True}
+
+	class NotPlugin:
+
+		def __init__(self, c=None):
+			pass
+
+	def is_plugin(obj: type) -> bool:
+		checked.append(obj)
+		return issubclass(obj, Plugin)
+
+	def get_plugin_defaults(obj: Any, call_factories: bool):
+		return iter(obj.options.items())
+
+	register_class_defaults_extractor(is_plugin, get_plugin_defaults)
+
+	assert list(get_class_defaults(Plugin)) == [('a', 1), ('b', True)]
+	assert list(get_class_defaults(Plugin)) == [('a', 1), ('b', True)]
+	assert list(get_class_defaults(NotPlugin)) == [("self", inspect.Parameter.empty), ('c', None)]
+
+	# The extractor is chosen once for each class.
+	assert checked == [Plugin, NotPlugin]
@@ -0,0 +1,71 @@
+# stdlib
+from typing import Any, Dict, List, Optional
+
+# 3rd party
+import pytest
+
+# this package
+from tests.common import SphinxProject
+
+module_source = '''
+def with_defaults(a, b=1, c="hello"):
+	"""
+	:param a: The first argument.
+	:param b: The second argument.
+	:param c: The third argument.
+	"""
+
+
+def without_params(a, b=1):
+	"""
+	Does something.
+	"""
+'''
+
+
+@pytest.fixture()
+def project(project: SphinxProject) -> SphinxProject:
+	project.write_module("incremental_demo", module_source)
+	project.write_document("index", "Index", ".. toctree::\n\n\tdefaults\n\tno_params\n\tprose\n")
+	project.write_document("defaults", "Defaults", ".. autofunction:: incremental_demo.with_defaults\n")
+	project.write_document("no_params", "No Params", ".. autofunction:: incremental_demo.without_params\n")
+	project.write_document("prose", "Prose", "No functions here.\n")
+	return project
+
+
+def build(project: SphinxProject, confoverrides: Optional[Dict[str, Any]] = None) -> List[str]:
+	"""
+	Build the project, and return the names of the documents which were read.
+	"""
+
+	read: List[str] = []
+	project.build(
+			confoverrides=confoverrides,
+			events={"source-read": lambda app, docname, source: read.append(docname)},
+			)
+	return sorted(read)
+
+
+def test_incremental_format_change(project: SphinxProject):
+	assert build(project) == ["defaults", "index", "no_params", "prose"]
+	assert build(project) == []
+
+	# Only the document showing default values is read again.
+	assert build(project, {"default_description_format": "Defaults to %s"}) == ["defaults"]
+	assert "Defaults to" in (project.path / "build" / "html" / "defaults.html").read_text()
+
+	assert build(project, {"default_description_format": "Defaults to %s"}) == []
+
+
+def test_incremental_default_change(project: SphinxProject):
+	assert build(project) == ["defaults", "index", "no_params", "prose"]
+
+	# e.g. the default is a constant defined in another module, which has changed.
+	# 3rd party
+	import incremental_demo  # type: ignore[import-not-found]
+	incremental_demo.with_defaults.__defaults__ = (2, "world")
+
+	assert build(project) == ["defaults"]
+	assert 'Default <code class="docutils literal notranslate"><span class="pre">2</span></code>' in (
+			project.path / "build" / "html" / "defaults.html"
+			).read_text()
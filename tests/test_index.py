@@ -0,0 +1,225 @@
+# stdlib
+import importlib
+import json
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+# 3rd party
+import pytest
+from sphinx.util.parallel import parallel_available
+
+# this package
+import sphinxcontrib.default_values
+from sphinxcontrib.default_values import _add_to_index, _DocstringFields, _get_default_reprs, _repr_default
+from tests.common import SphinxProject
+
+module_source = '''
+def function(a, b=1, c="hello", d=None, e=True):
+	"""
+	:param a: The first argument.
+	:param b: The second argument.
+	:param c: The third argument.
+	:default c: ``'world'``
+	:param d: The fourth argument.
+	:no-default d:
+	"""
+
+
+class Class:
+	"""
+	Has no parameters documented.
+	"""
+
+	def __init__(self, f=2.5):
+		pass
+'''
+
+
+@pytest.fixture()
+def project(project: SphinxProject) -> SphinxProject:
+	project.write_module("index_demo", module_source)
+	project.write_conf(default_values_index=True)
+
+	toctree = ["function", "class", "prose"] + [f"extra_{n}" for n in range(6)]
+	toctree_entries = '\n'.join(f"\t{docname}" for docname in toctree)
+	project.write_document("index", "Index", f".. toctree::\n\n{toctree_entries}\n")
+	project.write_document("function", "Function", ".. autofunction:: index_demo.function\n")
+	project.write_document("class", "Class", ".. autoclass:: index_demo.Class\n")
+	project.write_document("prose", "Prose", "No functions here.\n")
+
+	# Enough documents to be read in parallel.
+	for n in range(6):
+		project.write_document(f"extra_{n}", f"Extra {n}", "Nothing here.\n")
+
+	return project
+
+
+def build(project: SphinxProject, parallel: int = 0) -> List[Dict[str, Any]]:
+	"""
+	Build the project, and return the records in the index.
+	"""
+
+	outdir = project.build(parallel=parallel).outdir
+
+	with open(outdir / "defaults.jsonl", encoding="UTF-8") as fp:
+		return [json.loads(line) for line in fp]
+
+
+def argument(
+		name: str,
+		default: Optional[str] = None,
+		formatted: Optional[str] = None,
+		override: Optional[str] = None,
+		suppressed: bool = False,
+		documented: bool = True,
+		shown: Optional[str] = None,
+		) -> Dict[str, Any]:
+	return {
+			"name": name,
+			"default": default,
+			"formatted": formatted,
+			"override": override,
+			"suppressed": suppressed,
+			"documented": documented,
+			"shown": shown,
+			}
+
+
+class_record = {
+		"docname": "class",
+		"name": "index_demo.Class",
+		"what": "class",
+		"module": "index_demo",
+		"qualname": "Class",
+		"arguments": [
+				argument("self", documented=False),
+				argument('f', "2.5", "``2.5``", documented=False),
+				],
+		}
+
+function_arguments = [
+		argument('a'),
+		argument('b', '1', "``1``", shown="``1``"),
+		argument('c', "'hello'", "``'hello'``", override="``'world'``", shown="``'world'``"),
+		argument('d', "None", ":py:obj:`None`", suppressed=True),
+		argument('e', "True", ":py:obj:`True`", documented=False),
+		]
+
+function_record = {
+		"docname": "function",
+		"name": "index_demo.function",
+		"what": "function",
+		"module": "index_demo",
+		"qualname": "function",
+		"arguments": function_arguments,
+		}
+
+expected = [class_record, function_record]
+
+
+def test_index(project: SphinxProject):
+	assert build(project) == expected
+
+	# Documents which are not read again keep their records.
+	project.write_document("prose", "Prose", "Still no functions here.\n")
+	assert build(project) == expected
+
+	project.write_document("function", "Function", "Removed.\n")
+	assert build(project) == [class_record]
+
+
+@pytest.mark.skipif(not parallel_available, reason="Parallel builds are not available on this platform.")
+def test_index_parallel(project: SphinxProject):
+	assert build(project, parallel=4) == expected
+
+
+factory_source = '''
+import attr
+
+calls = []
+
+
+def make_list():
+	calls.append(1)
+	return []
+
+
+@attr.s
+class WithFactory:
+	"""
+	:param items: The items.
+	"""
+
+	items = attr.ib(default=attr.Factory(make_list))
+
+
+def underscores(type_=None):
+	"""
+	:param type\\\\_: The type.
+	"""
+'''
+
+
+def test_index_extracts_once(project: SphinxProject):
+	project.write_module("index_factory_demo", factory_source)
+	project.write_document(
+			"function",
+			"Function",
+			".. autoclass:: index_factory_demo.WithFactory\n\n.. autofunction:: index_factory_demo.underscores\n",
+			)
+
+	records = build(project)
+
+	# The default values are read once, for both the documentation and the index.
+	assert importlib.import_module("index_factory_demo").calls == [1]
+
+	assert records[1]["arguments"] == [
+			argument("self", documented=False),
+			argument("items", "[]", "``[]``", shown="``[]``"),
+			]
+	assert records[2]["arguments"] == [argument("type_", "None", ":py:obj:`None`", shown=":py:obj:`None`")]
+
+
+class Unhashable:
+
+	# Defining __eq__ without __hash__ makes instances unhashable.
+	def __eq__(self, other) -> bool:
+		return self is other
+
+	def __call__(self, a, b=1):
+		pass
+
+
+class BrokenRepr:
+
+	def __repr__(self) -> str:
+		raise ValueError("No repr.")
+
+
+def test_get_default_reprs_unhashable(monkeypatch):
+	monkeypatch.setattr(sphinxcontrib.default_values, "_default_reprs", {})
+
+	# The representations cannot be stored, so they are read from the object each time.
+	assert _get_default_reprs(Unhashable()) == (('a', None), ('b', '1'))
+	assert sphinxcontrib.default_values._default_reprs == {}
+
+
+def test_repr_default(monkeypatch):
+	monkeypatch.setattr(sphinxcontrib.default_values, "_safe_repr", None)
+	assert _repr_default(list(range(100))) == repr(list(range(100)))
+	assert _repr_default(BrokenRepr()) == "<BrokenRepr instance>"
+
+	safe_repr = sphinxcontrib.default_values._SafeRepr(max_items=10)
+	monkeypatch.setattr(sphinxcontrib.default_values, "_safe_repr", safe_repr)
+	assert _repr_default(list(range(100))) == "[...] (100 items)"
+	assert not safe_repr.limited
+
+
+def test_add_to_index_not_reading(monkeypatch):
+	index = SimpleNamespace(add=None)
+	monkeypatch.setattr(sphinxcontrib.default_values, "_index", index)
+
+	# No document is being read, so there is nothing to add the record to.
+	env: Any = SimpleNamespace(temp_data={})
+	lines = [":param b: The second argument."]
+	_add_to_index(env, "function", "demo", Unhashable(), lines, _DocstringFields(lines), ())
@@ -0,0 +1,166 @@
+# stdlib
+import json
+import pickle
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Counter, Dict, Tuple
+
+# 3rd party
+import pytest
+from sphinx.environment import BuildEnvironment
+from sphinx.util.parallel import parallel_available
+
+# this package
+from tests.common import SphinxProject
+
+pytestmark = pytest.mark.skipif(
+		not parallel_available,
+		reason="Parallel builds are not available on this platform.",
+		)
+
+module_template = '''
+class Base{n}:
+	"""
+	:param a: The first argument.
+	:param b: The second argument.
+	"""
+
+	def __init__(self, a, b={n}):
+		pass
+
+	def method(self, c=None, d="hello"):
+		"""
+		:param c: The third argument.
+		:param d: The fourth argument.
+		:no-default d:
+		"""
+
+
+class Derived{n}(Base{n}):
+	"""
+	:param a: The first argument.
+	:param b: The second argument.
+	:default b: ``{n}`` or more
+	"""
+
+
+def function{n}(e, f=[{n}, {n}], g=print, h=True):
+	"""
+	:param e: The first argument.
+	:param f: The second argument.
+	:param g: The third argument.
+	:param h: The fourth argument.
+	"""
+'''
+
+doc_options = '''	:members:
+	:inherited-members:
+'''
+
+
+@pytest.fixture()
+def project(project: SphinxProject) -> SphinxProject:
+	project.write_conf(default_values_trace=True)
+
+	toctree = []
+	for n in range(12):
+		project.write_module(f"parallel_demo_{n}", module_template.format(n=n))
+		project.write_document(f"module_{n}", f"Module {n}", f".. automodule:: parallel_demo_{n}\n{doc_options}")
+		toctree.append(f"\tmodule_{n}")
+
+	project.write_document("index", "Index", ".. toctree::\n\n" + '\n'.join(toctree) + '\n')
+
+	return project
+
+
+def build(project: SphinxProject, jobs: int) -> Tuple[Dict[str, str], str, float]:
+	"""
+	Build the project with ``sphinx-build -j jobs``.
+
+	Returns the HTML of each document, the extension's summary of the build, and the time taken.
+	"""
+
+	outdir = project.path / f"build_{jobs}"
+
+	start = time.perf_counter()
+	process = subprocess.run(
+			[
+					sys.executable,
+					"-m",
+					"sphinx",
+					"-b",
+					"html",
+					"-j",
+					str(jobs),
+					"-E",
+					str(project.srcdir),
+					str(outdir)
+					],
+			stdout=subprocess.PIPE,
+			stderr=subprocess.PIPE,
+			universal_newlines=True,
+			check=True,
+			)
+	duration = time.perf_counter() - start
+
+	assert process.stderr == ''
+
+	summary = re.search("^default_values: processed .*$", process.stdout, flags=re.MULTILINE)
+	assert summary is not None
+
+	html = {path.name: path.read_text() for path in outdir.glob("*.html")}
+	return html, summary.group(0), duration
+
+
+def traced_objects(outdir: Path) -> Counter:
+	"""
+	Returns the number of times each object appears in the trace written to the output directory.
+	"""
+
+	trace = json.loads((outdir / "default_values_trace.json").read_text())
+	return Counter(event["args"]["name"] for event in trace["traceEvents"] if event["name"] == "process_docstring")
+
+
+def saved_environment(outdir: Path) -> BuildEnvironment:
+	"""
+	Returns the build environment saved in the output directory.
+	"""
+
+	return pickle.loads((outdir / ".doctrees" / "environment.pickle").read_bytes())
+
+
+def test_parallel_build_matches_serial(project: SphinxProject, record_property):
+	serial_html, serial_summary, serial_time = build(project, 1)
+	parallel_html, parallel_summary, parallel_time = build(project, 4)
+
+	assert sorted(serial_html) == sorted(parallel_html)
+	assert "module_0.html" in serial_html
+	assert "The first argument" in serial_html["module_0.html"]
+
+	for filename, html in serial_html.items():
+		assert parallel_html[filename] == html, filename
+
+	# The counts from the parallel read workers are merged into those of the main process.
+	# Times and the proportion of docstrings reused (the cache is per process) vary between the builds.
+	def counts(summary: str) -> str:
+		return re.sub(r" in [0-9.]+s", '', summary.partition(" signature failures")[0])
+
+	assert counts(parallel_summary) == counts(serial_summary)
+	assert counts(serial_summary).startswith("default_values: processed 60 objects (12 skipped)")
+
+	# There are more chunks of documents than workers, so later workers are forked after earlier ones are merged.
+	# Each call of process_docstring is traced once.
+	assert traced_objects(project.path / "build_4") == traced_objects(project.path / "build_1")
+	assert sum(traced_objects(project.path / "build_1").values()) == 60
+
+	# The events and the statistics are not saved with the environment.
+	for outdir in (project.path / "build_1", project.path / "build_4"):
+		env = saved_environment(outdir)
+		assert not hasattr(env, "default_values_tracer")
+		assert not hasattr(env, "default_values_statistics")
+
+	speedup = serial_time / parallel_time
+	record_property("speedup", f"{speedup:.2f}")
@@ -0,0 +1,217 @@
+# stdlib
+import os
+import sqlite3
+import sys
+from types import ModuleType
+from typing import Counter, Optional
+
+# 3rd party
+import pytest
+from sphinx.util.parallel import parallel_available
+
+# this package
+import sphinxcontrib.default_values
+from sphinxcontrib.default_values import _defaults_cache, _get_formatted_defaults
+from sphinxcontrib.default_values.persistent_cache import PersistentCache
+from tests.common import Build, SphinxProject
+
+
+def demo(a, b: Optional[str] = None, c: int = 1234):
+	pass
+
+
+class Demo:
+
+	def __init__(self, a, b: bool = True):
+		pass
+
+
+@pytest.fixture()
+def filename(tmp_path) -> str:
+	return os.fspath(tmp_path / "default_values.sqlite3")
+
+
+def make_cache(filename: str, maxsize: int = 10, default_description_format: str = "Default %s"):
+	return PersistentCache(filename, maxsize, "0.8.0", default_description_format)
+
+
+def test_make_key(filename: str):
+	cache = make_cache(filename)
+
+	def local_function(a=1):
+		pass
+
+	assert cache.make_key(demo) is not None
+	assert cache.make_key(demo) == cache.make_key(demo)
+	assert cache.make_key(demo) != cache.make_key(Demo)
+	assert cache.make_key(Demo) != cache.make_key(Demo.__init__)
+	assert cache.make_key(local_function) is None
+	assert cache.make_key(print) is None
+
+	assert make_cache(filename, default_description_format="Defaults to %s").make_key(demo) != cache.make_key(demo)
+
+
+def test_make_key_missing_source(filename: str, monkeypatch):
+	module = ModuleType("deleted_demo")
+	module.__file__ = os.path.join(os.path.dirname(filename), "deleted_demo.py")
+	monkeypatch.setitem(sys.modules, "deleted_demo", module)
+
+	def function(a=1):
+		pass
+
+	function.__module__ = "deleted_demo"
+	function.__qualname__ = "function"
+
+	# The source file cannot be read, so changes to it could not be detected.
+	assert make_cache(filename).make_key(function) is None
+
+
+def test_round_trip(filename: str):
+	cache = make_cache(filename)
+	key = cache.make_key(demo)
+	assert key is not None
+
+	assert cache.get(key) is None
+
+	formatted_defaults = (('a', None), ('b', ":py:obj:`None`"), ('c', "``1234``"))
+	cache.put(key, formatted_defaults)
+	assert cache.get(key) == formatted_defaults
+
+	cache.flush()
+	assert cache.updates == {}
+	cache.close()
+
+	cache = make_cache(filename)
+	assert cache.get(key) == formatted_defaults
+	assert cache.updates == {key: None}
+	cache.close()
+
+
+def test_eviction(filename: str):
+	cache = make_cache(filename, maxsize=3)
+
+	for key in "abcd":
+		cache.put(key, ((key, None), ))
+		cache.flush()
+
+	# Mark "b" as used, so "c" is the least recently used.
+	assert cache.get('b') == (('b', None), )
+	cache.put('e', (('e', None), ))
+	cache.flush()
+
+	keys = {row[0] for row in sqlite3.connect(filename).execute("SELECT key FROM defaults")}
+	assert keys == {'b', 'd', 'e'}
+
+
+def test_merge(filename: str):
+	cache = make_cache(filename)
+	cache.updates.update({'a': None, 'b': "[]"})
+
+	cache.merge({'a': "[]", 'b': None, 'c': None})
+	assert cache.updates == {'a': "[]", 'b': "[]", 'c': None}
+
+
+def test_get_formatted_defaults(filename: str, monkeypatch):
+	cache = make_cache(filename)
+	monkeypatch.setattr(sphinxcontrib.default_values, "_persistent_cache", cache)
+	_defaults_cache.clear()
+
+	formatted_defaults = (("self", None), ('a', None), ('b', ":py:obj:`True`"))
+	assert _get_formatted_defaults(Demo) == formatted_defaults
+	cache.flush()
+	_defaults_cache.clear()
+
+	# Entries in the persistent cache are used in place of inspecting the object.
+	# Classes are cached under their constructor.
+	cache.put(cache.make_key(Demo.__init__), (('a', "``'from the cache'``"), ))
+	assert _get_formatted_defaults(Demo) == (('a', "``'from the cache'``"), )
+	_defaults_cache.clear()
+
+	cache.close()
+
+
+def test_unreadable_database(filename: str, caplog):
+	with open(filename, 'w', encoding="UTF-8") as fp:
+		fp.write("Not a database.\n" * 100)
+
+	cache = make_cache(filename)
+	assert cache.get('a') is None
+
+	cache.put('a', (('a', None), ))
+	cache.flush()
+	assert any("default_values: could not write to the persistent cache" in m for m in caplog.messages)
+	assert cache.updates == {}
+
+	cache.close()
+
+
+module_template = '''
+def function{n}(a, b={n}, c="hello"):
+	"""
+	:param a: The first argument.
+	:param b: The second argument.
+	:param c: The third argument.
+	"""
+'''
+
+
+@pytest.fixture()
+def project(project: SphinxProject) -> SphinxProject:
+	project.write_conf(default_values_persistent_cache=True)
+
+	# Enough documents to be read in parallel.
+	for n in range(6):
+		project.write_module(f"persistent_demo_{n}", module_template.format(n=n))
+		project.write_document(
+				f"module_{n}", f"Module {n}", f".. autofunction:: persistent_demo_{n}.function{n}\n"
+				)
+
+	toctree_entries = '\n'.join(f"\tmodule_{n}" for n in range(6))
+	project.write_document("index", "Index", f".. toctree::\n\n{toctree_entries}\n")
+
+	return project
+
+
+def last_used(build: Build) -> Counter[int]:
+	"""
+	Returns the number of entries in the persistent cache last used in each build.
+	"""
+
+	connection = sqlite3.connect(os.path.join(build.app.doctreedir, "default_values.sqlite3"))
+
+	try:
+		return Counter(row[0] for row in connection.execute("SELECT last_used FROM defaults"))
+	finally:
+		connection.close()
+
+
+@pytest.mark.parametrize(
+		"parallel",
+		[
+				pytest.param(0, id="serial"),
+				pytest.param(
+						4,
+						id="parallel",
+						marks=pytest.mark.skipif(
+								not parallel_available,
+								reason="Parallel builds are not available on this platform.",
+								),
+						),
+				],
+		)
+def test_persistent_cache_build(project: SphinxProject, parallel: int, monkeypatch):
+	first = project.build(parallel=parallel)
+	assert last_used(first) == {1: 6}
+	assert "Default <code" in first.html("module_0")
+
+	def compute_formatted_defaults(obj):
+		raise AssertionError("The object should not be inspected.")
+
+	monkeypatch.setattr(sphinxcontrib.default_values, "_compute_formatted_defaults", compute_formatted_defaults)
+
+	# Every document is read again, and the default values are taken from the persistent cache,
+	# including in the parallel read workers (which are forked from this process).
+	second = project.build(parallel=parallel, freshenv=True)
+	assert last_used(second) == {2: 6}
+	assert second.html("module_0") == first.html("module_0")
+	assert second.warnings == first.warnings
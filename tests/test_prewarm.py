@@ -0,0 +1,202 @@
+# stdlib
+import importlib
+import logging
+import sys
+from pathlib import Path
+from typing import Iterator
+
+# 3rd party
+import pytest
+
+# this package
+import sphinxcontrib.default_values
+from sphinxcontrib.default_values import _formatting_options, _get_formatted_defaults, _prewarmed, prewarm
+from sphinxcontrib.default_values.prewarming import _init_prewarm_worker, _iter_module_names, _prewarm_module
+from sphinxcontrib.default_values.tracing import Tracer
+from tests.common import MockApp
+
+module_source = '''
+def function(a, b=1, c="hello"):
+	pass
+
+
+class _Broken:
+
+	def __get__(self, instance, owner):
+		raise AttributeError("Broken")
+
+
+class Class:
+
+	broken = _Broken()
+
+	def __init__(self, d=None):
+		pass
+
+	def method(self, e=True):
+		pass
+
+	@classmethod
+	def class_method(cls, f=2):
+		pass
+
+	def _private(self, g=3):
+		pass
+
+
+class Subclass(Class):
+	pass
+
+
+class _Factory:
+
+	def __call__(self, i=5):
+		pass
+
+
+factory = _Factory()
+
+
+def _private(h=4):
+	pass
+'''
+
+
+@pytest.fixture()
+def package(tmp_path: Path) -> Iterator[Path]:
+	package_dir = tmp_path / "prewarm_demo"
+	(package_dir / "subpackage").mkdir(parents=True)
+	(package_dir / "__init__.py").write_text('')
+	(package_dir / "module.py").write_text(module_source)
+	(package_dir / "subpackage" / "__init__.py").write_text('')
+	(package_dir / "subpackage" / "broken.py").write_text("raise ValueError('Broken')\n")
+
+	sys.path.insert(0, str(tmp_path))
+	yield package_dir
+	sys.path.remove(str(tmp_path))
+
+	for name in list(sys.modules):
+		if name.startswith("prewarm_demo"):
+			del sys.modules[name]
+
+
+@pytest.fixture()
+def app() -> MockApp:
+	app = MockApp("Default %s")
+	app.config.default_values_safe_repr = False
+	app.config.default_values_repr_max_length = 200
+	app.config.default_values_repr_max_depth = 4
+	app.config.default_values_repr_max_items = 20
+	app.config.default_values_repr_timeout = 0
+	app.config.default_values_attrs_factories = "call"
+	app.config.default_values_reference_constants = False
+	return app
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+	_prewarmed.clear()
+	sphinxcontrib.default_values._defaults_cache.clear()
+	yield
+	_prewarmed.clear()
+	sphinxcontrib.default_values._defaults_cache.clear()
+
+
+def test_iter_module_names(package: Path):
+	names = ["prewarm_demo", "prewarm_demo.module", "does_not_exist", "does_not_exist.module"]
+	assert list(_iter_module_names(names)) == [
+			"prewarm_demo",
+			"prewarm_demo.module",
+			"prewarm_demo.subpackage",
+			"prewarm_demo.subpackage.broken",
+			"prewarm_demo.module",
+			"does_not_exist",
+			"does_not_exist.module",
+			]
+
+	# Subpackages are not imported.
+	assert "prewarm_demo.subpackage" not in sys.modules
+
+
+def test_prewarm(package: Path, app: MockApp, monkeypatch, caplog):
+	caplog.set_level(logging.INFO)
+	app.config.default_values_prewarm = ["prewarm_demo"]
+
+	prewarm(app)  # type: ignore[arg-type]
+
+	assert sorted(_prewarmed) == [
+			("prewarm_demo.module", "Class.__init__", "function"),
+			("prewarm_demo.module", "Class.class_method", "method"),
+			("prewarm_demo.module", "Class.method", "function"),
+			("prewarm_demo.module", "function", "function"),
+			]
+
+	assert any("could not prewarm prewarm_demo.subpackage.broken: Broken" in m for m in caplog.messages)
+	assert any(m.startswith("default_values: prewarmed 4 objects from 4 modules") for m in caplog.messages)
+
+	# The objects were imported in the worker processes, not in this one.
+	assert "prewarm_demo.module" not in sys.modules
+	module = importlib.import_module("prewarm_demo.module")
+
+	expected = {
+			module.function: (('a', None), ('b', "``1``"), ('c', "``'hello'``")),
+			module.Class: (("self", None), ('d', ":py:obj:`None`")),
+			module.Class.method: (("self", None), ('e', ":py:obj:`True`")),
+			module.Class.class_method: (('f', "``2``"), ),
+			}
+
+	for obj, formatted_defaults in expected.items():
+		assert sphinxcontrib.default_values._compute_formatted_defaults(obj) == formatted_defaults
+
+	def compute_formatted_defaults(obj):
+		raise AssertionError("The object should not be inspected.")
+
+	monkeypatch.setattr(sphinxcontrib.default_values, "_compute_formatted_defaults", compute_formatted_defaults)
+
+	for obj, formatted_defaults in expected.items():
+		assert _get_formatted_defaults(obj) == formatted_defaults
+
+	with pytest.raises(AssertionError, match="The object should not be inspected."):
+		_get_formatted_defaults(module.Class._private)
+
+
+def test_prewarm_worker(package: Path, app: MockApp, monkeypatch):
+	# The code which runs in the worker processes, run in this process.
+	monkeypatch.setattr(sys, "path", list(sys.path))
+	for name in ("_tracer", "_safe_repr", "_call_attrs_factories", "_reference_constants"):
+		monkeypatch.setattr(sphinxcontrib.default_values, name, getattr(sphinxcontrib.default_values, name))
+
+	monkeypatch.setattr(sphinxcontrib.default_values, "_tracer", Tracer())
+	options = {name: getattr(app.config, name) for name in _formatting_options}
+	_init_prewarm_worker([str(package.parent)], options)
+
+	assert sys.path == [str(package.parent)]
+	assert sphinxcontrib.default_values._tracer is None
+
+	# The subclass shares its constructor with its base class, the callable instance has no qualified name,
+	# and the attribute which cannot be accessed is skipped.
+	assert _prewarm_module("prewarm_demo.module") == {
+			("prewarm_demo.module", "Class.__init__", "function"): (("self", None), ('d', ":py:obj:`None`")),
+			("prewarm_demo.module", "Class.class_method", "method"): (('f', "``2``"), ),
+			("prewarm_demo.module", "Class.method", "function"): (("self", None), ('e', ":py:obj:`True`")),
+			("prewarm_demo.module", "function", "function"): (('a', None), ('b', "``1``"), ('c', "``'hello'``")),
+			}
+
+	def compute_formatted_defaults(obj):
+		if obj.__name__ == "function":
+			raise ValueError("Broken")
+		return ()
+
+	# Objects which cannot be inspected are left for autodoc.
+	monkeypatch.setattr(sphinxcontrib.default_values, "_compute_formatted_defaults", compute_formatted_defaults)
+	assert sorted(_prewarm_module("prewarm_demo.module")) == [
+			("prewarm_demo.module", "Class.__init__", "function"),
+			("prewarm_demo.module", "Class.class_method", "method"),
+			("prewarm_demo.module", "Class.method", "function"),
+			]
+
+
+def test_prewarm_nothing(app: MockApp):
+	app.config.default_values_prewarm = []
+	prewarm(app)  # type: ignore[arg-type]
+	assert not _prewarmed
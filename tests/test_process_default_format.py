@@ -3,22 +3,7 @@ import pytest
 
 # this package
 from sphinxcontrib.default_values import process_default_format
-
-
-class MockConfig(dict):
-
-	def __getattr__(self, item):
-		return self[item]
-
-	def __setattr__(self, key, value):
-		self[key] = value
-
-
-class MockApp:
-
-	def __init__(self, format_):
-		self.config = MockConfig()
-		self.config.default_description_format = format_
+from tests.common import MockApp
 
 
 @pytest.mark.parametrize(
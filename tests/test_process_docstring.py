@@ -5,39 +5,17 @@ from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # 3rd party
 import attr
-import pytest
 from domdf_python_tools.utils import strtobool
 
 # this package
+import sphinxcontrib.default_values
 from sphinxcontrib.default_values import process_docstring
 
 
-class MockConfig(dict):
-
-	def __getattr__(self, item):
-		return self[item]
-
-	def __setattr__(self, key, value):
-		self[key] = value
-
-
-class MockApp:
-
-	def __init__(self, format_):
-		self.config = MockConfig()
-		self.config.docutils_tab_width = 4
-		self.config.default_description_format = format_
-
-
 def namedlist(name: str = "NamedList") -> Callable:  # type: ignore[empty-body]
 	pass
 
 
-@pytest.fixture()
-def app():
-	return MockApp("Default %s")
-
-
 def test_process_docstring(app):
 	lines = [
 			"A factory function to return a custom list subclass with a name.",
@@ -150,6 +128,66 @@ def test_process_docstring_redundant_defaults(app):
 			]
 
 
+def test_process_docstring_override_before_continuation(app):
+	lines = [
+			"Does something.",
+			'',
+			":param foo: An argument.",
+			":default foo: ``[]``",
+			"    Which spans multiple lines",
+			":param bar: Another argument.",
+			":no-default bar:",
+			":param baz: A third argument",
+			":default bar: ``'bar'``",
+			"    Which also spans multiple lines",
+			'',
+			]
+
+	def my_func(foo=None, bar=None, baz=None):
+		pass
+
+	process_docstring(app, '', '', my_func, {}, lines)
+
+	assert lines == [
+			"Does something.",
+			'',
+			":param foo: An argument.",
+			"    Which spans multiple lines",
+			"    Default ``[]``.",
+			":param bar: Another argument.",
+			":param baz: A third argument",
+			"    Which also spans multiple lines",
+			"    Default :py:obj:`None`.",
+			'',
+			]
+
+
+def test_process_docstring_no_params(app, monkeypatch):
+
+	def inspect_signature(obj: Callable):
+		raise AssertionError("The signature should not be inspected.")
+
+	monkeypatch.setattr(sphinxcontrib.default_values, "_get_formatted_defaults", inspect_signature)
+
+	def my_func(foo=None):
+		pass
+
+	lines = [
+			"Does something.",
+			'',
+			":default foo: ``[]``",
+			":no-default foo:",
+			":rtype: int",
+			]
+
+	process_docstring(app, "function", "my_func", my_func, {}, lines)
+	assert lines == ["Does something.", '', ":rtype: int", '']
+
+	lines = [":param foo: An argument."]
+	process_docstring(app, "module", "my_module", my_func, {}, lines)
+	assert lines == [":param foo: An argument."]
+
+
 def test_process_docstring_underscores(app):
 	lines = [
 			"A factory function to return a custom list subclass with a name.",
@@ -0,0 +1,263 @@
+# stdlib
+import importlib
+import sys
+from types import ModuleType
+from typing import Any, Dict, Iterator
+
+# 3rd party
+import pytest
+
+# this package
+from sphinxcontrib.default_values import (
+		_compute_formatted_defaults,
+		_configure_formatting,
+		_constants,
+		_formatting_options,
+		_index_constants,
+		_indexed_modules
+		)
+from tests.common import SphinxProject
+
+module_source = '''
+import enum
+
+__all__ = ["Colour", "DEFAULT_OPTIONS", "MISSING", "TIMEOUT", "paint", "Brush"]
+
+DEFAULT_OPTIONS = {"verbose": False}
+"""
+The default options.
+"""
+
+MISSING = object()
+"""
+Sentinel for missing values.
+"""
+
+TIMEOUT = 30
+"""
+The default timeout.
+"""
+
+UNLISTED = ["not", "in", "__all__"]
+
+
+class Colour(enum.Enum):
+	"""
+	A colour.
+	"""
+
+	RED = 1
+	GREEN = 2
+	SCARLET = 1
+
+
+def paint(
+		colour=Colour.RED,
+		alias=Colour.SCARLET,
+		options=DEFAULT_OPTIONS,
+		other_options={"verbose": False},
+		sentinel=MISSING,
+		timeout=TIMEOUT,
+		unlisted=UNLISTED,
+		):
+	"""
+	:param colour: The colour.
+	:param alias: Another colour.
+	:param options: The options.
+	:param other_options: Some other options.
+	:param sentinel: A sentinel.
+	:param timeout: The timeout.
+	:param unlisted: Not in ``__all__``.
+	"""
+
+
+class Brush:
+	"""
+	:param colour: The colour.
+	"""
+
+	def __init__(self, colour=Colour.GREEN):
+		pass
+'''
+
+options: Dict[str, Any] = {
+		"default_values_safe_repr": False,
+		"default_values_repr_max_length": 200,
+		"default_values_repr_max_depth": 4,
+		"default_values_repr_max_items": 20,
+		"default_values_repr_timeout": 0,
+		"default_values_attrs_factories": "call",
+		"default_values_reference_constants": True,
+		}
+
+assert set(options) == set(_formatting_options)
+
+
+@pytest.fixture()
+def demo(project: SphinxProject) -> Iterator[Any]:
+	project.write_module("constants_demo", module_source)
+	yield importlib.import_module("constants_demo")
+
+	_configure_formatting({**options, "default_values_reference_constants": False})
+
+
+def test_reference_constants(demo):
+	_configure_formatting(options)
+
+	assert dict(_compute_formatted_defaults(demo.paint)) == {
+			"colour": ":py:attr:`constants_demo.Colour.RED`",
+			"alias": ":py:attr:`constants_demo.Colour.RED`",
+			"options": ":py:data:`constants_demo.DEFAULT_OPTIONS`",
+			"other_options": "``{'verbose': False}``",
+			"sentinel": ":py:data:`constants_demo.MISSING`",
+			"timeout": "``30``",
+			"unlisted": "``['not', 'in', '__all__']``",
+			}
+	assert _indexed_modules == {"constants_demo"}
+
+	assert dict(_compute_formatted_defaults(demo.Brush)) == {
+			"self": None,
+			"colour": ":py:attr:`constants_demo.Colour.GREEN`",
+			}
+
+	# The index is rebuilt when the formatting options change.
+	_configure_formatting(options)
+	assert not _constants
+	assert not _indexed_modules
+
+
+def test_reference_constants_disabled(demo):
+	_configure_formatting({**options, "default_values_reference_constants": False})
+
+	assert dict(_compute_formatted_defaults(demo.paint))["colour"] == "``<Colour.RED: 1>``"
+	assert not _indexed_modules
+
+
+def test_reference_constants_build(demo, project: SphinxProject):
+	project.write_conf(default_values_reference_constants=True)
+	project.write_document(
+			"index",
+			"Constants",
+			".. automodule:: constants_demo\n\t:members:\n\t:undoc-members:\n",
+			)
+
+	html = project.build().html()
+	assert 'href="#constants_demo.DEFAULT_OPTIONS"' in html
+	assert 'href="#constants_demo.MISSING"' in html
+	assert 'href="#constants_demo.Colour.RED"' in html
+	assert 'href="#constants_demo.Colour.GREEN"' in html
+
+
+consts_source = '''
+SENTINEL = object()
+"""
+A sentinel.
+"""
+
+
+def uses_sentinel(a=SENTINEL):
+	"""
+	:param a: An argument.
+	"""
+'''
+
+api_source = '''
+from reexport_consts import SENTINEL
+
+
+def function(a=SENTINEL):
+	"""
+	:param a: An argument.
+	"""
+'''
+
+
+@pytest.fixture()
+def reexport(project: SphinxProject) -> Iterator[Any]:
+	project.write_module("reexport_consts", consts_source)
+	project.write_module("reexport_api", api_source)
+	yield importlib.import_module("reexport_api")
+
+	_configure_formatting({**options, "default_values_reference_constants": False})
+
+
+def test_reference_constants_reexported(reexport):
+	_configure_formatting(options)
+
+	# The constant is not documented as part of the module which imports it.
+	assert dict(_compute_formatted_defaults(reexport.function)) == {'a': f"``{reexport.SENTINEL!r}``"}
+
+	# It is referenced via the module which documents it, once that module has been indexed.
+	consts = importlib.import_module("reexport_consts")
+	assert dict(_compute_formatted_defaults(consts.uses_sentinel)) == {'a': ":py:data:`reexport_consts.SENTINEL`"}
+
+	_configure_formatting(options)
+	_compute_formatted_defaults(consts.uses_sentinel)
+	assert dict(_compute_formatted_defaults(reexport.function)) == {'a': ":py:data:`reexport_consts.SENTINEL`"}
+
+
+def test_reference_constants_reexported_build(reexport, project: SphinxProject):
+	project.write_conf(default_values_reference_constants=True, nitpicky=True)
+	project.write_document("index", "API", ".. automodule:: reexport_api\n\t:members:\n")
+
+	build = project.build()
+	assert build.warnings == ''
+	assert "reexport_api.SENTINEL" not in build.html()
+
+
+def test_reference_constants_no_source(monkeypatch):
+	# A module whose source cannot be found.
+	module = ModuleType("nosource_demo")
+	sentinel = vars(module)["SENTINEL"] = object()
+
+	def function(a=sentinel):
+		pass
+
+	function.__module__ = module.__name__
+	monkeypatch.setitem(sys.modules, module.__name__, module)
+
+	_configure_formatting(options)
+	try:
+		assert dict(_compute_formatted_defaults(function)) == {'a': f"``{sentinel!r}``"}
+		assert _indexed_modules == {"nosource_demo"}
+	finally:
+		_configure_formatting({**options, "default_values_reference_constants": False})
+
+
+members_source = '''
+import enum
+
+__all__ = ["FAVOURITE", "REMOVED"]
+
+
+class Shade(enum.Enum):
+	LIGHT = 1
+	DARK = 2
+
+
+FAVOURITE = Shade.LIGHT
+'''
+
+
+def test_index_constants_members(project: SphinxProject):
+	project.write_module("members_demo", members_source)
+
+	# Modules are only indexed once they have been imported.
+	_configure_formatting(options)
+	try:
+		_index_constants("members_demo")
+		assert not _constants
+
+		module = importlib.import_module("members_demo")
+		_indexed_modules.clear()
+		_index_constants("members_demo")
+
+		# Names in __all__ which are missing from the module are skipped,
+		# and all members of an enum are indexed from any one of them.
+		assert sorted(text for value, text in _constants.values()) == [
+				":py:attr:`members_demo.Shade.DARK`",
+				":py:attr:`members_demo.Shade.LIGHT`",
+				]
+		assert _constants[id(module.Shade.LIGHT)][0] is module.Shade.LIGHT
+	finally:
+		_configure_formatting({**options, "default_values_reference_constants": False})
@@ -4,12 +4,39 @@ from typing import Any, Tuple
 
 # 3rd party
 import sphinx
-from sphinx.events import EventListener
 from sphinx_toolbox.testing import Sphinx, run_setup
 
 # this package
 import sphinxcontrib.default_values
-from sphinxcontrib.default_values import __version__, process_default_format, process_docstring
+from sphinxcontrib.default_values import (
+		__version__,
+		clear_caches,
+		configure_caches,
+		configure_fingerprints,
+		configure_formatting,
+		configure_index,
+		configure_statistics,
+		configure_tab_width,
+		configure_tracing,
+		detach_statistics,
+		detach_tracer,
+		finish_fingerprints,
+		flush_caches,
+		get_outdated_docs,
+		insert_defaults,
+		merge_caches,
+		merge_fingerprints,
+		merge_statistics,
+		merge_traces,
+		prewarm,
+		process_default_format,
+		process_docstring,
+		purge_fingerprints,
+		purge_index,
+		report_statistics,
+		write_index,
+		write_trace
+		)
 
 
 class MockApp:
@@ -42,12 +69,16 @@ def get_app_config_values(config: Any) -> Tuple[str, str, Any]:
 		default, rebuild, valid_types = config
 
 	if isinstance(valid_types, (set, frozenset, tuple, list)):
-		valid_types = sorted(valid_types)
+		valid_types = sorted(valid_types, key=repr)
 
 	if hasattr(valid_types, "_candidates"):
 		new_valid_types = SimpleNamespace()
 		new_valid_types.candidates = sorted(valid_types._candidates)
 		valid_types = new_valid_types
+	elif hasattr(valid_types, "candidates"):
+		new_valid_types = SimpleNamespace()
+		new_valid_types.candidates = sorted(valid_types.candidates)
+		valid_types = new_valid_types
 
 	return (default, rebuild, valid_types)
 
@@ -63,9 +94,65 @@ def test_setup():
 			"parallel_write_safe": True,
 			}
 
-	assert get_app_config_values(app.config.values["default_description_format"]) == ("Default %s", "env", [str])
+	assert get_app_config_values(app.config.values["default_description_format"]) == ("Default %s", '', [str])
+	assert get_app_config_values(app.config.values["default_values_safe_repr"]) == (False, '', [bool])
+	assert get_app_config_values(app.config.values["default_values_repr_max_length"]) == (200, '', [int])
+	assert get_app_config_values(app.config.values["default_values_repr_max_depth"]) == (4, '', [int])
+	assert get_app_config_values(app.config.values["default_values_repr_max_items"]) == (20, '', [int])
+	assert get_app_config_values(app.config.values["default_values_repr_timeout"]) == (0, '', [float, int])
+	assert get_app_config_values(app.config.values["default_values_attrs_factories"]) == (
+			"call",
+			'',
+			SimpleNamespace(candidates=["call", "reference"]),
+			)
+	assert get_app_config_values(app.config.values["default_values_reference_constants"]) == (False, '', [bool])
+	assert get_app_config_values(app.config.values["default_values_cache_size"]) == (4096, '', [int])
+	assert get_app_config_values(app.config.values["default_values_docstring_cache_size"]) == (1024, '', [int])
+	assert get_app_config_values(app.config.values["default_values_persistent_cache"]) == (False, '', [bool])
+	assert get_app_config_values(app.config.values["default_values_persistent_cache_size"]) == (100_000, '', [int])
+	assert get_app_config_values(app.config.values["default_values_trace"]) == (False, '', [bool])
+	assert get_app_config_values(app.config.values["default_values_prewarm"]) == ([], '', [list])
+	assert get_app_config_values(app.config.values["default_values_index"]) == (False, "env", [bool])
+	assert get_app_config_values(app.config.values["default_values_insertion"]) == (
+			"docstring",
+			"env",
+			SimpleNamespace(candidates=["docstring", "doctree"]),
+			)
+
+	listeners = {
+			event: [(listener.handler, listener.priority) for listener in event_listeners]
+			for event,
+			event_listeners in app.events.listeners.items()
+			}
 
-	assert app.events.listeners == {
-			"builder-inited": [EventListener(id=0, handler=process_default_format, priority=500)],
-			"autodoc-process-docstring": [EventListener(id=1, handler=process_docstring, priority=500)],
+	assert listeners == {
+			"builder-inited": [
+					(process_default_format, 500),
+					(configure_formatting, 500),
+					(configure_caches, 500),
+					(configure_tracing, 500),
+					(configure_statistics, 500),
+					(configure_fingerprints, 500),
+					(prewarm, 500),
+					(configure_index, 500),
+					],
+			"env-get-outdated": [(get_outdated_docs, 500)],
+			"env-before-read-docs": [(configure_tab_width, 500)],
+			"env-purge-doc": [(purge_fingerprints, 500), (purge_index, 500)],
+			"autodoc-process-docstring": [(process_docstring, 500)],
+			"object-description-transform": [(insert_defaults, 500)],
+			"env-merge-info": [
+					(merge_caches, 500),
+					(merge_traces, 500),
+					(merge_statistics, 500),
+					(merge_fingerprints, 500),
+					],
+			"env-updated": [(flush_caches, 500), (detach_tracer, 500), (detach_statistics, 500)],
+			"build-finished": [
+					(clear_caches, 500),
+					(write_trace, 500),
+					(report_statistics, 500),
+					(finish_fingerprints, 500),
+					(write_index, 500),
+					],
 			}
@@ -0,0 +1,108 @@
+# stdlib
+import os
+from types import SimpleNamespace
+from typing import Iterator
+
+# 3rd party
+import pytest
+
+# this package
+import sphinxcontrib.default_values
+from sphinxcontrib.default_values import _defaults_cache, get_arguments, get_statistics, process_docstring
+from sphinxcontrib.default_values.statistics import BuildStatistics, Statistics
+from tests.common import MockApp
+
+
+def demo(a, b: bool = True, c: str = "hello", d: int = 1):
+	"""
+	:param a:
+	:param b:
+	:param c:
+	:default c: ``'world'``
+	:param d:
+	:no-default d:
+	"""
+
+
+@pytest.fixture()
+def statistics(monkeypatch) -> Iterator[BuildStatistics]:
+	statistics = BuildStatistics()
+	monkeypatch.setattr(sphinxcontrib.default_values, "_statistics", statistics)
+	_defaults_cache.clear()
+	yield statistics
+	_defaults_cache.clear()
+
+
+def test_add_time():
+	statistics = Statistics()
+
+	for idx in range(20):
+		statistics.add_time(f"func{idx}", idx)
+
+	assert statistics.total_time == sum(range(20))
+	assert sorted(statistics.slowest) == [(idx, f"func{idx}") for idx in range(10, 20)]
+
+
+def test_process_docstring_statistics(statistics: BuildStatistics):
+	app = MockApp("Default %s")
+	lines = [":param a:", ":param b:", ":param c:", ":default c: ``'world'``", ":param d:", ":no-default d:"]
+
+	process_docstring(app, "function", "demo", demo, {}, lines)  # type: ignore[arg-type]
+	process_docstring(app, "attribute", "demo.attribute", 1234, {}, [])  # type: ignore[arg-type]
+	process_docstring(app, "property", "demo.property", property(), {}, [])  # type: ignore[arg-type]
+
+	totals = get_statistics(SimpleNamespace())  # type: ignore[arg-type]
+	assert totals["objects_processed"] == 1
+	assert totals["objects_skipped"] == 2
+	assert totals["parameters"] == 4
+	assert totals["defaults_rendered"] == 2
+	assert totals["overrides"] == 1
+	assert totals["suppressions"] == 1
+	assert totals["signature_failures"] == 0
+	assert totals["total_time"] > 0
+	assert [name for name, duration in totals["slowest"]] == ["demo"]
+
+
+def test_signature_failures(statistics: BuildStatistics):
+
+	def func():
+		pass
+
+	# inspect.unwrap raises ValueError for cycles of __wrapped__
+	func.__wrapped__ = func  # type: ignore[attr-defined]
+
+	assert get_arguments(func) == {}
+	assert statistics.as_dict()["signature_failures"] == 1
+
+
+def test_merge(monkeypatch):
+	main = BuildStatistics()
+	main.current.objects_processed = 1
+
+	worker = BuildStatistics()
+	worker.processes[-1] = Statistics()
+	worker.processes[-1].objects_processed = 5
+	worker.processes[-1].add_time("slow", 2.0)
+
+	# The worker's copy of the main process's statistics is ignored.
+	worker.processes[os.getpid()] = Statistics()
+	worker.processes[os.getpid()].objects_processed = 100
+
+	main.merge(worker)
+	main.merge(worker)
+
+	totals = main.as_dict()
+	assert totals["objects_processed"] == 6
+	assert totals["slowest"] == [("slow", 2.0)]
+
+
+def test_summary():
+	statistics = BuildStatistics()
+	assert statistics.summary() == (
+			"processed 0 objects (0 skipped) with 0 parameters in 0.00s; "
+			"0 defaults shown, 0 overridden, 0 suppressed; 0 signature failures"
+			)
+
+	statistics.current.objects_processed = 1
+	statistics.current.add_time("demo", 0.0125)
+	assert statistics.summary().endswith("; slowest demo (12.5ms)")
@@ -0,0 +1,38 @@
+# 3rd party
+import pytest
+
+# this package
+from tests.common import SphinxProject
+
+module_source = '''
+def function(a, b=1):
+	"""
+	:param a: The first argument.
+	:param b: The second argument,
+	  which is described at length.
+	"""
+'''
+
+
+@pytest.fixture()
+def project(project: SphinxProject) -> SphinxProject:
+	project.write_module("tab_width_demo", module_source)
+	project.write_document("index", "Index", ".. autofunction:: tab_width_demo.function\n")
+	return project
+
+
+def test_tab_width_default(project: SphinxProject):
+	app = project.build().app
+	assert app.env.default_values_tab_width == 8  # type: ignore[attr-defined]
+
+
+def test_tab_width_docutils_conf(project: SphinxProject, monkeypatch):
+	docutils_conf = project.srcdir / "docutils.conf"
+	docutils_conf.write_text("[restructuredtext parser]\ntab_width: 2\n")
+	monkeypatch.setenv("DOCUTILSCONFIG", str(docutils_conf))
+
+	build = project.build()
+	assert build.app.env.default_values_tab_width == 2  # type: ignore[attr-defined]
+
+	# The default value is added after the continuation line, which is indented by the tab width.
+	assert "which is described at length.\nDefault" in build.html()
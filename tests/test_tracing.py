@@ -0,0 +1,170 @@
+# stdlib
+import json
+import os
+import pickle
+
+# 3rd party
+import pytest
+from sphinx.util.parallel import parallel_available
+
+# this package
+import sphinxcontrib.default_values
+from sphinxcontrib.default_values import _defaults_cache, process_docstring
+from sphinxcontrib.default_values.tracing import Tracer
+from tests.common import MockApp, SphinxProject
+
+
+def demo(a, b: bool = True, c: str = "hello"):
+	"""
+	:param a:
+	:param b:
+	:param c:
+	"""
+
+
+def test_span():
+	tracer = Tracer()
+
+	with tracer.span("outer", name="demo"):
+		with tracer.span("inner"):
+			pass
+
+	inner, outer = tracer.events
+	assert inner["name"] == "inner"
+	assert outer["name"] == "outer"
+	assert outer["args"] == {"name": "demo"}
+	assert outer["ph"] == inner["ph"] == 'X'
+	assert outer["pid"] == os.getpid()
+	assert outer["ts"] <= inner["ts"]
+	assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+
+
+def test_span_exception():
+	tracer = Tracer()
+
+	with pytest.raises(ValueError, match="Oops"):
+		with tracer.span("error"):
+			raise ValueError("Oops")
+
+	assert [event["name"] for event in tracer.events] == ["error"]
+
+
+def test_merge():
+	tracer = Tracer()
+
+	with tracer.span("main"):
+		pass
+
+	# The worker's events include those recorded by the main process before it was forked.
+	worker = Tracer()
+	worker.processes = {**tracer.processes, -1: [{**tracer.events[0], "name": "worker", "pid": -1}]}
+	tracer.merge(worker)
+
+	assert [event["name"] for event in tracer.events] == ["main", "worker"]
+
+
+def test_merge_later_workers():
+	tracer = Tracer()
+	first = Tracer()
+	first.processes = {-1: [{"name": "first", "pid": -1}]}
+	tracer.merge(first)
+
+	# With more chunks of documents than workers, later workers are forked
+	# after the events of earlier ones have been merged, and carry copies of them.
+	second = Tracer()
+	second.processes = {**tracer.processes, -2: [{"name": "second", "pid": -2}]}
+	tracer.merge(second)
+
+	# e.g. a worker process reused for a later chunk.
+	third = Tracer()
+	third.processes = {**tracer.processes, -1: [*first.processes[-1], {"name": "third", "pid": -1}]}
+	tracer.merge(third)
+
+	assert [event["name"] for event in tracer.events] == ["first", "third", "second"]
+
+
+def test_write(tmp_path):
+	tracer = Tracer()
+
+	with tracer.span("event"):
+		pass
+
+	filename = tmp_path / "trace" / "default_values_trace.json"
+	tracer.write(str(filename))
+
+	trace = json.loads(filename.read_text())
+	assert trace["traceEvents"] == tracer.events
+
+
+def test_process_docstring_trace(monkeypatch):
+	tracer = Tracer()
+	monkeypatch.setattr(sphinxcontrib.default_values, "_tracer", tracer)
+	_defaults_cache.clear()
+
+	app = MockApp("Default %s")
+	lines = [":param a:", ":param b:", ":param c:"]
+	process_docstring(app, "function", "demo", demo, {}, lines)  # type: ignore[arg-type]
+
+	assert [event["name"] for event in tracer.events] == ["defaults", "format", "rewrite", "process_docstring"]
+	assert tracer.events[-1]["args"] == {"name": "demo", "what": "function"}
+
+	# Cached defaults are neither extracted nor formatted again.
+	tracer.processes.clear()
+	process_docstring(app, "function", "demo", demo, {}, [":param a:"])  # type: ignore[arg-type]
+	assert [event["name"] for event in tracer.events] == ["rewrite", "process_docstring"]
+
+	_defaults_cache.clear()
+
+
+module_template = '''
+def function{n}(a, b={n}):
+	"""
+	:param a: The first argument.
+	:param b: The second argument.
+	"""
+'''
+
+
+@pytest.fixture()
+def project(project: SphinxProject) -> SphinxProject:
+	project.write_conf(default_values_trace=True)
+
+	# Enough documents to be read in parallel.
+	for n in range(6):
+		project.write_module(f"tracing_demo_{n}", module_template.format(n=n))
+		project.write_document(f"module_{n}", f"Module {n}", f".. autofunction:: tracing_demo_{n}.function{n}\n")
+
+	toctree_entries = '\n'.join(f"\tmodule_{n}" for n in range(6))
+	project.write_document("index", "Index", f".. toctree::\n\n{toctree_entries}\n")
+
+	return project
+
+
+@pytest.mark.parametrize(
+		"parallel",
+		[
+				pytest.param(0, id="serial"),
+				pytest.param(
+						4,
+						id="parallel",
+						marks=pytest.mark.skipif(
+								not parallel_available,
+								reason="Parallel builds are not available on this platform.",
+								),
+						),
+				],
+		)
+def test_trace_build(project: SphinxProject, parallel: int):
+	build = project.build(parallel=parallel)
+
+	# The events of any parallel read workers are merged into the trace.
+	trace = json.loads((build.outdir / "default_values_trace.json").read_text())
+	traced = sorted(
+			event["args"]["name"] for event in trace["traceEvents"] if event["name"] == "process_docstring"
+			)
+	assert traced == [f"tracing_demo_{n}.function{n}" for n in range(6)]
+
+	with open(os.path.join(build.app.doctreedir, "environment.pickle"), "rb") as fp:
+		assert not hasattr(pickle.load(fp), "default_values_tracer")
+
+	assert sphinxcontrib.default_values._tracer is None